@@ -0,0 +1,101 @@
+"""
+IoU hesaplama yollarını örnek kesim şekilleri üzerinde karşılaştırır.
+
+Kullanım (depo kök dizininden):
+    python -m benchmarks.iou_benchmark --repeat 20 --tolerances 0.5 1 2 5
+"""
+from shapely.geometry import Polygon
+from utils.file_loader import FileLoader, load_data
+from shape_analyzer import ShaperAnalysis, batch_iou, raster_iou
+from cut_pair import CutPair
+import numpy as np
+import contextlib
+import argparse
+import time
+import json
+import io
+
+# Eski (iki overlay'li) kesin yol: referans değerler ve süre karşılaştırması için.
+def two_overlay_iou(prev_points, curr_points):
+    prev_polygon = Polygon(prev_points)
+    curr_polygon = Polygon(curr_points)
+    if not prev_polygon.is_valid:
+        prev_polygon = prev_polygon.buffer(0)
+    if not curr_polygon.is_valid:
+        curr_polygon = curr_polygon.buffer(0)
+    intersection_area = prev_polygon.intersection(curr_polygon).area
+    union_area = prev_polygon.union(curr_polygon).area
+    return intersection_area / union_area if union_area > 0 else 0
+
+def load_shapes(directories):
+    """Klasörlerdeki tüm kesim dosyalarının prev/curr noktalarını yükler."""
+    shapes = []
+    with contextlib.redirect_stdout(io.StringIO()):  # Yükleyicinin durum mesajlarını gizle
+        for directory in directories:
+            for file_path in FileLoader(directory).get_file_paths():
+                prev_points, curr_points = load_data(file_path)
+                if len(prev_points) >= 3 and len(curr_points) >= 3:
+                    shapes.append((prev_points, curr_points))
+    return shapes
+
+def time_per_file(function, shapes, repeat):
+    """Her şekil için fonksiyonu çalıştırır; dosya başına ortalama süreyi (ms) ve sonuçları döndürür."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        values = [function(prev_points, curr_points) for prev_points, curr_points in shapes]
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / (repeat * len(shapes)), np.asarray(values, dtype=float)
+
+def run(directories, repeat, tolerances):
+    shapes = load_shapes(directories)
+    if not shapes:
+        raise ValueError("Karşılaştırma için geçerli şekil bulunamadı.")
+
+    reference_ms, reference = time_per_file(two_overlay_iou, shapes, repeat)
+    results = [{"path": "exact_two_overlays", "ms_per_file": reference_ms, "max_abs_iou_error": 0.0}]
+
+    single_ms, single = time_per_file(
+        lambda p, c: ShaperAnalysis(CutPair(p, c, "benchmark")).analyze_data()["iou"], shapes, repeat)
+    results.append({"path": "exact_single_overlay", "ms_per_file": single_ms,
+                    "max_abs_iou_error": float(np.max(np.abs(single - reference)))})
+
+    prev_list = [prev_points for prev_points, _ in shapes]
+    curr_list = [curr_points for _, curr_points in shapes]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        _, _, batch, _ = batch_iou(prev_list, curr_list)
+    batch_ms = (time.perf_counter() - start) * 1000 / (repeat * len(shapes))
+    results.append({"path": "exact_batch_vectorized", "ms_per_file": batch_ms,
+                    "max_abs_iou_error": float(np.max(np.abs(batch - reference)))})
+
+    for tolerance in tolerances:
+        raster_ms, raster = time_per_file(lambda p, c: raster_iou(p, c, tolerance)[2], shapes, repeat)
+        results.append({"path": f"raster_tolerance_{tolerance:g}", "ms_per_file": raster_ms,
+                        "max_abs_iou_error": float(np.max(np.abs(raster - reference)))})
+
+    for result in results:
+        result["speedup"] = reference_ms / result["ms_per_file"]
+    return {"files": len(shapes), "repeat": repeat, "results": results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IoU hesaplama yollarının süre ve doğruluk karşılaştırması.")
+    parser.add_argument("directories", nargs="*", default=["data/", "unlabeled_data/"])
+    parser.add_argument("--repeat", type=int, default=20, help="Her yolun tekrar sayısı")
+    parser.add_argument("--tolerances", type=float, nargs="*", default=[0.5, 1.0, 2.0, 5.0],
+                        help="raster modu için denenecek hücre boyutları")
+    parser.add_argument("--json", dest="json_path", default=None, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    report = run(args.directories, args.repeat, args.tolerances)
+    print(f"{report['files']} şekil, {report['repeat']} tekrar")
+    print(f"{'yol':<26}{'ms/dosya':>10}{'hızlanma':>10}{'maks. IoU hatası':>18}")
+    for result in report["results"]:
+        print(f"{result['path']:<26}{result['ms_per_file']:>10.3f}{result['speedup']:>10.2f}"
+              f"{result['max_abs_iou_error']:>18.4f}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+İşlem hattının aşamalarını sentetik verilerle ayrı ayrı ölçer ve sonuçları JSON olarak yazar.
+
+Ölçülen aşamalar:
+    nokta sayısına göre (1k / 100k / 1M): load_data, GlassCutAnalysis mesafe ve açı analizi,
+        ShaperAnalysis.analyze_data ve apply_fourier_transform
+    dosya sayısına göre (10 / 1k / 10k): FeatureExtractor ile dosya bazında özellik çıkarımı,
+        ResultsManager.save_results_to_csv, ModelTrainer eğitimi ve tahmini
+
+Kullanım (depo kök dizininden):
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --points 1000 100000 --files 10 1000 --no-memory
+"""
+from benchmarks.synthetic import cut_path, write_cut_csv, write_cut_directory, feature_table
+from utils.file_loader import load_data
+from glass_cut_analysis import GlassCutAnalysis
+from shape_analyzer import ShaperAnalysis
+from cut_pair import CutPair
+from feature_extractor import FeatureExtractor
+from results_manager import ResultsManager
+from model_train import ModelTrainer
+import numpy as np
+import tracemalloc
+import platform
+import tempfile
+import argparse
+import time
+import json
+import logging
+import gc
+import os
+
+DEFAULT_POINTS = [1_000, 100_000, 1_000_000]
+DEFAULT_FILES = [10, 1_000, 10_000]
+
+# Fonksiyonu çalıştırıp süresini ve (istenirse ayrı bir çalıştırmada) en yüksek bellek kullanımını ölçer.
+def measure(function, memory=True):
+    """
+    Süre ölçümü tracemalloc kapalıyken yapılır; bellek ölçümü tracemalloc'un yavaşlatması süreyi
+    bozmasın diye ikinci bir çalıştırmada yapılır.
+    :return: (seconds, peak_mb) -> peak_mb memory=False ise None
+    """
+    gc.collect()
+    logging.disable(logging.CRITICAL)  # Modüllerin durum mesajları ölçüme karışmasın
+    try:
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+
+        peak_mb = None
+        if memory:
+            gc.collect()
+            tracemalloc.start()
+            try:
+                function()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            peak_mb = peak / (1024 * 1024)
+    finally:
+        logging.disable(logging.NOTSET)
+    return seconds, peak_mb
+
+def point_stages(n_points, work_dir, rng):
+    """Tek bir dosyanın nokta sayısına bağlı aşamalarını döndürür: [(aşama adı, fonksiyon)]."""
+    prev_points, curr_points = cut_path(n_points, rng)
+    file_path = os.path.join(work_dir, f"points-{n_points}.csv")
+    write_cut_csv(file_path, prev_points, curr_points)
+
+    # Her ölçüm kendi CutPair kaydını kurar, böylece diziye dönüştürme ve önbellekleme süreye dahildir
+    def cut():
+        return CutPair(prev_points, curr_points, "benchmark.csv")
+
+    def distances():
+        analysis = GlassCutAnalysis(cut())
+        analysis.calculate_euclidean_distances()
+        analysis.calculate_statistics()
+
+    return [
+        ("load_data", lambda: load_data(file_path)),
+        ("glass_distances", distances),
+        ("glass_angles", lambda: GlassCutAnalysis(cut()).analyze_angle_similarity()),
+        ("shape_analyze_data", lambda: ShaperAnalysis(cut()).analyze_data()),
+        ("shape_fourier", lambda: ShaperAnalysis(cut()).apply_fourier_transform()),
+    ]
+
+def file_stages(n_files, work_dir, workers):
+    """Dosya sayısına bağlı aşamaları döndürür: [(aşama adı, fonksiyon)]."""
+    file_paths = write_cut_directory(os.path.join(work_dir, f"files-{n_files}"), n_files, n_points=30)
+    table = feature_table(n_files)
+    rows = table.to_dict("records")
+    csv_path = os.path.join(work_dir, f"results-{n_files}.csv")
+
+    def extract():
+        FeatureExtractor(None, workers=workers).run(file_paths, ResultsManager(), labeled=True)
+
+    def save_csv():
+        manager = ResultsManager()
+        for row in rows:
+            manager.add_row(row)
+        manager.save_results_to_csv(csv_path)
+
+    trainer = ModelTrainer(output_dir=os.path.join(work_dir, "model"), model_choice="random_forest")
+    X, y = trainer.preprocess_data(table)
+
+    def train():
+        trainer.model = None  # Her ölçümde sıfırdan eğitim
+        trainer.train_model(X, y)
+
+    def predict():
+        if trainer.model is None:
+            trainer.train_model(X, y)
+        trainer.predict(X, output_path=None)
+
+    return [
+        ("feature_extraction", extract),
+        ("save_results_to_csv", save_csv),
+        ("model_train", train),
+        ("model_predict", predict),
+    ]
+
+def run(points, files, memory=True, workers=1, seed=0):
+    rng = np.random.default_rng(seed)
+    results = []
+
+    def record(stage, unit, size, function):
+        seconds, peak_mb = measure(function, memory)
+        results.append({"stage": stage, "unit": unit, "size": size, "seconds": seconds, "peak_mb": peak_mb})
+        peak_text = f"{peak_mb:10.1f} MB" if peak_mb is not None else ""
+        print(f"{stage:<22}{size:>10} {unit:<7}{seconds:>10.4f} s {peak_text}", flush=True)
+
+    with tempfile.TemporaryDirectory(prefix="cutmatch-bench-") as work_dir:
+        for n_points in points:
+            for stage, function in point_stages(n_points, work_dir, rng):
+                record(stage, "points", n_points, function)
+        for n_files in files:
+            for stage, function in file_stages(n_files, work_dir, workers):
+                record(stage, "files", n_files, function)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": workers,
+        },
+        "results": results,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="İşlem hattı aşamalarının süre ve bellek ölçümü.")
+    parser.add_argument("--points", type=int, nargs="*", default=DEFAULT_POINTS,
+                        help="Nokta sayısına bağlı aşamalar için kontur uzunlukları")
+    parser.add_argument("--files", type=int, nargs="*", default=DEFAULT_FILES,
+                        help="Dosya sayısına bağlı aşamalar için dosya sayıları")
+    parser.add_argument("--workers", type=int, default=1, help="feature_extraction aşamasındaki süreç sayısı")
+    parser.add_argument("--no-memory", action="store_true", help="Bellek ölçümünü atla (yalnızca süre)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON raporunun yazılacağı dosya (varsayılan: ekrana)")
+    args = parser.parse_args(argv)
+
+    report = run(args.points, args.files, memory=not args.no_memory, workers=args.workers, seed=args.seed)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"Kıyaslama sonuçları {args.output} dosyasına kaydedildi.")
+    else:
+        print(text)
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+RandomForest tahminini scikit-learn ile ve derlenmiş NumPy puanlayıcıyla (forest_scorer) karşılaştırır.
+
+Sentetik özellik tablosuyla bir model eğitilir; her parti boyutu için iki yolun çağrı başına süresi ölçülür ve
+tahminlerin / olasılıkların birebir aynı olduğu doğrulanır. Farklı çıkan bir sonuç varsa çıkış kodu 1 olur.
+
+Kullanım (depo kök dizininden):
+    python -m benchmarks.scorer_benchmark --batch-sizes 1 16 1000 --repeat 50
+    python -m cli bench scorer --batch-sizes 1 1000
+"""
+from benchmarks.synthetic import feature_table
+from forest_scorer import CompiledForest
+from model_train import ModelTrainer
+import numpy as np
+import tempfile
+import argparse
+import logging
+import json
+import time
+import sys
+
+def train_forest(n_rows=2000, seed=0):
+    """Sentetik tabloyla RandomForest eğitir; (model, özellik tablosu) döndürür."""
+    with tempfile.TemporaryDirectory(prefix="cutmatch-scorer-") as work_dir:
+        trainer = ModelTrainer(output_dir=work_dir, model_choice="random_forest", plots=False)
+        X, y = trainer.preprocess_data(feature_table(n_rows, seed))
+        logging.disable(logging.CRITICAL)
+        try:
+            trainer.train_model(X, y)
+        finally:
+            logging.disable(logging.NOTSET)
+    return trainer.model, X
+
+def time_per_call(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+def run(batch_sizes, repeat, n_rows=2000):
+    model, X = train_forest(n_rows)
+    compiled = CompiledForest.from_model(model)
+    results = []
+    for batch_size in batch_sizes:
+        batch = X.iloc[:batch_size]  # scikit-learn'e ModelTrainer.predict'teki gibi sütun adlarıyla verilir
+        values = batch.to_numpy(dtype=float)
+        sklearn_ms, (sklearn_pred, sklearn_proba) = time_per_call(
+            lambda: (model.predict(batch), model.predict_proba(batch)), repeat)
+        compiled_ms, (compiled_pred, compiled_proba) = time_per_call(
+            lambda: (compiled.predict(values), compiled.predict_proba(values)), repeat)
+        results.append({
+            "batch_size": len(batch),
+            "sklearn_ms": sklearn_ms,
+            "compiled_ms": compiled_ms,
+            "speedup": sklearn_ms / compiled_ms,
+            "identical_predictions": bool(np.array_equal(sklearn_pred, compiled_pred)),
+            "max_abs_proba_diff": float(np.max(np.abs(sklearn_proba - compiled_proba))),
+        })
+    return {"trees": compiled.n_trees, "nodes": len(compiled.feature), "max_depth": compiled.max_depth,
+            "repeat": repeat, "results": results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="scikit-learn ve derlenmiş RandomForest puanlayıcı karşılaştırması.")
+    parser.add_argument("--batch-sizes", type=int, nargs="*", default=[1, 16, 1000],
+                        help="Tek çağrıda puanlanacak satır sayıları")
+    parser.add_argument("--repeat", type=int, default=50, help="Her ölçümün tekrar sayısı")
+    parser.add_argument("--json", dest="json_path", default=None, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    report = run(args.batch_sizes, args.repeat)
+    print(f"{report['trees']} ağaç, {report['nodes']} düğüm, en büyük derinlik {report['max_depth']}")
+    print(f"{'parti':>8}{'sklearn ms':>12}{'derlenmiş ms':>14}{'hızlanma':>10}{'aynı tahmin':>13}{'maks. fark':>12}")
+    for result in report["results"]:
+        print(f"{result['batch_size']:>8}{result['sklearn_ms']:>12.3f}{result['compiled_ms']:>14.3f}"
+              f"{result['speedup']:>10.1f}{str(result['identical_predictions']):>13}"
+              f"{result['max_abs_proba_diff']:>12.2e}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if not all(r["identical_predictions"] and r["max_abs_proba_diff"] == 0 for r in report["results"]):
+        print("Derlenmiş puanlayıcının sonuçları scikit-learn'den farklı.", file=sys.stderr)
+        sys.exit(1)
+    return report
+
+if __name__ == "__main__":
+    main()
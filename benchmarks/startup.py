@@ -0,0 +1,117 @@
+"""
+Tek dosya için 'python -m cli predict' çağrısının süreç başlangıcından bitişine kadar süresini ölçer.
+
+Geçici bir klasörde sentetik özellik tablosuyla küçük bir model eğitilir ve tek bir sentetik kesim dosyası
+yazılır; ardından tahmin komutu ayrı süreçlerde tekrar tekrar çalıştırılır. Ortanca süre
+cli.PREDICT_STARTUP_BUDGET_S bütçesini aşarsa çıkış kodu 1 olur. Hangi modüllerin yüklendiğini görmek için
+--importtime ile python -X importtime çıktısındaki en yavaş modüller de listelenir.
+
+Kullanım (depo kök dizininden):
+    python -m benchmarks.startup --repeat 5
+    python -m cli bench startup --repeat 5
+"""
+from benchmarks.synthetic import cut_path, write_cut_csv, feature_table
+import numpy as np
+import subprocess
+import statistics
+import tempfile
+import argparse
+import logging
+import json
+import time
+import sys
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sentetik verilerle modeli eğitip kaydeder ve tahmin edilecek tek bir kesim dosyası yazar.
+def prepare(work_dir, n_points=500, seed=0):
+    """
+    :return: (model_path, file_path)
+    """
+    from model_train import ModelTrainer
+
+    trainer = ModelTrainer(output_dir=os.path.join(work_dir, "model"), model_choice="random_forest", plots=False)
+    X, y = trainer.preprocess_data(feature_table(200, seed))
+    trainer.feature_columns = list(X.columns)
+    trainer.target_column = y.name
+    logging.disable(logging.CRITICAL)
+    try:
+        trainer.train_model(X, y)
+        model_path = os.path.join(work_dir, "model.joblib")
+        trainer.save_model(model_path)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    prev_points, curr_points = cut_path(n_points, np.random.default_rng(seed))
+    file_path = os.path.join(work_dir, "veriler-x-1.csv")
+    write_cut_csv(file_path, prev_points, curr_points)
+    return model_path, file_path
+
+def predict_command(model_path, file_path, work_dir, importtime=False, scorer="auto"):
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    return command + ["-m", "cli", "predict", file_path, "--model-path", model_path, "--output", "-", "--no-cache",
+                      "--workers", "1", "--log-level", "WARNING", "--cache-dir", os.path.join(work_dir, "cache"),
+                      "--scorer", scorer]
+
+# python -X importtime çıktısından kümülatif süresi en uzun üst düzey modülleri döndürür.
+def slowest_imports(stderr, top=10):
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit() and not name.startswith("  "):  # Yalnızca doğrudan içe aktarılanlar
+            entries.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+def run(repeat=5, importtime=False, scorer="auto"):
+    from cli import PREDICT_STARTUP_BUDGET_S
+
+    with tempfile.TemporaryDirectory(prefix="cutmatch-startup-") as work_dir:
+        model_path, file_path = prepare(work_dir)
+        command = predict_command(model_path, file_path, work_dir, scorer=scorer)
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=REPO_ROOT, check=True, capture_output=True)
+            seconds.append(time.perf_counter() - start)
+
+        imports = []
+        if importtime:
+            completed = subprocess.run(predict_command(model_path, file_path, work_dir, importtime=True, scorer=scorer),
+                                       cwd=REPO_ROOT, check=True, capture_output=True, text=True)
+            imports = slowest_imports(completed.stderr)
+
+    median = statistics.median(seconds)
+    return {
+        "command": "cli predict (tek dosya)",
+        "scorer": scorer,
+        "repeat": repeat,
+        "median_s": median,
+        "min_s": min(seconds),
+        "max_s": max(seconds),
+        "budget_s": PREDICT_STARTUP_BUDGET_S,
+        "within_budget": median <= PREDICT_STARTUP_BUDGET_S,
+        "slowest_imports": [{"module": name, "seconds": s} for s, name in imports],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tek dosya tahmininin başlangıç süresi ölçümü.")
+    parser.add_argument("--repeat", type=int, default=5, help="Tahmin komutunun çalıştırılma sayısı")
+    parser.add_argument("--importtime", action="store_true", help="En yavaş içe aktarılan modülleri de listele")
+    parser.add_argument("--scorer", choices=["auto", "compiled", "sklearn"], default="auto",
+                        help="Tahmin komutuna verilecek puanlayıcı")
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat, args.importtime, args.scorer)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if not report["within_budget"]:
+        print(f"Ortanca süre {report['median_s']:.2f} s, bütçe {report['budget_s']:.2f} s aşıldı.", file=sys.stderr)
+        sys.exit(1)
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Kıyaslama (benchmark) için sentetik kesim yolu, CSV dosyası ve özellik tablosu üreticileri.
+"""
+from results_manager import FEATURE_COLUMNS
+import numpy as np
+import pandas as pd
+import os
+
+# Kapalı ve kendini kesmeyen bir kesim konturu ile aynı/farklı seriden ikinci bir kontur üretir.
+def cut_path(n_points, rng, same_series=True, center=(1030, 560), radius=170, spacing=5.0):
+    """
+    Kontur merkeze göre yıldız biçimlidir (yarıçap açının fonksiyonu), bu yüzden gürültü eklense de
+    poligon geçerli kalır. Aynı seride curr, prev'in küçük yarıçap gürültüsü eklenmiş halidir;
+    farklı seride şekil parametreleri değişir. Yarıçap, noktalar arası ortalama mesafe en az
+    spacing piksel olacak şekilde büyütülür; aksi halde tam sayıya yuvarlama yoğun konturları kendini kesen hale getirir.
+    :return: (prev_points, curr_points) -> (n_points, 2) int32 diziler
+    """
+    radius = max(radius, spacing * n_points / (2 * np.pi))
+    angle = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
+    lobes = rng.integers(3, 7)
+    prev_radius = radius * (1 + 0.15 * np.sin(lobes * angle)) + rng.normal(0, 1.0, n_points)
+    if same_series:
+        curr_radius = prev_radius + rng.normal(0, 2.0, n_points)
+    else:
+        curr_radius = radius * (1 + 0.25 * np.sin((lobes + 2) * angle + 1.0)) + rng.normal(0, 1.0, n_points)
+
+    def to_points(r):
+        return np.column_stack((center[0] + r * np.cos(angle), center[1] + r * np.sin(angle))).round().astype(np.int32)
+
+    return to_points(prev_radius), to_points(curr_radius)
+
+# Kontur çiftini kesim makinesinin '[ 891  598]' satır biçiminde CSV dosyasına yazar.
+def write_cut_csv(file_path, prev_points, curr_points):
+    prev_text = [f"[{x:4d} {y:4d}]" for x, y in prev_points.tolist()]
+    curr_text = [f"[{x:4d} {y:4d}]" for x, y in curr_points.tolist()]
+    prev_text[0], curr_text[0] = "[" + prev_text[0], "[" + curr_text[0]
+    prev_text[-1], curr_text[-1] = prev_text[-1] + "]", curr_text[-1] + "]"
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("Prev. ,Curr. \n")
+        f.write("\n".join(f"{p},{c}" for p, c in zip(prev_text, curr_text)))
+        f.write("\n")
+
+# Klasöre n_files adet etiketli (dosya adında aynı/farklı geçen) kesim dosyası yazar.
+def write_cut_directory(directory, n_files, n_points, seed=0):
+    rng = np.random.default_rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index in range(n_files):
+        same_series = index % 2 == 0
+        prev_points, curr_points = cut_path(n_points, rng, same_series=same_series)
+        label = "aynı" if same_series else "farklı"
+        file_path = os.path.join(directory, f"veriler-{label}-{index}.csv")
+        write_cut_csv(file_path, prev_points, curr_points)
+        paths.append(file_path)
+    return paths
+
+# feature_extraction_output.csv biçiminde, sınıflara göre ayrışan sentetik bir özellik tablosu üretir.
+def feature_table(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    same_series = (np.arange(n_rows) % 2 == 0).astype(int)
+    data = {"file_name": [f"veriler-{'aynı' if s else 'farklı'}-{i}.csv" for i, s in enumerate(same_series)]}
+    for index, column in enumerate(FEATURE_COLUMNS):
+        shift = (index % 3 + 1) * same_series
+        data[column] = rng.normal(10 * (index + 1), 3, n_rows) + 5 * shift
+    data["same_series_value"] = same_series
+    return pd.DataFrame(data)
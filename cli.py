@@ -0,0 +1,497 @@
+"""
+Alt komutlu komut satırı arayüzü: extract, train, predict, serve ve bench.
+
+Her alt komut yalnızca ihtiyaç duyduğu modülleri, kendi fonksiyonunun içinde içe aktarır. scikit-learn'ün arama
+sınıfları yalnızca eğitimde, matplotlib/seaborn yalnızca grafik açıkken yüklenir. Böylece tek dosya için
+tahmin, eğitim ve çizim kütüphanelerinin yükleme süresini ödemez (bkz. PREDICT_STARTUP_BUDGET_S ve
+'python -m cli bench startup'). RandomForest modelinin yanında derlenmiş puanlayıcı (forest_scorer) varsa
+predict ve serve scikit-learn'ü hiç yüklemez (--scorer).
+
+Kullanım (depo kök dizininden):
+    python -m cli extract data/ --labeled --output results/analysis/feature_extraction_output.csv
+    python -m cli train data/ --model-path results/model/model.joblib
+    python -m cli train results/analysis/feature_extraction_output.csv
+    python -m cli predict unlabeled_data/veriler-x-1.csv
+    python -m cli serve --watch-dir incoming_data/
+    python -m cli bench stages --points 1000 --files 10
+    python -m cli bench scorer --batch-sizes 1 1000
+"""
+import time
+
+_STARTED = time.perf_counter()  # Süreç başlangıcına en yakın ölçüm noktası; tahmin süresi buradan ölçülür
+
+from plot_renderer import RENDER_MODES
+from glass_cut_analysis import ALIGNMENT_MODES
+from shape_analyzer import IOU_MODES
+from model_train import SEARCH_MODES, SCORERS
+from results_manager import RESULT_FORMATS, check_results_format
+import argparse
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Tek dosya için 'predict'in süreç başlangıcından sonuç yazılana kadar sürmesi beklenen en uzun süre (saniye)
+PREDICT_STARTUP_BUDGET_S = 3.0
+MODEL_OUTPUT_DIR = "results/visualizations/model"
+FEATURE_PLAN_PATH = "results/model/feature_plan.json"
+# Çıkarılan özellikleri değiştiren seçenekler ve varsayılanları; modelle birlikte kaydedilir ve tahminde aynıları kullanılır
+EXTRACTION_DEFAULTS = {"iou_mode": "exact", "iou_tolerance": 1.0, "resample": None, "simplify": None, "alignment": "off"}
+
+# Dosya keşfi seçeneklerini ekler.
+def add_discovery_arguments(parser):
+    parser.add_argument("--recursive", action="store_true",
+                        help="Veri klasörlerinin alt klasörlerini de tara")
+    parser.add_argument("--include", nargs="+", default=["*.csv", "*.xlsx"],
+                        help="Analiz edilecek dosya adı desenleri (glob)")
+    parser.add_argument("--exclude", nargs="*", default=["analysis_results.csv"],
+                        help="Atlanacak dosya adı veya göreli yol desenleri (glob)")
+    parser.add_argument("--prefetch", type=int, default=2,
+                        help="Analiz sürerken arka planda önceden yüklenecek dosya sayısı (0: kapalı)")
+
+# Özellik çıkarımı, çizim ve önbellek seçeneklerini ekler.
+def add_extraction_arguments(parser, plots="all"):
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Özellik çıkarımı için süreç sayısı (varsayılan: işlemci sayısı, 1: seri çalışma)")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Her sürece tek seferde gönderilecek dosya sayısı (varsayılan: otomatik)")
+    parser.add_argument("--plots", choices=RENDER_MODES, default=plots,
+                        help="Grafik üretimi: off (yok), sample (örneklem) veya all (tüm dosyalar)")
+    parser.add_argument("--plot-sample", type=int, default=10,
+                        help="'sample' modunda grafiği çizilecek dosya sayısı")
+    parser.add_argument("--no-plots", dest="plots", action="store_const", const="off",
+                        help="Grafik üretmeden yalnızca özellikleri çıkar (--plots off ile aynı)")
+    parser.add_argument("--iou-mode", choices=IOU_MODES, default=EXTRACTION_DEFAULTS["iou_mode"],
+                        help="IoU hesaplama modu: exact (shapely) veya raster (ızgara üzerinde yaklaşık)")
+    parser.add_argument("--iou-tolerance", type=float, default=EXTRACTION_DEFAULTS["iou_tolerance"],
+                        help="raster modunda ızgara hücre boyutu (koordinat birimi)")
+    parser.add_argument("--resample", type=int, default=EXTRACTION_DEFAULTS["resample"], metavar="N",
+                        help="Özelliklerden önce prev ve curr kontürlerini yay uzunluğu boyunca N eşit aralıklı noktaya örnekle")
+    parser.add_argument("--simplify", type=float, default=EXTRACTION_DEFAULTS["simplify"], metavar="TOLERANS",
+                        help="Özelliklerden önce kontürleri Douglas–Peucker ile bu toleransta sadeleştir (koordinat birimi)")
+    parser.add_argument("--alignment", choices=ALIGNMENT_MODES, default=EXTRACTION_DEFAULTS["alignment"],
+                        help="İndeks yerine en yakın nokta eşleşmesiyle ek mesafe sütunları: nearest (KD-ağacı ile "
+                             "en yakın nokta, Hausdorff, Chamfer) veya shift (ek olarak FFT ile döngüsel kaydırma)")
+    parser.add_argument("--cache-dir", default="results/cache/features",
+                        help="Özellik önbelleğinin klasörü")
+    parser.add_argument("--cache-max-mb", type=float, default=256,
+                        help="Özellik önbelleğinin en fazla boyutu (MB)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Önbelleği kullanmadan tüm dosyaları yeniden analiz et")
+
+# Kayıtlı model dosyası seçeneğini ekler.
+def add_model_arguments(parser):
+    parser.add_argument("--model-path", default="results/model/model.joblib",
+                        help="Eğitilen modelin kaydedileceği / yükleneceği dosya")
+    parser.add_argument("--scorer", choices=SCORERS, default="auto",
+                        help="Tahminde kullanılacak model: auto (varsa scikit-learn'süz derlenmiş puanlayıcı), "
+                             "compiled veya sklearn")
+
+# Maliyete duyarlı özellik seçimi ve özellik planı seçeneklerini ekler.
+def add_feature_plan_arguments(parser):
+    parser.add_argument("--feature-plan", default=None,
+                        help="Özellik planı (JSON); verilirse planda olmayan özellik grupları hiç hesaplanmaz")
+    parser.add_argument("--select-features", action="store_true",
+                        help="Eğitimden sonra grupların çıkarım maliyetini ve permutation importance'ını ölç, özellik "
+                             f"planını --feature-plan (varsayılan: {FEATURE_PLAN_PATH}) dosyasına yaz ve modeli "
+                             "kalan özelliklerle yeniden eğit")
+    parser.add_argument("--plan-tolerance", type=float, default=0.01,
+                        help="Atılan grupların test verisinde yol açabileceği en fazla doğruluk düşüşü")
+    parser.add_argument("--plan-sample", type=int, default=50,
+                        help="Maliyet ölçümünde analiz edilecek en fazla dosya sayısı")
+
+# Hiperparametre araması ve artımlı eğitim seçeneklerini ekler.
+def add_training_arguments(parser):
+    parser.add_argument("--search-mode", choices=SEARCH_MODES, default="grid",
+                        help="Hiperparametre araması: grid (tüm ızgara), random (rastgele) veya halving (ardışık yarılama)")
+    parser.add_argument("--search-candidates", type=int, default=20,
+                        help="random/halving aramalarında denenecek aday sayısı")
+    parser.add_argument("--max-fits", type=int, default=None,
+                        help="random/halving aramalarındaki en fazla model eğitimi sayısı "
+                             "(yarılamanın tüm turları ve son eğitim dahil)")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="random/halving araması için süre bütçesi (saniye)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Kayıtlı model varsa yalnızca son kayıttan sonra eklenen etiketli dosyalarla güncelle")
+    parser.add_argument("--trees-per-update", type=int, default=50,
+                        help="Artımlı eğitimde RandomForest'a eklenecek ağaç sayısı")
+    parser.add_argument("--drift-threshold", type=float, default=0.5,
+                        help="Yeni satırlarda bu özellik kayması (standart sapma cinsinden) aşılırsa tam eğitim yap")
+    parser.add_argument("--accuracy-drop", type=float, default=0.1,
+                        help="Modelin yeni satırlardaki doğruluğu referansın bu kadar altına düşerse tam eğitim yap")
+
+# İzleme servisi seçeneklerini ekler.
+def add_serve_arguments(parser):
+    parser.add_argument("--watch-dir", default="incoming_data/",
+                        help="Servis modunda izlenecek klasör")
+    parser.add_argument("--poll-interval", type=float, default=0.5,
+                        help="Servis modunda klasörün taranma aralığı (saniye)")
+
+# Özellik tablosu biçimi seçeneğini ekler.
+def add_results_format_argument(parser):
+    parser.add_argument("--results-format", choices=RESULT_FORMATS, default="csv",
+                        help="Özellik tablolarının kayıt biçimi: csv (3 basamak), parquet veya arrow (tam hassasiyet, pyarrow gerekir)")
+
+# --results-format seçeneğini doğrular; gereken kütüphane kurulu değilse hiçbir iş yapılmadan çıkılır.
+def validate_results_format(parser, args):
+    try:
+        check_results_format(args.results_format)
+    except ImportError as e:
+        parser.error(str(e))
+
+# Log düzeyi ve ölçüm seçeneklerini ekler.
+def add_logging_arguments(parser):
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Durum mesajlarının ayrıntı düzeyi (DEBUG: dosya bazında mesajlar)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Aşama bazında süre ölçümlerini topla ve çalışma sonunda özetini yaz")
+    parser.add_argument("--metrics-jsonl", default=None,
+                        help="Her ölçüm kaydının JSON-lines olarak ekleneceği dosya (--metrics'i de açar)")
+    parser.add_argument("--track-memory", action="store_true",
+                        help="Ölçümlere tracemalloc ile aşama bazında bellek zirvesini de ekle (yavaştır)")
+
+# Ölçüm çıkışlarını argümanlara göre kurar; ölçüm istenmemişse None döndürür.
+def configure_instrumentation(args):
+    if not (args.metrics or args.metrics_jsonl or args.track_memory):
+        return None
+    from utils.instrumentation import Instrumentation, MetricsRegistry, JsonLinesSink, set_instrumentation
+
+    registry = MetricsRegistry()
+    sinks = [registry]
+    if args.metrics_jsonl:
+        sinks.append(JsonLinesSink(args.metrics_jsonl))
+    set_instrumentation(Instrumentation(sinks, track_memory=args.track_memory))
+    return registry
+
+# Aşama bazındaki ölçüm özetini loglar ve ölçümü kapatır.
+def close_instrumentation(registry):
+    from utils.instrumentation import Instrumentation, set_instrumentation
+
+    logger.info("%-14s%8s%13s%13s%13s%13s", "Aşama", "Çağrı", "Toplam (s)", "Ort. (ms)", "En uzun (ms)", "Bellek (MB)")
+    for name, entry in sorted(registry.summary().items(), key=lambda item: -item[1]["total_s"]):
+        peak = f"{entry['peak_mb']:.2f}" if entry["peak_mb"] is not None else "-"
+        logger.info("%-14s%8d%13.3f%13.2f%13.2f%13s", name, entry["calls"], entry["total_s"],
+                    entry["mean_s"] * 1000, entry["max_s"] * 1000, peak)
+    set_instrumentation(Instrumentation()).close()  # JSON-lines dosyasını kapat, ölçümü kapat
+
+# --iou-mode / --iou-tolerance seçeneklerinden ShaperAnalysis ayarlarını oluşturur.
+def shape_options_from_args(args):
+    return {"iou_mode": args.iou_mode, "iou_tolerance": args.iou_tolerance}
+
+# --resample / --simplify seçeneklerinden normalize_contours ayarlarını oluşturur; ikisi de verilmemişse None döner.
+def contour_options_from_args(args):
+    options = {}
+    if args.resample:
+        options["n_samples"] = args.resample
+    if args.simplify:
+        options["simplify_tolerance"] = args.simplify
+    return options or None
+
+# Modelle birlikte kaydedilecek özellik çıkarım ayarlarını (EXTRACTION_DEFAULTS anahtarlarıyla) döndürür.
+def extraction_options_from_args(args):
+    return {name: getattr(args, name) for name in EXTRACTION_DEFAULTS}
+
+# Modelin eğitildiği özellik çıkarım ayarlarını argümanlara uygular.
+def apply_extraction_options(args, options):
+    """
+    Varsayılanında bırakılmış seçenekler modelin ayarını alır; açıkça farklı bir değer verilmişse, model başka ayarlarla
+    çıkarılmış özelliklerle çalışacağından hata verilir.
+    :param options: Modelin extraction_options'ı; None ise (eski model dosyaları) argümanlar değiştirilmez
+    """
+    if not options:
+        return
+    conflicts = []
+    for name, value in options.items():
+        current = getattr(args, name)
+        if current == value:
+            continue
+        if current != EXTRACTION_DEFAULTS[name]:
+            conflicts.append(f"--{name.replace('_', '-')} {current} (model: {value})")
+            continue
+        logger.info("--%s modelin eğitildiği değerle kullanılıyor: %s", name.replace("_", "-"), value)
+        setattr(args, name, value)
+    if conflicts:
+        raise ValueError("Özellik çıkarım seçenekleri modelin eğitildiği ayarlarla uyuşmuyor: " + ", ".join(conflicts))
+
+# Tahmin için kayıtlı modeli yükler ve argümanları modelin özellik çıkarım ayarlarına getirir.
+def load_inference_model(args):
+    from model_train import ModelTrainer
+
+    trainer = ModelTrainer.load_for_inference(args.model_path, output_dir=MODEL_OUTPUT_DIR, scorer=args.scorer)
+    apply_extraction_options(args, trainer.extraction_options)
+    return trainer
+
+# Argümanlara göre FeatureExtractor'ı, grafik kuyruğunu ve özellik önbelleğini kurar.
+def build_extractor(args, output_path="results/visualizations", skipped_groups=()):
+    """
+    :param skipped_groups: Hesaplanmayacak özellik grupları (bkz. feature_plan.skipped_groups)
+    :return: (extractor, renderer, cache) -> renderer ve cache kapalıysa None
+    """
+    from feature_extractor import FeatureExtractor, FEATURE_VERSION
+    from feature_cache import FeatureCache
+    from plot_renderer import PlotRenderer
+
+    # Grafikler arka plandaki bir kuyrukta çizilir; özellik çıkarımı savefig'i beklemez
+    renderer = PlotRenderer(mode=args.plots, sample_size=args.plot_sample) if args.plots != "off" else None
+    shape_options = shape_options_from_args(args)
+    # İçeriği değişmemiş dosyaların özellikleri önbellekten okunur; IoU ayarları da önbellek sürümüne dahildir
+    # Sadeleştirme ve yeniden örnekleme özellikleri değiştirir; model aynı ayarlarla eğitilip kullanılmalıdır
+    contour_options = contour_options_from_args(args)
+    cache_version = FEATURE_VERSION if args.iou_mode == "exact" else f"{FEATURE_VERSION}-raster-{args.iou_tolerance}"
+    if contour_options:
+        cache_version += f"-contour-{args.resample}-{args.simplify}"
+    if args.alignment != "off":
+        cache_version += f"-alignment-{args.alignment}"
+    if skipped_groups:  # Atlanan grupların sütunları olmayan satırlar tam satırlarla karışmasın
+        cache_version += f"-skip-{'+'.join(skipped_groups)}"
+    cache = None if args.no_cache else FeatureCache(args.cache_dir, cache_version, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    # Dosya bazındaki analizler süreç havuzunda paralel çalışır; sonuçlar dosya sırasıyla toplanır
+    extractor = FeatureExtractor(output_path, workers=args.workers, chunksize=args.chunksize, renderer=renderer, cache=cache,
+                                 shape_options=shape_options, prefetch=args.prefetch, contour_options=contour_options,
+                                 alignment=args.alignment, skipped_groups=skipped_groups)
+    return extractor, renderer, cache
+
+# Klasörler, nokta arşivleri ve tek tek verilen dosyalardan analiz edilecek dosya yollarını toplar.
+def collect_file_paths(paths, args):
+    from utils.file_loader import FileLoader
+    from utils.point_store import is_archive
+
+    file_paths = []
+    for path in paths:
+        if os.path.isdir(path) or is_archive(path):
+            file_paths.extend(FileLoader(path, recursive=args.recursive, include=args.include,
+                                         exclude=args.exclude).get_file_paths())
+        else:
+            file_paths.append(path)
+    return file_paths
+
+# Dosyaların özelliklerini çıkarıp results_manager'a ekler; grafik kuyruğunu ve önbelleği kapatır.
+def extract_features(args, file_paths, labeled, skipped_groups=()):
+    """
+    :param skipped_groups: Hesaplanmayacak özellik grupları; sütunları tabloda yer almaz
+    :return: Doldurulmuş ResultsManager
+    """
+    from results_manager import ResultsManager, ALIGNMENT_COLUMNS
+
+    results_manager = ResultsManager(extra_columns=ALIGNMENT_COLUMNS[args.alignment], skipped_groups=skipped_groups)
+    extractor, renderer, cache = build_extractor(args, skipped_groups=skipped_groups)
+    extractor.run(file_paths, results_manager, labeled=labeled)
+    if renderer is not None:
+        renderer.close()  # Kuyrukta bekleyen grafiklerin bitmesini bekle
+    if cache is not None:
+        cache.evict()  # Boyut sınırını aşan eski kayıtları temizle
+    return results_manager
+
+# Modelin tahminlerini predictions_unlabeled.csv biçiminde bir tabloya çevirir.
+def prediction_frame(trainer, data):
+    """
+    :param data: Özellik tablosu (file_name ve modelin özellik sütunları)
+    :return: source_file, predictions, prediction_label sütunlu DataFrame
+    """
+    import pandas as pd
+
+    X = trainer.select_features(data)  # Modelin eğitildiği sütunlar, aynı sırayla
+    predictions, _ = trainer.predict(X, output_path=None)  # Model üzerinden toplu tahmin yap
+    results_df = pd.DataFrame(predictions, columns=["predictions"])
+    results_df['source_file'] = data['file_name'].values  # Tahminin yapıldığı dosya adı (atlanan dosyalar hariç)
+    results_df['prediction_label'] = results_df['predictions'].apply(lambda x: 'aynı seri' if x == 1 else 'farklı seri')
+    return results_df[['source_file', 'predictions', 'prediction_label']]
+
+# Modeli eğitir (veya artımlı günceller) ve kaydeder.
+def train_model(args, data):
+    """
+    :param data: Etiketli özellik tablosu
+    :return: Eğitilmiş ModelTrainer
+    """
+    from model_train import ModelTrainer
+
+    plots = args.plots != "off"
+    if args.incremental and os.path.exists(args.model_path):
+        # Kayıtlı modeli yalnızca yeni etiketli satırlarla güncelle; eşikler aşılırsa tam eğitim yapılır
+        trainer = ModelTrainer.load_model(args.model_path, output_dir=MODEL_OUTPUT_DIR)
+        if trainer.extraction_options and trainer.extraction_options != extraction_options_from_args(args):
+            # Yeni satırlar farklı ayarlarla çıkarıldıysa eski satırlarla karıştırılmamalıdır
+            raise ValueError(f"Kayıtlı model farklı özellik çıkarım ayarlarıyla eğitilmiş: {trainer.extraction_options}. "
+                             f"Aynı seçeneklerle çalıştırın veya --incremental olmadan yeniden eğitin.")
+        trainer.extraction_options = extraction_options_from_args(args)
+        trainer.plots = plots
+        # Eşik aşılıp tam eğitime dönülürse arama da bu çalışmanın seçenekleri ve bütçesiyle yapılır
+        trainer.search_mode = args.search_mode
+        trainer.n_candidates = args.search_candidates
+        trainer.max_fits = args.max_fits
+        trainer.time_budget = args.time_budget
+        mode = trainer.run_incremental(data, trees_per_update=args.trees_per_update,
+                                       drift_threshold=args.drift_threshold, accuracy_drop=args.accuracy_drop)
+        if mode != "unchanged":
+            trainer.save_model(args.model_path)
+        return trainer
+
+    trainer = ModelTrainer(output_dir=MODEL_OUTPUT_DIR, model_choice="random_forest", search_mode=args.search_mode,
+                           n_candidates=args.search_candidates, max_fits=args.max_fits, time_budget=args.time_budget,
+                           plots=plots)
+    trainer.extraction_options = extraction_options_from_args(args)
+    trainer.run_training(data)  # Çıkarılan özelliklerle eğitimi başlat
+    trainer.save_model(args.model_path)  # Sonraki tahmin ve servis çalışmaları bu modeli kullanır
+
+    X, y = trainer.preprocess_data(data)
+    trainer.cross_validate(X, y, cv=5)  # Arama skorları varsa yeniden eğitim yapılmaz
+    return trainer
+
+# Özellik gruplarının maliyetini ve modele katkısını ölçüp planı kaydeder; model kalan gruplarla yeniden eğitilir.
+def select_features(args, trainer, data, extractor, file_paths):
+    """
+    Katkı, run_training'deki bölmenin test kısmında (model bu satırları görmedi) ölçülür.
+    :param trainer: data'nın tüm sütunlarıyla eğitilmiş ModelTrainer
+    :param extractor: Maliyet ölçümünde ayarları kullanılacak FeatureExtractor
+    :return: (plan, trainer) -> grup atıldıysa yeniden eğitilip kaydedilmiş ModelTrainer, atılmadıysa verilen trainer
+    """
+    from feature_plan import measure_group_costs, build_feature_plan, save_plan
+    from results_manager import FEATURE_GROUPS
+
+    costs = measure_group_costs(extractor, file_paths, sample_size=args.plan_sample)
+    X, y = trainer.preprocess_data(data)
+    _, X_test, _, y_test = trainer.split_data(X, y)
+    plan = build_feature_plan(trainer, X_test, y_test, costs, tolerance=args.plan_tolerance)
+    save_plan(plan, args.feature_plan or FEATURE_PLAN_PATH)
+    for group in plan["groups"]:
+        importance = plan["importance"][group]
+        logger.info("%-10s %8.2f ms/dosya, doğruluk katkısı %.4f ± %.4f", group, plan["cost_ms_per_file"][group],
+                    importance["mean"], importance["std"])
+    if not plan["dropped_groups"]:
+        return plan, trainer
+
+    dropped = [column for group in plan["dropped_groups"] for column in FEATURE_GROUPS[group]]
+    logger.info("Model %s grupları olmadan yeniden eğitiliyor.", ", ".join(plan["dropped_groups"]))
+    return plan, train_model(args, data.drop(columns=dropped, errors="ignore"))
+
+def _extract(args):
+    file_paths = collect_file_paths(args.paths, args)
+    results_manager = extract_features(args, file_paths, labeled=args.labeled)
+    output_file = args.output or f"results/analysis/features.{args.results_format}"
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    results_manager.save_results(output_file, args.results_format)
+    logger.info("%d dosyanın özellikleri %s dosyasına kaydedildi.", len(results_manager), output_file)
+
+def _train(args):
+    from utils.point_store import is_archive
+
+    if os.path.isfile(args.source) and not is_archive(args.source):
+        # extract (veya main.py) ile kaydedilmiş özellik tablosu; dosyalar yeniden analiz edilmez
+        from results_manager import ResultsManager
+        data = ResultsManager.load_results(args.source)
+    else:
+        data = extract_features(args, collect_file_paths([args.source], args), labeled=True).to_frame()
+    train_model(args, data)
+
+def _predict(args):
+    from feature_plan import skipped_groups
+
+    trainer = load_inference_model(args)  # Özellikler modelin eğitildiği ayarlarla çıkarılır
+    file_paths = collect_file_paths(args.paths, args)
+    # Modelin kullanmadığı özellik grupları hiç hesaplanmaz
+    skipped = skipped_groups(trainer.feature_columns, args.alignment)
+    data = extract_features(args, file_paths, labeled=False, skipped_groups=skipped).to_frame()
+    results_df = prediction_frame(trainer, data)
+    if args.output == "-":
+        for row in results_df.itertuples(index=False):
+            print(f"{row.source_file}\t{row.predictions}\t{row.prediction_label}")
+    else:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        results_df.to_csv(args.output, index=False)
+        logger.info("Tahmin sonuçları %s dosyasına kaydedildi.", args.output)
+
+    elapsed = time.perf_counter() - _STARTED
+    if len(file_paths) == 1 and elapsed > PREDICT_STARTUP_BUDGET_S:
+        logger.warning("Tek dosya tahmini %.2f saniye sürdü (bütçe %.2f saniye).", elapsed, PREDICT_STARTUP_BUDGET_S)
+    else:
+        logger.debug("Tahmin %.2f saniyede tamamlandı.", elapsed)
+
+# Kayıtlı modeli bir kez yükler ve --watch-dir klasörüne gelen her dosya için anında tahmin yapar.
+def start_watch_service(args, output_csv="results/predictions_unlabeled.csv"):
+    from watch_service import WatchService
+    from feature_plan import skipped_groups
+
+    trainer = load_inference_model(args)
+    os.makedirs(args.watch_dir, exist_ok=True)
+    service = WatchService(trainer, args.watch_dir, output_csv, poll_interval=args.poll_interval,
+                           contour_options=contour_options_from_args(args), alignment=args.alignment,
+                           skipped_groups=skipped_groups(trainer.feature_columns, args.alignment),
+                           shape_options=shape_options_from_args(args))
+    return service.serve_forever()
+
+def _serve(args):
+    start_watch_service(args)
+
+def _bench(args):
+    if args.suite == "stages":
+        from benchmarks.run_benchmarks import main as bench_main
+    elif args.suite == "iou":
+        from benchmarks.iou_benchmark import main as bench_main
+    elif args.suite == "scorer":
+        from benchmarks.scorer_benchmark import main as bench_main
+    else:
+        from benchmarks.startup import main as bench_main
+    bench_main(args.bench_args)
+
+COMMANDS = {"extract": _extract, "train": _train, "predict": _predict, "serve": _serve, "bench": _bench}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cli",
+                                     description="Cam kesim serilerinin özellik çıkarımı, model eğitimi ve tahmini.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    extract_parser = subparsers.add_parser("extract", help="Dosyaların özelliklerini çıkarıp tabloya kaydet")
+    extract_parser.add_argument("paths", nargs="+", help="Klasörler, nokta arşivleri (.cutpts) veya dosyalar")
+    extract_parser.add_argument("--labeled", action="store_true",
+                                help="Dosya adlarından same_series_value etiketini de üret")
+    extract_parser.add_argument("--output", default=None,
+                                help="Özellik tablosu (varsayılan: results/analysis/features.<biçim>)")
+    add_results_format_argument(extract_parser)
+    add_discovery_arguments(extract_parser)
+    add_extraction_arguments(extract_parser)
+
+    train_parser = subparsers.add_parser("train", help="Etiketli verilerle modeli eğit ve kaydet")
+    train_parser.add_argument("source", help="Etiketli veri klasörü / nokta arşivi veya extract ile kaydedilmiş özellik tablosu")
+    add_model_arguments(train_parser)
+    add_training_arguments(train_parser)
+    add_discovery_arguments(train_parser)
+    add_extraction_arguments(train_parser, plots="off")
+
+    predict_parser = subparsers.add_parser("predict", help="Kayıtlı modelle dosyalar için tahmin yap")
+    predict_parser.add_argument("paths", nargs="+", help="Klasörler, nokta arşivleri (.cutpts) veya dosyalar")
+    predict_parser.add_argument("--output", default="results/predictions_unlabeled.csv",
+                                help="Tahminlerin yazılacağı CSV ('-': ekrana yaz)")
+    add_model_arguments(predict_parser)
+    add_discovery_arguments(predict_parser)
+    add_extraction_arguments(predict_parser, plots="off")
+
+    serve_parser = subparsers.add_parser("serve", help="Klasörü izleyip gelen her dosya için anında tahmin yap")
+    add_model_arguments(serve_parser)
+    add_serve_arguments(serve_parser)
+    add_extraction_arguments(serve_parser, plots="off")
+
+    bench_parser = subparsers.add_parser("bench", help="Kıyaslamaları çalıştır")
+    bench_parser.add_argument("suite", choices=["stages", "iou", "scorer", "startup"],
+                              help="stages: aşama süreleri, iou: IoU yolları, scorer: sklearn / derlenmiş puanlayıcı, "
+                                   "startup: tek dosya tahmin başlangıç süresi")
+    bench_parser.add_argument("bench_args", nargs=argparse.REMAINDER, help="Kıyaslama betiğine aktarılacak argümanlar")
+
+    for subparser in (extract_parser, train_parser, predict_parser, serve_parser, bench_parser):
+        add_logging_arguments(subparser)
+    args = parser.parse_args(argv)
+    if args.command == "extract":
+        validate_results_format(extract_parser, args)
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(message)s")
+    registry = configure_instrumentation(args)
+    try:
+        COMMANDS[args.command](args)
+    finally:
+        if registry is not None:
+            close_instrumentation(registry)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Bir kesim dosyasının prev ve curr kontürlerini tek bir dizide tutan değişmez kayıt.
+
+CutPair her dosya için bir kez kurulur ve tüm analizlere (GlassCutAnalysis, ShaperAnalysis, Fourier ve hizalama)
+aynı nesne verilir. Türetilmiş görünümler (mesafeler, segment vektörleri, açılar, poligonlar, spektrumlar) ilk
+istendiklerinde hesaplanır ve saklanır; böylece bir dosyada hiçbir dönüşüm ya da ara sonuç iki kez hesaplanmaz.
+"""
+from shapely.geometry import Polygon
+import numpy as np
+import scipy.fft
+
+_UNSET = object()  # Henüz hesaplanmamış görünümler için işaret (None geçerli bir sonuç olabilir)
+
+# Kontürlerin Fourier büyüklük spektrumlarını, aynı uzunluktakileri tek bir karmaşık FFT çağrısında toplayarak hesaplar.
+def magnitude_spectra(contours, workers=None):
+    """
+    Her kontür z = x + iy olarak tek bir karmaşık FFT ile dönüştürülür. Gerçel x ve y dizilerinin
+    spektrumları Z(k) ve Z(-k)'den ayrılabildiği için ayrı ayrı fft(x) ve fft(y) almaya gerek kalmaz:
+        |X(k)|² + |Y(k)|² = (|Z(k)|² + |Z(-k)|²) / 2
+    Sıfır doldurma spektrumu değiştireceğinden kontürler doldurulmaz, uzunluklarına göre gruplanır.
+    :param contours: Her biri (N_i, 2) olan nokta dizileri
+    :param workers: scipy.fft'nin kullanacağı iş parçacığı sayısı (None: tek)
+    :return: (magnitudes, spectra) -> her kontür için (N_i,) büyüklük spektrumu ve (N_i,) karmaşık Z spektrumu
+    """
+    magnitudes = [None] * len(contours)
+    spectra = [None] * len(contours)
+    groups = {}
+    for index, points in enumerate(contours):
+        groups.setdefault(len(points), []).append(index)
+
+    for n, indices in groups.items():
+        if n == 0:
+            for index in indices:
+                magnitudes[index] = np.empty(0)
+                spectra[index] = np.empty(0, dtype=complex)
+            continue
+        batch = np.empty((len(indices), n), dtype=complex)
+        for row, index in enumerate(indices):
+            points = np.asarray(contours[index], dtype=float)
+            batch.real[row] = points[:, 0]
+            batch.imag[row] = points[:, 1]
+        z = scipy.fft.fft(batch, axis=1, workers=workers)
+        power = z.real ** 2 + z.imag ** 2
+        batch_magnitudes = np.sqrt((power + power[:, -np.arange(n) % n]) / 2)  # -k indisleri mod n
+        for row, index in enumerate(indices):
+            magnitudes[index] = batch_magnitudes[row]
+            spectra[index] = z[row]
+    return magnitudes, spectra
+
+# Nokta listesini (N, 2) boyutlu float dizisine çevirir ve biçimini doğrular.
+def _as_point_array(points, name):
+    array = np.asarray(points, dtype=float)
+    if array.size == 0:
+        return np.empty((0, 2), dtype=float)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"Noktalar yanlış formatta: {name} = {points}")
+    return array
+
+# Geçersiz poligonu buffer(0) ile düzeltir.
+def _valid_polygon(points):
+    polygon = Polygon(points)
+    if not polygon.is_valid:
+        polygon = polygon.buffer(0)  # Küçük topolojik hataları düzeltir
+    return polygon
+
+class CutPair:  # prev ve curr kontürlerini (2, N, 2) tek dizide tutar; türetilmiş görünümleri bir kez hesaplar.
+    __slots__ = ("points", "lengths", "file_name",
+                 "_distances", "_segments", "_angles", "_polygons", "_spectra")
+
+    def __init__(self, prev_points, curr_points, file_name=None):
+        """
+        Noktalar (N, 2) boyutlu dizi ya da [x, y] listelerinden oluşan liste olabilir.
+        Uzunluklar farklıysa kısa kontürün sonu NaN ile doldurulur; prev ve curr görünümleri yine gerçek
+        uzunluklarıyla döner, indeks eşleşmesi gereken hesaplar ortak (kısa olan) uzunlukta yapılır.
+        """
+        prev = _as_point_array(prev_points, "Prev")
+        curr = _as_point_array(curr_points, "Curr")
+        lengths = (len(prev), len(curr))
+        if lengths[0] == lengths[1]:
+            points = np.stack((prev, curr))
+        else:
+            points = np.full((2, max(lengths), 2), np.nan)
+            points[0, :lengths[0]] = prev
+            points[1, :lengths[1]] = curr
+        points.setflags(write=False)
+        object.__setattr__(self, "points", points)
+        object.__setattr__(self, "lengths", lengths)
+        object.__setattr__(self, "file_name", file_name)
+        for name in CutPair.__slots__[3:]:
+            object.__setattr__(self, name, _UNSET)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CutPair değiştirilemez.")
+
+    def __reduce__(self):
+        return CutPair, (self.prev, self.curr, self.file_name)
+
+    def __repr__(self):
+        return f"CutPair({self.file_name!r}, prev={self.lengths[0]}, curr={self.lengths[1]})"
+
+    def computed(self, view):
+        """Türetilmiş görünüm ('distances', 'segments', 'angles', 'polygons', 'spectra') hesaplanmışsa True."""
+        return getattr(self, "_" + view) is not _UNSET
+
+    def _memoize(self, name, compute):
+        """Görünümü ilk istendiğinde hesaplar ve saklar; dizileri salt okunur yapar."""
+        value = getattr(self, name)
+        if value is _UNSET:
+            value = compute()
+            for array in value if isinstance(value, tuple) else (value,):
+                if isinstance(array, np.ndarray):
+                    array.setflags(write=False)
+            object.__setattr__(self, name, value)
+        return value
+
+    @property
+    def prev(self):
+        """prev kontürünün (n_prev, 2) görünümü (kopya değildir)."""
+        return self.points[0, :self.lengths[0]]
+
+    @property
+    def curr(self):
+        """curr kontürünün (n_curr, 2) görünümü (kopya değildir)."""
+        return self.points[1, :self.lengths[1]]
+
+    @property
+    def n_paired(self):
+        """İndeks eşleşmesindeki nokta sayısı (zip davranışı: kısa olan seriye göre kesilir)."""
+        return min(self.lengths)
+
+    @property
+    def paired(self):
+        """Ortak uzunluktaki (2, n_paired, 2) görünüm; [0] prev, [1] curr."""
+        return self.points[:, :self.n_paired]
+
+    @property
+    def has_points(self):
+        """İki kontürde de en az bir nokta varsa True."""
+        return self.n_paired > 0
+
+    @property
+    def distances(self):
+        """prev[i] ile curr[i] arasındaki Öklid mesafeleri, (n_paired,)."""
+        def compute():
+            diff = self.paired[0] - self.paired[1]
+            return np.hypot(diff[:, 0], diff[:, 1])
+        return self._memoize("_distances", compute)
+
+    @property
+    def segments(self):
+        """Ardışık noktalar arasındaki segment vektörleri, (2, n_paired - 1, 2)."""
+        return self._memoize("_segments", lambda: np.diff(self.paired, axis=1))
+
+    @property
+    def angles(self):
+        """Segment açıları (derece), (n_paired - 1, 2); 0. sütun prev, 1. sütun curr."""
+        def compute():
+            segments = self.segments
+            return np.arctan2(segments[:, :, 1], segments[:, :, 0]).T * (180 / np.pi)
+        return self._memoize("_angles", compute)
+
+    @property
+    def polygons(self):
+        """(prev_polygon, curr_polygon); geçersiz poligonlar buffer(0) ile düzeltilmiştir."""
+        return self._memoize("_polygons", lambda: (_valid_polygon(self.prev), _valid_polygon(self.curr)))
+
+    @property
+    def spectra(self):
+        """
+        (magnitude_prev, magnitude_curr, z_prev, z_curr): magnitude_spectra ile hesaplanan büyüklük ve karmaşık
+        Z spektrumları. batch_fourier_transform toplu FFT sonuçlarını set_spectra ile buraya yazar.
+        """
+        def compute():
+            magnitudes, spectra = magnitude_spectra([self.prev, self.curr])
+            return magnitudes[0], magnitudes[1], spectra[0], spectra[1]
+        return self._memoize("_spectra", compute)
+
+    def set_spectra(self, magnitude_prev, magnitude_curr, z_prev, z_curr):
+        """Dosyalar arasında toplu hesaplanmış spektrumları saklar; spektrum zaten varsa değiştirmez."""
+        self._memoize("_spectra", lambda: (magnitude_prev, magnitude_curr, z_prev, z_curr))
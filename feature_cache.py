@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+from utils.point_store import open_point_store, split_member_path
+import logging
+
+logger = logging.getLogger(__name__)
+
+class FeatureCache:  # Dosya içeriğinin özetiyle anahtarlanan, diskte tutulan özellik satırı önbelleği.
+    def __init__(self, cache_dir, version, max_bytes=256 * 1024 * 1024):
+        """
+        :param cache_dir: Önbellek kayıtlarının tutulacağı klasör
+        :param version: Özellik kodunun sürümü; değiştiğinde eski kayıtlar kullanılmaz
+        :param max_bytes: Önbelleğin diskte kaplayabileceği en fazla alan; aşıldığında en eski kayıtlar silinir
+        """
+        self.cache_dir = cache_dir
+        self.version = str(version)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, file_path, labeled):
+        """
+        Dosya içeriği, dosya adı, etiket modu ve özellik sürümünden anahtar üretir.
+        Dosya adı anahtara dahildir çünkü satır file_name ve addan türetilen same_series_value içerir.
+        Nokta arşivindeki dosyalarda içerik yerine arşivdeki nokta dizileri özetlenir.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{self.version}\0{int(bool(labeled))}\0{os.path.basename(file_path)}\0".encode("utf-8"))
+        member = split_member_path(file_path)
+        if member is not None:
+            try:
+                prev_points, curr_points = open_point_store(member[0]).get(member[1])
+            except KeyError as e:
+                raise OSError(str(e)) from e  # Okunamayan dosya gibi ele alınır
+            digest.update(b"points\0")
+            digest.update(prev_points)
+            digest.update(curr_points)
+            return digest.hexdigest()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Kayıtlı satırı döndürür; yoksa veya okunamıyorsa None döndürür."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                row = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path)  # Erişim zamanını güncelle; tahliye en uzun süre kullanılmayanlardan başlar
+        self.hits += 1
+        return row
+
+    def put(self, key, row):
+        """Satırı önbelleğe yazar; yarım kalmış yazma okunmasın diye önce geçici dosyaya yazılır."""
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(row, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def evict(self):
+        """Toplam boyut max_bytes'ı aşıyorsa en uzun süredir kullanılmayan kayıtları siler."""
+        entries = []
+        total = 0
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        logger.info("Özellik önbelleğinden %d eski kayıt silindi.", removed)
+        return removed
@@ -0,0 +1,337 @@
+from concurrent.futures import ProcessPoolExecutor
+from utils.file_loader import load_data, source_exists, prefetch
+from glass_cut_analysis import GlassCutAnalysis, ALIGNMENT_MODES
+from shape_analyzer import ShaperAnalysis, batch_fourier_transform, batch_iou, normalize_contours
+from cut_pair import CutPair
+from plot_renderer import PlotCollector
+from results_manager import ResultsManager
+from utils.instrumentation import stage, capture, get_instrumentation
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Özellik hesaplama kodunun sürümü; çıkarılan değerleri değiştiren her değişiklikte artırılmalıdır ki önbellekteki eski satırlar kullanılmasın.
+FEATURE_VERSION = "2"
+
+# Her toplu işe (süreç görevine) verilecek en fazla dosya sayısı; bellekte aynı anda tutulan kontürleri sınırlar.
+MAX_BATCH_SIZE = 256
+
+# Tek bir dosya için tüm özellik çıkarım adımlarını çalıştırır.
+def analyze_file(file_path, output_path, labeled, plots=None, shape_options=None, contour_options=None, alignment="off",
+                 skipped_groups=()):
+    """
+    Dosyayı yükler, GlassCutAnalysis ve ShaperAnalysis analizlerini yapar.
+    :param plots: Çizim işlerinin gönderileceği renderer/collector; None ise grafik üretilmez
+    :param shape_options: ShaperAnalysis'e aktarılacak ek ayarlar (ör. iou_mode, iou_tolerance)
+    :param contour_options: normalize_contours ayarları (n_samples, simplify_tolerance); None ise ham noktalar kullanılır
+    :param alignment: Hizalama özellikleri modu (ALIGNMENT_MODES); 'off' ise hesaplanmaz
+    :param skipped_groups: Hesaplanmayacak FEATURE_GROUPS grupları (bkz. feature_plan.skipped_groups)
+    :return: ResultsManager.add_result için (file_name, mean_distance, std_distance,
+             shaper_result, angle_analysis, fourier_result, same_series_value, alignment_result) demeti;
+             skipped_groups verildiyse build_result'a da aynı gruplar verilmelidir
+    """
+    file_name = os.path.basename(file_path)  # Dosya adını al
+    with stage("file", file_name):
+        (file_name, cut, mean_distance, std_distance,
+         shaper_result, angle_analysis, same_series_value, alignment_result) = _measure_file(
+            file_path, output_path, labeled, plots, shape_options, contour_options, alignment,
+            skipped_groups=skipped_groups)
+
+        fourier_result = {}
+        if cut.has_points and "fourier" not in skipped_groups:  # Noktalar varsa Fourier analizi
+            shaper_analysis = ShaperAnalysis(cut, output_path, renderer=plots)
+            fourier_result = shaper_analysis.apply_fourier_transform()
+
+    return (file_name, mean_distance, std_distance, shaper_result, angle_analysis, fourier_result, same_series_value,
+            alignment_result)
+
+# Dosyanın varlığını kontrol edip prev ve curr noktalarını yükler.
+def _load_points(file_path):
+    file_name = os.path.basename(file_path)
+    if not source_exists(file_path):
+        raise FileNotFoundError(f"{file_name} bulunamadı.")
+
+    logger.debug("%s dosyası yükleniyor...", file_name)
+    prev_points, curr_points = load_data(file_path)  # Veriyi yükle ve işaret noktalarını al
+    logger.debug("%s dosyası yüklendi. Toplam %d previous nokta ve %d current nokta bulundu.",
+                 file_name, len(prev_points), len(curr_points))
+    return prev_points, curr_points
+
+# Fourier dışındaki tüm özellikleri hesaplar; Fourier özellikleri toplu işlerde dosyalar arasında birlikte hesaplanır.
+def _measure_file(file_path, output_path, labeled, plots, shape_options, contour_options=None, alignment="off",
+                  points=None, skipped_groups=()):
+    """
+    :param points: Önceden yüklenmiş (prev_points, curr_points); None ise dosya burada yüklenir
+    :param skipped_groups: Hesaplanmayacak gruplar; sonuçları boş kalır
+    :return: (file_name, cut, mean_distance, std_distance,
+             shaper_result, angle_analysis, same_series_value, alignment_result) demeti;
+             cut, tüm analizlerin paylaştığı CutPair kaydıdır (Fourier özellikleri de ondan hesaplanır)
+    """
+    file_name = os.path.basename(file_path)
+    logger.debug("İşleniyor: %s", file_name)
+    prev_points, curr_points = points if points is not None else _load_points(file_path)
+    if contour_options:  # Sadeleştirme / yeniden örnekleme: prev ve curr aynı uzunluğa getirilir
+        with stage("preprocess", file_name):
+            prev_points, curr_points = normalize_contours((prev_points, curr_points), **contour_options)
+
+    cut = CutPair(prev_points, curr_points, file_name)  # Noktalar bir kez diziye çevrilir; tüm analizler paylaşır
+    glass_analysis = GlassCutAnalysis(cut)  # Analiz sınıfını oluşturuyoruz
+    distances = glass_analysis.calculate_euclidean_distances()  # Öklid mesafelerini hesaplıyoruz
+
+    if len(distances):  # Mesafeler boş değilse istatistikleri hesapla
+        mean_distance, std_distance = glass_analysis.calculate_statistics()
+    else:
+        mean_distance, std_distance = None, None  # Mesafe hesaplanmadıysa None atayın
+
+    same_series_value = glass_analysis.label_same_series() if labeled else None  # Seri etiketi
+
+    # Shaper ve açı analiz sonuçları için varsayılan değerler
+    shaper_result = {}
+    angle_analysis = {}
+    alignment_result = None
+
+    if cut.has_points:  # Noktalar varsa
+        if "polygons" not in skipped_groups:
+            shaper_analysis = ShaperAnalysis(cut, output_path, renderer=plots, **(shape_options or {}))
+            shaper_result = shaper_analysis.analyze_data()  # intersection_area, union_area, iou
+        if "angles" not in skipped_groups:
+            angle_analysis = glass_analysis.analyze_angle_similarity()  # mean_prev, std_prev, mean_curr, std_curr, mse, similarity_score
+        if alignment != "off" and "alignment" not in skipped_groups:  # En yakın nokta eşleşmesiyle mesafeler (ve istenirse döngüsel kaydırma)
+            alignment_result = glass_analysis.analyze_alignment(cyclic_shift=alignment == "shift")
+
+    return (file_name, cut, mean_distance, std_distance,
+            shaper_result, angle_analysis, same_series_value, alignment_result)
+
+# Süreç havuzunda çalışan görev; bir toplu işteki dosyaları analiz eder.
+# Hatalar dosya bazında yakalanır ki tek bir bozuk dosya tüm işi durdurmasın.
+# Çizimler işçide yapılmaz, iş olarak toplanıp ana süreçteki renderer'a döndürülür.
+# Ölçüm açıksa (metrics None değilse) aşama kayıtları da işçide toplanıp ana sürece döndürülür.
+def _analyze_batch(task):
+    (file_paths, output_path, labeled, rendered, shape_options, contour_options, alignment, fft_workers, prefetch_depth,
+     skipped_groups, metrics) = task
+    if metrics is None:
+        return _analyze_files(file_paths, output_path, labeled, rendered, shape_options, contour_options, alignment,
+                              fft_workers, prefetch_depth, skipped_groups), []
+    with capture(track_memory=metrics) as records:
+        outcomes = _analyze_files(file_paths, output_path, labeled, rendered, shape_options, contour_options, alignment,
+                                  fft_workers, prefetch_depth, skipped_groups)
+    return outcomes, records
+
+def _analyze_files(file_paths, output_path, labeled, rendered, shape_options, contour_options, alignment, fft_workers,
+                   prefetch_depth=0, skipped_groups=()):
+    """
+    Dosyaların diğer özelliklerini tek tek, Fourier özelliklerini batch_fourier_transform ile ve kesin (exact)
+    IoU'yu batch_iou ile tüm toplu iş için birlikte hesaplar. prefetch_depth > 0 ise sıradaki dosyalar arka planda yüklenir.
+    :return: Her dosya için (row, plot_jobs, error) listesi
+    """
+    outcomes = [None] * len(file_paths)
+    measured = []
+    # Kesin IoU toplu işte tek vektörel shapely çağrısıyla hesaplanır; dosya bazında poligon analizi yapılmaz
+    batched_iou = (shape_options or {}).get("iou_mode", "exact") == "exact" and "polygons" not in skipped_groups
+    measure_skipped = tuple(skipped_groups) + ("polygons",) if batched_iou else skipped_groups
+    loaded = prefetch(file_paths, depth=prefetch_depth, loader=_load_points)
+    for index, (file_path, points, load_error) in enumerate(loaded):
+        plots = PlotCollector() if rendered[index] else None
+        try:
+            if load_error is not None:
+                raise load_error
+            with stage("file", os.path.basename(file_path)):
+                measured.append((index, plots, _measure_file(file_path, output_path, labeled, plots, shape_options,
+                                                             contour_options, alignment, points, measure_skipped)))
+        except Exception as e:
+            outcomes[index] = (None, [], f"{type(e).__name__}: {e}")
+
+    failed = {}  # Toplu hesap başarısız olunca dosya bazında tekrar denenip yine hata veren dosyalar
+    polygon_results = {}
+    if batched_iou:
+        with_polygons = [entry for entry in measured if entry[2][1].has_points]
+        cuts = [entry[2][1] for entry in with_polygons]
+        try:
+            with stage("polygon_ops"):
+                intersection_area, union_area, iou, valid = batch_iou([cut.prev for cut in cuts],
+                                                                      [cut.curr for cut in cuts])
+        except Exception as e:
+            # Tek bir bozuk dosya tüm toplu işi durdurmasın; IoU dosya bazında hesaplanır, yalnızca hatalı dosya düşer
+            logger.warning("Toplu IoU hesabı başarısız oldu (%s: %s); dosyalar tek tek hesaplanıyor.",
+                           type(e).__name__, e)
+            for index, plots, measurement in with_polygons:
+                try:
+                    polygon_results[index] = ShaperAnalysis(measurement[1], output_path, renderer=plots,
+                                                            **(shape_options or {})).analyze_data()
+                except Exception as file_error:
+                    failed[index] = f"{type(file_error).__name__}: {file_error}"
+            with_polygons = []
+        for position, (index, plots, measurement) in enumerate(with_polygons):
+            cut = measurement[1]
+            if not valid[position]:  # ShaperAnalysis.analyze_data'daki gibi dosya atlanır
+                if cut.n_paired < 3:
+                    logger.warning("%s dosyasında geçerli nokta yok. Atlanıyor.", cut.file_name)
+                else:
+                    logger.warning("%s dosyasındaki poligonlar geçersiz. Atlanıyor.", cut.file_name)
+                polygon_results[index] = None
+                continue
+            if plots is not None:
+                plots.submit("polygons", output_path, cut.file_name, cut.prev, cut.curr)
+            polygon_results[index] = {
+                "file_name": cut.file_name,
+                "intersection_area": float(intersection_area[position]),
+                "union_area": float(union_area[position]),
+                "iou": float(iou[position]),
+            }
+
+    fourier_results = {}
+    if "fourier" not in skipped_groups:  # Fourier grubu atlanıyorsa toplu FFT hiç yapılmaz
+        with_points = [entry for entry in measured if entry[2][1].has_points and entry[0] not in failed]
+        try:
+            summaries = batch_fourier_transform([entry[2][1] for entry in with_points], workers=fft_workers,
+                                                keep_spectra={i for i, entry in enumerate(with_points)
+                                                              if entry[1] is not None})
+            fourier_results = {entry[0]: summary for entry, summary in zip(with_points, summaries)}
+        except Exception as e:
+            logger.warning("Toplu Fourier hesabı başarısız oldu (%s: %s); dosyalar tek tek hesaplanıyor.",
+                           type(e).__name__, e)
+            for index, plots, measurement in with_points:
+                try:
+                    fourier_results[index] = batch_fourier_transform(
+                        [measurement[1]], keep_spectra={0} if plots is not None else ())[0]
+                except Exception as file_error:
+                    failed[index] = f"{type(file_error).__name__}: {file_error}"
+
+    for index, plots, (file_name, _, mean_distance, std_distance, shaper_result, angle_analysis,
+                       same_series_value, alignment_result) in measured:
+        if index in failed:
+            outcomes[index] = (None, [], failed[index])
+            continue
+        shaper_result = polygon_results.get(index, shaper_result)
+        fourier_result = fourier_results.get(index, {})
+        if plots is not None and fourier_result:
+            plots.submit("fourier", output_path, file_name, fourier_result.pop("freq"),
+                         fourier_result.pop("magnitude_prev"), fourier_result.pop("magnitude_curr"))
+        row = ResultsManager.build_result(file_name, mean_distance, std_distance, shaper_result, angle_analysis,
+                                          fourier_result, same_series_value, alignment_result, skipped_groups)
+        outcomes[index] = (row, plots.jobs if plots else [], None)
+    return outcomes
+
+class FeatureExtractor:  # Dosya bazındaki özellik çıkarımını süreç havuzunda paralel olarak çalıştırır.
+    def __init__(self, output_path, workers=None, chunksize=None, renderer=None, cache=None, shape_options=None,
+                 prefetch=2, contour_options=None, alignment="off", skipped_groups=()):
+        """
+        :param output_path: Görsel çıktıların kaydedileceği klasör
+        :param workers: Süreç sayısı; None ise işlemci sayısı kullanılır, 1 ise havuz açılmaz
+        :param chunksize: Her sürece tek seferde gönderilecek dosya sayısı; None ise otomatik seçilir
+        :param renderer: Grafikleri arka planda çizen PlotRenderer; None ise grafik üretilmez
+        :param cache: FeatureCache; verilirse içeriği değişmemiş dosyalar yüklenmeden ve analiz edilmeden atlanır
+        :param shape_options: ShaperAnalysis'e aktarılacak ek ayarlar (ör. {"iou_mode": "raster", "iou_tolerance": 2.0})
+        :param prefetch: Her toplu işte arka planda önceden yüklenecek dosya sayısı; 0 ise dosyalar sırayla yüklenir
+        :param contour_options: Özelliklerden önce uygulanacak normalize_contours ayarları
+                                (ör. {"n_samples": 256, "simplify_tolerance": 0.5}); None ise ham noktalar kullanılır
+        :param alignment: 'nearest' veya 'shift' ise ALIGNMENT_COLUMNS özellikleri de hesaplanır; sonuçlar
+                          ResultsManager(extra_columns=ALIGNMENT_COLUMNS[alignment]) ile toplanmalıdır
+        :param skipped_groups: Hiç hesaplanmayacak FEATURE_GROUPS grupları (bkz. feature_plan.skipped_groups); sonuçlar
+                               ResultsManager(skipped_groups=...) ile toplanmalı, önbellek sürümü de gruplara göre ayrılmalıdır
+        """
+        if alignment not in ALIGNMENT_MODES:
+            raise ValueError(f"Geçersiz hizalama modu: {alignment}. {ALIGNMENT_MODES} değerlerinden biri olmalıdır.")
+        self.output_path = output_path
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.renderer = renderer
+        self.cache = cache
+        self.shape_options = shape_options or {}
+        self.prefetch = prefetch
+        self.contour_options = contour_options or {}
+        self.alignment = alignment
+        self.skipped_groups = tuple(skipped_groups)
+
+    def _chunksize(self, n_tasks):
+        """
+        Toplu iş başına dosya sayısını belirler; görevler süreçler arasında birkaç parçaya bölünür.
+        Her toplu işin Fourier özellikleri tek seferde hesaplandığından parça büyüdükçe FFT maliyeti azalır.
+        """
+        if self.chunksize:
+            return self.chunksize
+        return max(1, min(MAX_BATCH_SIZE, n_tasks // (self.workers * 4)))
+
+    def _run_tasks(self, batches):
+        """Toplu işleri seri ya da süreç havuzunda çalıştırır; sonuçları gönderim sırasıyla üretir."""
+        if self.workers == 1 or len(batches) <= 1:
+            yield from map(_analyze_batch, batches)
+            return
+
+        workers = min(self.workers, len(batches))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map sonuçları gönderim sırasıyla döndürür, böylece çıktı sırası seri çalışmayla aynı kalır
+            yield from executor.map(_analyze_batch, batches)
+
+    def _batch_outcomes(self, batches, instrumentation):
+        """Toplu işlerin sonuçlarını dosya dosya üretir; işçide toplanan ölçümleri ana süreçteki çıkışlara aktarır."""
+        for outcomes, records in self._run_tasks(batches):
+            for record in records:
+                instrumentation.emit(record)
+            yield from outcomes
+
+    def _cache_lookup(self, file_paths, labeled):
+        """Her dosyanın önbellek anahtarını hesaplar ve önbellekte bulunan satırları döndürür."""
+        keys = [None] * len(file_paths)
+        cached = {}
+        if self.cache is None:
+            return keys, cached
+        for index, file_path in enumerate(file_paths):
+            try:
+                keys[index] = self.cache.key(file_path, labeled)
+            except OSError:
+                continue  # Okunamayan dosya analiz sırasında raporlanır
+            row = self.cache.get(keys[index])
+            if row is not None:
+                cached[index] = row
+        logger.info("Özellik önbelleği: %d dosya önbellekten, %d dosya analiz edilecek.",
+                    len(cached), len(file_paths) - len(cached))
+        return keys, cached
+
+    def extract(self, file_paths, labeled):
+        """
+        Dosyaları analiz eder ve sonuçları file_paths sırasıyla, hazır oldukça üretir.
+        :return: (file_path, row, plot_jobs, error) üreteci; row ResultsManager satırıdır, eksik sonuçta veya hata varsa None
+        """
+        keys, cached = self._cache_lookup(file_paths, labeled)
+        rendered = self.renderer.select(len(file_paths)) if self.renderer is not None else set()
+        instrumentation = get_instrumentation()
+        metrics = instrumentation.track_memory if instrumentation.enabled else None
+        pending = [index for index in range(len(file_paths)) if index not in cached]
+        size = self._chunksize(len(pending))
+        # Seri çalışmada FFT tüm çekirdeklerde çalışır; süreç havuzunda her süreç tek iş parçacığı kullanır
+        fft_workers = -1 if self.workers == 1 else None
+        batches = []
+        for start in range(0, len(pending), size):
+            chunk = pending[start:start + size]
+            batches.append(([file_paths[i] for i in chunk], self.output_path, labeled,
+                            [i in rendered for i in chunk], self.shape_options, self.contour_options, self.alignment, fft_workers,
+                            self.prefetch, self.skipped_groups, metrics))
+        outcomes = self._batch_outcomes(batches, instrumentation)
+
+        for index, file_path in enumerate(file_paths):
+            if index in cached:
+                yield file_path, cached[index], [], None
+                continue
+            row, plot_jobs, error = next(outcomes)
+            if row is not None and keys[index] is not None:
+                self.cache.put(keys[index], row)
+            yield file_path, row, plot_jobs, error
+
+    def run(self, file_paths, results_manager, labeled):
+        """
+        Dosyaları analiz edip sonuçları sırayla results_manager'a ekler.
+        :return: Başarısız olan (file_path, hata mesajı) listesi
+        """
+        failures = []
+        for file_path, row, plot_jobs, error in self.extract(file_paths, labeled):
+            if self.renderer is not None:
+                self.renderer.submit_jobs(plot_jobs)  # Çizimler arka planda, analiz beklemeden yapılır
+            if error is not None:
+                logger.error("%s işlenirken hata oluştu: %s", os.path.basename(file_path), error)
+                failures.append((file_path, error))
+                continue
+            if row is not None:
+                results_manager.add_row(row)
+        return failures
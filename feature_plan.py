@@ -0,0 +1,167 @@
+"""
+Özellik gruplarının çıkarım maliyetini ve modele katkısını birlikte değerlendiren özellik planı.
+
+Sütunlar tek tek değil, aynı analiz adımında birlikte hesaplandıkları gruplar halinde (results_manager.FEATURE_GROUPS)
+değerlendirilir: Fourier sütunlarından birini kullanmak bile FFT'nin tamamını, IoU ise poligon overlay'ini gerektirir.
+    - Maliyet: örnek dosyalar ölçüm açıkken analiz edilir; grubun aşamasının (GROUP_STAGES) toplam süresi
+      dosya başına milisaniyeye çevrilir.
+    - Katkı: grubun tüm sütunları ayrılmış test verisinde birlikte karıştırılır (permutation importance) ve
+      modelin doğruluğundaki düşüş ölçülür.
+En pahalı gruptan başlanarak, atılan grupların birlikte karıştırılmasıyla doğruluk düşüşü tolerance'ı aşmadığı
+sürece gruplar plandan çıkarılır. Plan JSON olarak kaydedilir; model kalan sütunlarla yeniden eğitilir ve
+sonraki çalışmalar planda olmayan grupları hiç hesaplamaz (bkz. skipped_groups).
+"""
+from results_manager import FEATURE_GROUPS
+from utils.instrumentation import capture
+import numpy as np
+import json
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Özellik planı dosyasının biçim sürümü
+PLAN_FORMAT_VERSION = 1
+# Her grubun maliyetinin ölçüldüğü aşama (bkz. utils.instrumentation.stage çağrıları)
+GROUP_STAGES = {
+    "distances": "distances",
+    "polygons": "polygon_ops",
+    "angles": "angles",
+    "fourier": "fft",
+    "alignment": "alignment",
+}
+# Her zaman hesaplanan gruplar; mesafeler hem ucuzdur hem de boş dosyaları ayıklamak için gerekir
+REQUIRED_GROUPS = ("distances",)
+
+# Modelin kullandığı sütunlar için hesaplanması gerekmeyen grupları döndürür.
+def skipped_groups(feature_columns, alignment="off"):
+    """
+    :param feature_columns: Modelin eğitildiği sütunlar; None ise tüm gruplar hesaplanır
+    :param alignment: Hizalama modu; 'off' ise hizalama zaten hesaplanmadığından atlananlar arasında sayılmaz
+    :return: Sıralı grup adları demeti (önbellek sürümünde de kullanılır)
+    """
+    if feature_columns is None:
+        return ()
+    used = set(feature_columns)
+    return tuple(sorted(group for group, columns in FEATURE_GROUPS.items()
+                        if group not in REQUIRED_GROUPS and not used.intersection(columns)
+                        and not (group == "alignment" and alignment == "off")))
+
+# Aşama kayıtlarından grupların dosya başına ortalama maliyetini (ms) hesaplar.
+def group_costs(records):
+    """
+    :param records: MetricsRegistry kayıtları; dosya sayısı 'file' aşaması kayıtlarından bulunur
+    :return: {grup: dosya başına ms}
+    """
+    n_files = sum(1 for record in records if record["stage"] == "file")
+    if n_files == 0:
+        raise ValueError("Maliyet ölçümü için analiz edilmiş dosya yok.")
+    totals = dict.fromkeys(GROUP_STAGES.values(), 0.0)
+    for record in records:
+        if record["stage"] in totals:
+            totals[record["stage"]] += record["seconds"]
+    return {group: totals[name] * 1000 / n_files for group, name in GROUP_STAGES.items()}
+
+# Örnek dosyaları önbelleksiz ve seri olarak analiz edip grupların çıkarım maliyetini ölçer.
+def measure_group_costs(extractor, file_paths, sample_size=50, random_state=0):
+    """
+    :param extractor: Ayarları (IoU, kontür, hizalama) kullanılacak FeatureExtractor; önbelleği ve grafikleri kullanılmaz
+    :param sample_size: Ölçülecek en fazla dosya sayısı; dosyalar rastgele seçilir
+    :return: {grup: dosya başına ms}
+    """
+    from feature_extractor import FeatureExtractor
+
+    if len(file_paths) > sample_size:
+        rng = np.random.default_rng(random_state)
+        file_paths = [file_paths[i] for i in sorted(rng.choice(len(file_paths), sample_size, replace=False))]
+    probe = FeatureExtractor(None, workers=1, shape_options=extractor.shape_options, prefetch=0,
+                             contour_options=extractor.contour_options, alignment=extractor.alignment)
+    with capture() as records:
+        for _ in probe.extract(file_paths, labeled=False):
+            pass
+    return group_costs(records)
+
+# Verilen sütunlar birlikte karıştırıldığında modelin doğruluğundaki ortalama düşüşü ölçer.
+def permutation_drop(trainer, X, y, columns, baseline, n_repeats=5, random_state=0):
+    """
+    Sütunlara aynı satır permütasyonu uygulanır; böylece grup içindeki ilişkiler korunur, yalnızca hedefle bağ kopar.
+    :return: (ortalama düşüş, standart sapma)
+    """
+    if not columns:
+        return 0.0, 0.0
+    rng = np.random.default_rng(random_state)
+    y = np.asarray(y)
+    drops = []
+    for _ in range(n_repeats):
+        shuffled = X.copy()
+        shuffled[columns] = X[columns].to_numpy()[rng.permutation(len(X))]
+        predictions, _ = trainer.predict(shuffled, output_path=None)
+        drops.append(baseline - float(np.mean(predictions == y)))
+    return float(np.mean(drops)), float(np.std(drops))
+
+# Maliyet ve katkıya göre hangi grupların hesaplanacağını belirleyen planı oluşturur.
+def build_feature_plan(trainer, X, y, costs, tolerance=0.01, n_repeats=5, random_state=0):
+    """
+    :param trainer: Tüm sütunlarla eğitilmiş ModelTrainer
+    :param X, y: Modelin eğitimde görmediği (ör. split_data'nın test) verisi
+    :param costs: {grup: dosya başına ms} (bkz. measure_group_costs)
+    :param tolerance: Atılan grupların birlikte yol açabileceği en fazla doğruluk düşüşü
+    :return: Plan sözlüğü (bkz. save_plan)
+    """
+    columns = {group: [column for column in group_columns if column in trainer.feature_columns]
+               for group, group_columns in FEATURE_GROUPS.items()}
+    columns = {group: group_columns for group, group_columns in columns.items() if group_columns}
+    predictions, _ = trainer.predict(X, output_path=None)
+    baseline = float(np.mean(predictions == np.asarray(y)))
+    importance = {group: permutation_drop(trainer, X, y, group_columns, baseline, n_repeats, random_state)
+                  for group, group_columns in columns.items()}
+
+    dropped = []
+    joint_drop = 0.0
+    candidates = sorted((group for group in columns if group not in REQUIRED_GROUPS),
+                        key=lambda group: -costs.get(group, 0.0))
+    for group in candidates:  # En pahalı gruptan başlanır
+        trial = [column for name in dropped + [group] for column in columns[name]]
+        drop, _ = permutation_drop(trainer, X, y, trial, baseline, n_repeats, random_state)
+        logger.debug("%s: %.2f ms/dosya, tek başına düşüş %.4f, birlikte düşüş %.4f",
+                     group, costs.get(group, 0.0), importance[group][0], drop)
+        if drop <= tolerance:
+            dropped.append(group)
+            joint_drop = drop
+
+    kept = [group for group in columns if group not in dropped]
+    return {
+        "format_version": PLAN_FORMAT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "tolerance": tolerance,
+        "baseline_accuracy": baseline,
+        "accuracy_drop": joint_drop,
+        "groups": kept,
+        "dropped_groups": dropped,
+        "columns": [column for column in trainer.feature_columns if column not in
+                    {column for group in dropped for column in columns[group]}],
+        "cost_ms_per_file": {group: costs.get(group, 0.0) for group in columns},
+        "importance": {group: {"mean": mean, "std": std} for group, (mean, std) in importance.items()},
+        "saved_ms_per_file": sum(costs.get(group, 0.0) for group in dropped),
+    }
+
+# Planı okunabilir JSON olarak kaydeder.
+def save_plan(plan, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2, ensure_ascii=False)
+    logger.info("Özellik planı %s dosyasına kaydedildi. Atlanacak gruplar: %s (dosya başına %.1f ms kazanç).",
+                path, ", ".join(plan["dropped_groups"]) or "yok", plan["saved_ms_per_file"])
+
+# Kaydedilmiş planı okur ve biçimini doğrular.
+def load_plan(path):
+    with open(path, encoding="utf-8") as f:
+        plan = json.load(f)
+    if plan.get("format_version") != PLAN_FORMAT_VERSION:
+        raise ValueError(f"Desteklenmeyen özellik planı sürümü: {plan.get('format_version')} "
+                         f"(beklenen: {PLAN_FORMAT_VERSION}).")
+    unknown = [group for group in plan["dropped_groups"] if group not in FEATURE_GROUPS or group in REQUIRED_GROUPS]
+    if unknown:
+        raise ValueError(f"Özellik planında atlanamayacak gruplar var: {unknown}")
+    return plan
@@ -0,0 +1,169 @@
+"""
+Eğitilmiş RandomForestClassifier'ı düz NumPy dizilerine çeviren ve scikit-learn yüklemeden puanlayan derlenmiş model.
+
+Ormandaki tüm ağaçların düğümleri tek bir dizi kümesinde art arda tutulur:
+    feature, threshold, left, right, missing_go_to_left ve yaprak sınıf olasılıkları (value).
+Yaprakların çocukları kendilerini gösterir; böylece tüm satırlar ve tüm ağaçlar en derin ağacın derinliği kadar
+adımda birlikte ilerletilir (satır x ağaç çiftlerinden oluşan tek bir düğüm dizisi). Karşılaştırmalar scikit-learn'deki gibi
+float32'ye çevrilmiş özelliklerle yapılır, ağaç olasılıkları ağaç sırasıyla toplanıp ağaç sayısına bölünür;
+bu nedenle tahminler ve olasılıklar RandomForestClassifier.predict / predict_proba ile aynıdır.
+
+Dosya biçimi .npz'dir ve pickle kullanmaz; yüklemek için yalnızca NumPy gerekir.
+"""
+import numpy as np
+import json
+import time
+import os
+
+# Derlenmiş model dosyasının biçim sürümü; dizilerin anlamı değiştiğinde artırılır.
+COMPILED_FORMAT_VERSION = 1
+
+# Ağacın düğüm değerlerini DecisionTreeClassifier.predict_proba'nın döndürdüğü sınıf olasılıklarına çevirir.
+def _leaf_probabilities(value):
+    """
+    scikit-learn 1.4 ve sonrasında sınıflandırıcı ağaçları düğümlerde sınıf oranlarını saklar ve predict_proba bunları
+    olduğu gibi döndürür; önceki sürümler ağırlıklı örnek sayılarını saklayıp predict_proba'da satır toplamına böler.
+    Aynı sonuçları vermek için sayılar yalnızca oran değillerse, eski sürümdeki işlemle normalleştirilir.
+    """
+    value = np.array(value, dtype=np.float64)
+    normalizer = value.sum(axis=1)[:, np.newaxis]
+    if np.allclose(normalizer, 1.0):
+        return value
+    normalizer[normalizer == 0.0] = 1.0
+    return value / normalizer
+
+class CompiledForest:  # Düzleştirilmiş orman dizileriyle toplu ağaç gezinmesi yapan, scikit-learn'süz puanlayıcı.
+    def __init__(self, roots, feature, threshold, left, right, missing_go_to_left, value, max_depth, classes,
+                 metadata=None):
+        """
+        :param roots: Her ağacın kök düğümünün ortak dizilerdeki sırası, (n_trees,)
+        :param value: Her düğümün sınıf olasılıkları, (n_nodes, n_classes); yalnızca yapraklar kullanılır
+        :param max_depth: En derin ağacın derinliği; gezinme bu kadar adım sürer
+        :param metadata: feature_columns, target_column, model_choice, created_at ve extraction_options bilgileri
+        """
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_go_to_left = missing_go_to_left
+        self.value = value
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.metadata = metadata or {}
+        self._children = np.column_stack((left, right)).ravel()  # 2 * düğüm: sol, 2 * düğüm + 1: sağ çocuk
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_features_in_(self):
+        columns = self.metadata.get("feature_columns")
+        return len(columns) if columns else int(self.feature.max()) + 1
+
+    @classmethod
+    def from_model(cls, model, metadata=None):
+        """
+        Eğitilmiş RandomForestClassifier'ın ağaçlarını düzleştirir; scikit-learn yalnızca modelin kendisi için gereklidir.
+        Tek çıktılı sınıflandırıcılar desteklenir.
+        """
+        estimators = getattr(model, "estimators_", None)
+        if not estimators or getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("Yalnızca eğitilmiş, tek çıktılı RandomForestClassifier derlenebilir.")
+        n_classes = len(model.classes_)
+        roots, features, thresholds, lefts, rights, missing, values = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(offset, offset + n_nodes, dtype=np.int64)
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            # Yapraklar kendilerini gösterir; gezinme tüm ağaçlar için aynı sayıda adımda biter
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            missing.append(np.asarray(getattr(tree, "missing_go_to_left", np.zeros(n_nodes)), dtype=bool))
+            values.append(_leaf_probabilities(tree.value[:, 0, :n_classes]))
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n_nodes
+        return cls(np.array(roots, dtype=np.int64), np.concatenate(features).astype(np.int64),
+                   np.concatenate(thresholds).astype(np.float64), np.concatenate(lefts), np.concatenate(rights),
+                   np.concatenate(missing), np.concatenate(values).astype(np.float64), max_depth,
+                   np.asarray(model.classes_), metadata)
+
+    def apply(self, X):
+        """
+        Her satırın her ağaçta ulaştığı yaprağı bulur.
+        :return: (n_rows, n_trees) düğüm sıraları
+        """
+        X = np.asarray(X, dtype=np.float32)  # scikit-learn ağaçları özellikleri float32 olarak karşılaştırır
+        if X.ndim != 2:
+            raise ValueError(f"Özellikler 2 boyutlu olmalıdır, gelen boyut: {X.shape}")
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        offsets = np.repeat(np.arange(n_rows, dtype=np.int64) * n_features, self.n_trees)
+        nodes = np.tile(self.roots, n_rows)  # Satır x ağaç çiftleri düz bir dizide
+        has_nan = bool(np.isnan(flat).any())
+        for _ in range(self.max_depth):
+            values = flat[offsets + self.feature[nodes]]
+            # float32 değer float64 eşikle karşılaştırılırken kayıpsız genişletilir (scikit-learn'deki C karşılaştırması)
+            go_right = ~(values <= self.threshold[nodes])
+            if has_nan:  # Eksik değerler eğitimde öğrenilen yöne gider
+                missing = np.isnan(values)
+                go_right[missing] = ~self.missing_go_to_left[nodes[missing]]
+            nodes = self._children[2 * nodes + go_right]
+        return nodes.reshape(n_rows, self.n_trees)
+
+    def predict_proba(self, X):
+        """Ağaç olasılıklarının ortalaması, (n_rows, n_classes); RandomForestClassifier.predict_proba ile aynıdır."""
+        leaves = self.apply(X)
+        # (n_trees, n_rows, n_classes) ilk eksende toplanır; toplama sırası scikit-learn'deki gibi ağaç sırasıdır
+        proba = np.add.reduce(self.value[leaves.T], axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.predict_with_proba(X)[0]
+
+    def predict_with_proba(self, X):
+        """(predictions, probabilities); ağaçlar yalnızca bir kez gezilir."""
+        proba = self.predict_proba(X)
+        return self.classes_.take(np.argmax(proba, axis=1), axis=0), proba
+
+    def save(self, path):
+        """Dizileri ve meta bilgileri pickle kullanmadan tek bir .npz dosyasına yazar."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        metadata = dict(self.metadata)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, format_version=COMPILED_FORMAT_VERSION, roots=self.roots, feature=self.feature,
+                 threshold=self.threshold, left=self.left, right=self.right,
+                 missing_go_to_left=self.missing_go_to_left, value=self.value, max_depth=self.max_depth,
+                 classes=self.classes_, feature_columns=np.array(metadata.get("feature_columns") or [], dtype=str),
+                 target_column=str(metadata.get("target_column") or ""),
+                 model_choice=str(metadata.get("model_choice") or "random_forest"),
+                 created_at=str(metadata.get("created_at") or time.strftime("%Y-%m-%dT%H:%M:%S")),
+                 extraction_options=json.dumps(metadata.get("extraction_options")))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            format_version = int(data["format_version"])
+            if format_version != COMPILED_FORMAT_VERSION:
+                raise ValueError(f"Desteklenmeyen derlenmiş model sürümü: {format_version} "
+                                 f"(beklenen: {COMPILED_FORMAT_VERSION}). Lütfen modeli yeniden dışa aktarın.")
+            metadata = {
+                "feature_columns": data["feature_columns"].tolist() or None,
+                "target_column": str(data["target_column"]) or None,
+                "model_choice": str(data["model_choice"]),
+                "created_at": str(data["created_at"]),
+                # Eski dosyalarda yoktur; özellik çıkarım ayarları JSON metni olarak saklanır
+                "extraction_options": json.loads(str(data["extraction_options"]))
+                if "extraction_options" in data.files else None,
+            }
+            return cls(data["roots"], data["feature"], data["threshold"], data["left"], data["right"],
+                       data["missing_go_to_left"], data["value"], int(data["max_depth"]), data["classes"], metadata)
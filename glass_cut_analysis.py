@@ -1,12 +1,26 @@
-from scipy.spatial.distance import euclidean
+from utils.instrumentation import stage
 import numpy as np
 
+ALIGNMENT_MODES = ("off", "nearest", "shift")  # Hizalama özellikleri: yok / en yakın nokta / en yakın nokta + döngüsel kaydırma
+
 class GlassCutAnalysis:
-    def __init__(self, prev_points, curr_points,file_name):
-        """Veri noktalarını alır ve analizi yapar."""
-        self.prev_points = prev_points
-        self.curr_points = curr_points
-        self.file_name = file_name
+    def __init__(self, cut, file_name=None):
+        """
+        Bir dosyanın CutPair kaydını alır ve analizi yapar.
+        Mesafeler, segment vektörleri, açılar ve spektrumlar CutPair'de bir kez hesaplanıp saklanır;
+        aynı kaydı kullanan diğer analizler bunları yeniden hesaplamaz.
+        :param file_name: Verilmezse CutPair'deki dosya adı kullanılır
+        """
+        self.cut = cut
+        self.file_name = file_name if file_name is not None else cut.file_name
+
+    @property
+    def prev_points(self):
+        return self.cut.prev
+
+    @property
+    def curr_points(self):
+        return self.cut.curr
 
     def show_data(self, num_rows=5):
         """Veri setinin ilk birkaç satırını gösterir"""
@@ -17,23 +31,15 @@ class GlassCutAnalysis:
 
     def calculate_euclidean_distances(self):
         """Prev ve Curr noktaları arasındaki Öklid mesafelerini hesaplar"""
-        if self.prev_points is None or self.curr_points is None:
-            raise ValueError("Veri yüklenmedi. Lütfen önce veri setini yükleyin.")
-
-        distances = []
-        for p, c in zip(self.prev_points, self.curr_points):
-            if len(p) == 2 and len(c) == 2:  # Noktaların doğru şekilde olduğunu kontrol et
-                dist = euclidean(p, c)
-                distances.append(dist)
-            else:
-                raise ValueError(f"Noktalar yanlış formatta: Prev = {p}, Curr = {c}")
-
-        return distances
+        if not self.cut.computed("distances"):  # Aşama süresi yalnızca ilk hesaplamada ölçülür
+            with stage("distances", self.file_name):
+                return self.cut.distances
+        return self.cut.distances
 
     def calculate_statistics(self):
         """Öklid mesafelerinin ortalamasını ve standart sapmasını hesaplar"""
         distances = self.calculate_euclidean_distances()
-        if not distances:
+        if len(distances) == 0:
             return None, None  # Mesafe hesaplanmadıysa None döndür
         mean_distance = np.mean(distances)  # Ortalama mesafe
         std_distance = np.std(distances)  # Standart sapma
@@ -42,7 +48,7 @@ class GlassCutAnalysis:
     def compare_series(self, threshold=5.0):
         """Prev ve Curr noktalarının farklı bir seriye ait olup olmadığını kontrol eder"""
         distances = self.calculate_euclidean_distances()
-        is_same_series = all(dist <= threshold for dist in distances)
+        is_same_series = bool(np.all(distances <= threshold))
         return is_same_series
 
     def label_same_series(self):
@@ -58,29 +64,21 @@ class GlassCutAnalysis:
             raise ValueError(f"{self.file_name} dosyası için beklenmeyen bir isim formatı.")
 
     def calculate_angles(self):
-        """Prev ve Curr noktaları arasındaki açıları hesaplar."""
-        angles = []
-        for i in range(len(self.prev_points) - 1):
-            p1 = self.prev_points[i]
-            p2 = self.prev_points[i + 1]
-            c1 = self.curr_points[i]
-            c2 = self.curr_points[i + 1]
-
-            # Prev açısını hesapla
-            prev_angle = np.arctan2(p2[1] - p1[1], p2[0] - p1[0]) * (180 / np.pi)
-            # Curr açısını hesapla
-            curr_angle = np.arctan2(c2[1] - c1[1], c2[0] - c1[0]) * (180 / np.pi)
-
-            angles.append((prev_angle, curr_angle))
-
-        return angles
+        """
+        Prev ve Curr noktaları arasındaki açıları hesaplar.
+        :return: (N-1, 2) boyutlu dizi; 0. sütun prev, 1. sütun curr segment açıları (derece)
+        """
+        if not self.cut.computed("angles"):  # Aşama süresi yalnızca ilk hesaplamada ölçülür
+            with stage("angles", self.file_name):
+                return self.cut.angles
+        return self.cut.angles
 
     def analyze_angle_similarity(self):
         """Açı benzerliğini analiz eder ve benzerlik skorunu döndürür."""
         angles = self.calculate_angles()
 
-        prev_angles = [angle[0] for angle in angles]
-        curr_angles = [angle[1] for angle in angles]
+        prev_angles = angles[:, 0]
+        curr_angles = angles[:, 1]
 
         # Açı ortalaması ve standart sapmayı hesapla
         mean_prev = np.mean(prev_angles)
@@ -89,7 +87,7 @@ class GlassCutAnalysis:
         std_curr = np.std(curr_angles)
 
         # MSE ve benzerlik skorunu hesapla
-        mse = np.mean((np.array(prev_angles) - np.array(curr_angles)) ** 2)
+        mse = np.mean((prev_angles - curr_angles) ** 2)
         similarity_score = 100 / (1 + mse)
 
         return {
@@ -99,4 +97,46 @@ class GlassCutAnalysis:
             "std_curr": std_curr,
             "mse": mse,
             "similarity_score": similarity_score
-        }
\ No newline at end of file
+        }
+
+    def analyze_alignment(self, cyclic_shift=False):
+        """
+        prev[i] ile curr[i]'yi eşlemek yerine en yakın nokta eşleşmesiyle mesafe özellikleri hesaplar.
+        Her kontür için bir cKDTree kurulur ve diğer kontürün tüm noktaları tek çağrıda sorgulanır (O(N log N)).
+        cyclic_shift True ise curr, prev'e göre en iyi döngüsel kaydırmayla hizalanır; kaydırma tüm
+        kaydırmalar için FFT çapraz korelasyonuyla tek seferde bulunur.
+        :return: nn_mean_distance, nn_std_distance, hausdorff_distance, chamfer_distance
+                 (+ shift_fraction, shift_mean_distance); noktalar boşsa None
+        """
+        from scipy.spatial import cKDTree  # Yalnızca hizalama açıkken yüklenir
+        import scipy.fft
+
+        prev, curr = self.cut.prev, self.cut.curr
+        if len(prev) == 0 or len(curr) == 0:
+            return None
+
+        with stage("alignment", self.file_name):
+            curr_to_prev, _ = cKDTree(prev).query(curr)  # Her curr noktasının prev üzerindeki en yakın noktası
+            prev_to_curr, _ = cKDTree(curr).query(prev)
+            result = {
+                "nn_mean_distance": np.mean(curr_to_prev),
+                "nn_std_distance": np.std(curr_to_prev),
+                "hausdorff_distance": max(curr_to_prev.max(), prev_to_curr.max()),  # Simetrik Hausdorff
+                "chamfer_distance": (curr_to_prev.mean() + prev_to_curr.mean()) / 2,
+            }
+
+            if cyclic_shift:
+                prev, curr = self.cut.paired  # Kaydırma, indeks eşleşmesindeki ortak uzunlukta aranır
+                z_prev = prev[:, 0] + 1j * prev[:, 1]
+                z_curr = curr[:, 0] + 1j * curr[:, 1]
+                # r[s] = Σ conj(p_i) c_(i+s); Σ |p_i - c_(i+s)|² en küçük olan kaydırmada Re r[s] en büyüktür
+                if self.cut.lengths[0] == self.cut.lengths[1]:  # Fourier özellikleriyle aynı spektrum paylaşılır
+                    _, _, spectrum_prev, spectrum_curr = self.cut.spectra
+                else:
+                    spectrum_prev, spectrum_curr = scipy.fft.fft(z_prev), scipy.fft.fft(z_curr)
+                correlation = scipy.fft.ifft(np.conj(spectrum_prev) * spectrum_curr).real
+                n = len(z_prev)
+                shift = int(np.argmax(correlation))
+                result["shift_fraction"] = (shift if shift <= n // 2 else shift - n) / n  # İşaretli, (-0.5, 0.5]
+                result["shift_mean_distance"] = np.mean(np.abs(z_prev - np.roll(z_curr, -shift)))
+        return result
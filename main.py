@@ -1,147 +1,130 @@
-from utils.file_loader import load_data, FileLoader
-from glass_cut_analysis import GlassCutAnalysis
-from shape_analyzer import  ShaperAnalysis
-from model_train import  ModelTrainer
-from results_manager import  ResultsManager
+from utils.file_loader import FileLoader
+from results_manager import  ResultsManager, ALIGNMENT_COLUMNS
+from cli import (add_discovery_arguments, add_extraction_arguments, add_model_arguments, add_training_arguments,
+                 add_feature_plan_arguments, add_serve_arguments, add_results_format_argument, add_logging_arguments,
+                 validate_results_format, configure_instrumentation, close_instrumentation, build_extractor,
+                 prediction_frame, train_model, select_features, start_watch_service, load_inference_model)
+from feature_plan import skipped_groups, load_plan
+import  argparse
 import  time
-import  os
-import pandas as pd
-
-def main():
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Komut satırı argümanlarını tanımlar.
+def parse_args(argv=None):
+    """Tüm işlem hattını tek komutla çalıştıran seçenekler; alt komutlu arayüz için bkz. cli.py."""
+    parser = argparse.ArgumentParser(description="Cam kesim serilerinin özellik çıkarımı, model eğitimi ve tahmini.")
+    parser.add_argument("--data-dir", default="data/",
+                        help="Eğitim verilerinin klasörü veya nokta arşivi (.cutpts)")
+    parser.add_argument("--unlabeled-dir", default="unlabeled_data/",
+                        help="Tahmin yapılacak etiketsiz verilerin klasörü veya nokta arşivi (.cutpts)")
+    add_discovery_arguments(parser)
+    add_extraction_arguments(parser)
+    add_model_arguments(parser)
+    parser.add_argument("--predict-only", action="store_true",
+                        help="Eğitimi atla; kayıtlı modeli yükleyip yalnızca etiketsiz veriler için tahmin yap")
+    add_training_arguments(parser)
+    add_feature_plan_arguments(parser)
+    parser.add_argument("--serve", action="store_true",
+                        help="Kayıtlı modeli yükleyip --watch-dir klasörünü izleyen sürekli tahmin servisini başlat")
+    add_serve_arguments(parser)
+    add_results_format_argument(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.select_features and (args.predict_only or args.incremental):
+        parser.error("--select-features tam eğitim gerektirir; --predict-only ve --incremental ile kullanılamaz.")
+    validate_results_format(parser, args)  # Özellik çıkarımından sonra değil, hemen başta hata verilir
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(message)s")
+    registry = configure_instrumentation(args)
+    try:
+        if args.serve:
+            return start_watch_service(args)  # Kayıtlı modelle klasörü izleyen sürekli tahmin servisi
+        run(args)
+    finally:
+        if registry is not None:
+            close_instrumentation(registry)
+
+# Eğitim verilerinden özellik çıkarır, modeli eğitir (veya yükler) ve etiketsiz veriler için tahmin yapar.
+def run(args):
     start_time = time.time()  # Başlangıç zamanını kaydet
 
     # Verileri yüklemek için FileLoader sınıfını kullanıyoruz
-    directory = 'data/'  # Eğitim verilerinin bulunduğu klasör
-    unlabeled_directory = 'unlabeled_data/'  # Tahmin yapılacak etiketsiz verilerin klasörü
-    file_loader = FileLoader(directory) # Eğitim verilerini yükle
-    file_paths = file_loader.get_file_paths() # Tüm dosya yollarını al
-
-    unlabeled_file_loader = FileLoader(unlabeled_directory)  # Etiketsiz veriler için ayrı dosya yükleyici
+    directory = args.data_dir  # Eğitim verilerinin bulunduğu klasör (veya nokta arşivi)
+    unlabeled_directory = args.unlabeled_dir  # Tahmin yapılacak etiketsiz verilerin klasörü (veya nokta arşivi)
+    discovery = {"recursive": args.recursive, "include": args.include, "exclude": args.exclude}
+    unlabeled_file_loader = FileLoader(unlabeled_directory, **discovery)  # Etiketsiz veriler için ayrı dosya yükleyici
     unlabeled_file_paths = unlabeled_file_loader.get_file_paths()  # Etiketsiz verilerin dosya yolları
 
-    results_manager = ResultsManager() # Sonuçları yönetecek ResultsManager sınıfını başlatıyoruz
-    results_manager_2= ResultsManager()  # Etiketsiz veriler için ayrı sonuç yöneticisi
-
-    output_path = "results/visualizations"  #Görsel çıktılar için dosya yolu
-    # Eğitim verileri üzerinde analiz yap
-    for file_path in file_paths:
-        file_name = os.path.basename(file_path) # Dosya adını al
-        print(f"\nİşleniyor: {file_name}")
-
-        if os.path.exists(file_path):
-            try:
-                print(f"{file_name} dosyası yükleniyor...")
-                prev_points, curr_points = load_data(file_path)  # Veriyi yükle ve işaret noktalarını al
-                print(f"{file_name} dosyası yüklendi. Toplam {len(prev_points)} previous nokta ve {len(curr_points)} current nokta bulundu.")
-            except Exception as e:
-                print(f"Veri yüklenirken hata oluştu: {e}")
-                continue  # Hata oluşursa bu dosyayı atla
-        else:
-            print(f"{file_name} bulunamadı.")
-            continue
-
-        glass_analysis = GlassCutAnalysis(prev_points, curr_points,file_name) # Analiz sınıfını oluşturuyoruz
-        distances = glass_analysis.calculate_euclidean_distances() # Öklid mesafelerini hesaplıyoruz
-
-        if distances:  # Mesafeler boş değilse istatistikleri hesapla
-            mean_distance, std_distance = glass_analysis.calculate_statistics()
-        else:
-            mean_distance, std_distance = None, None  # Mesafe hesaplanmadıysa None atayın
-
-        same_series_value = glass_analysis.label_same_series() # Seri etiketi
-
-        # Şekil ve Fourier analizlerini yap
-        shaper_analysis = ShaperAnalysis(prev_points, curr_points, file_name, output_path)
-        shaper_result = shaper_analysis.analyze_data() # Şekil analizi - intersection_area, union_area, iou
-        fourier_result = shaper_analysis.apply_fourier_transform() # Fourier analizi
-
-        shaper_result["fourier_analysis"] = fourier_result  # Sonuçları birleştir
-
-        # açı analizleri
-        angle_analysis = glass_analysis.analyze_angle_similarity() # # Açı benzerliği analizi - mean_prev,std_prev, mean_curr, std_curr,  mse, similarity_score
-        # Sonuçları kaydet
-        results_manager.add_result(file_name, mean_distance, std_distance, shaper_result, angle_analysis,fourier_result,same_series_value)
-
-    # Eğitim verilerinin sonuçlarını kaydet
-    output_file = "results/analysis/feature_extraction_output.csv"  # Dataset üzerinden özellik çıkarımı yapılan csv dosyası
-    results_manager.save_results_to_csv(output_file)
-    print(f"\nSonuçlar {output_file} dosyasına kaydedildi.")
+    trainer = None
+    skipped = ()  # Hiç hesaplanmayacak özellik grupları
+    if args.predict_only:
+        # Kayıtlı modeli yükle; grid search ve eğitim tamamen atlanır (derlenmiş puanlayıcı varsa scikit-learn yüklenmez)
+        # Özellikler modelin eğitildiği IoU, kontür ve hizalama ayarlarıyla çıkarılır
+        trainer = load_inference_model(args)
+        skipped = skipped_groups(trainer.feature_columns, args.alignment)  # Modelin kullanmadığı gruplar
+    elif args.feature_plan and not args.select_features:
+        skipped = skipped_groups(load_plan(args.feature_plan)["columns"], args.alignment)
+    if skipped:
+        logger.info("Özellik grupları hesaplanmayacak: %s", ", ".join(skipped))
+
+    extra_columns = ALIGNMENT_COLUMNS[args.alignment]  # İsteğe bağlı hizalama sütunları
+    results_manager = ResultsManager(extra_columns=extra_columns, skipped_groups=skipped) # Sonuçları yönetecek ResultsManager sınıfını başlatıyoruz
+    results_manager_2= ResultsManager(extra_columns=extra_columns, skipped_groups=skipped)  # Etiketsiz veriler için ayrı sonuç yöneticisi
+
+    # Görsel çıktılar results/visualizations altına yazılır; grafik kuyruğu ve önbellek argümanlara göre kurulur
+    extractor, renderer, cache = build_extractor(args, skipped_groups=skipped)
+
+    output_file = f"results/analysis/feature_extraction_output.{args.results_format}"  # Dataset üzerinden özellik çıkarımı yapılan dosya
+    if not args.predict_only:  # Yalnızca tahmin modunda eğitim verileri analiz edilmez
+        file_loader = FileLoader(directory, **discovery) # Eğitim verilerini yükle
+        file_paths = file_loader.get_file_paths() # Tüm dosya yollarını al
+
+        # Eğitim verileri üzerinde analiz yap
+        extractor.run(file_paths, results_manager, labeled=True)
+
+        # Eğitim verilerinin sonuçlarını kaydet
+        results_manager.save_results(output_file, args.results_format)
+        logger.info("Sonuçlar %s dosyasına kaydedildi.", output_file)
 
     # Etiketsiz veriler için analiz işlemleri
-    for file_path in unlabeled_file_paths:
-        file_name = os.path.basename(file_path)  # Dosya adı
-        print(f"\nİşleniyor: {file_name} (etiketsiz)")
-
-        if os.path.exists(file_path):
-            try:
-                print(f"{file_name} dosyası yükleniyor...")
-                prev_points, curr_points = load_data(file_path)  # noktalar ayrıştırılır ve liste şeklinde elde edilir
-                print(
-                    f"{file_name} dosyası yüklendi. Toplam {len(prev_points)} previous nokta ve {len(curr_points)} current nokta bulundu.")
-            except Exception as e:
-                print(f"Veri yüklenirken hata oluştu: {e}")
-                continue  # Hata oluşursa bu dosyayı atla
-        else:
-            print(f"{file_name} bulunamadı.")
-            continue
-
-        glass_analysis = GlassCutAnalysis(prev_points, curr_points, file_name)  # Analiz sınıfını oluşturuyoruz
-        distances = glass_analysis.calculate_euclidean_distances()  # Öklid mesafelerini hesaplıyoruz
-
-        if distances:  # Mesafe listesi boş değilse
-            mean_distance, std_distance = glass_analysis.calculate_statistics()
-        else:
-            mean_distance, std_distance = None, None  # Mesafe hesaplanmadıysa None atayın
-
-        # Shaper ve Fourier analiz sonuçlarını saklamak için varsayılan değerler atayın
-        shaper_result = {}
-        fourier_result = {}
-        angle_analysis = {}
-
-        # Eğer gerekli analizler yapılmışsa sonuçları atayın
-        if prev_points and curr_points:  # Noktalar varsa
-            shaper_analysis = ShaperAnalysis(prev_points, curr_points, file_name, output_path)
-            shaper_result = shaper_analysis.analyze_data()  # intersection_area, union_area, iou, series_label,
-            fourier_result = shaper_analysis.apply_fourier_transform()
-            angle_analysis = glass_analysis.analyze_angle_similarity()  # mean_prev,std_prev, mean_curr, std_curr, mse, similarity_score
-
-        # Etiketsiz veriler için sonuçları ekle
-        results_manager_2.add_result(file_name, mean_distance, std_distance, shaper_result, angle_analysis,fourier_result, None)
+    extractor.run(unlabeled_file_paths, results_manager_2, labeled=False)
 
     # Etiketsiz verilerin sonuçlarını kaydet
-    unlabeled_output_file = "results/analysis/unlabeled_features_output.csv"
-    results_manager_2.save_results_to_csv(unlabeled_output_file)
-    print(f"\nEtiketsiz veriler {unlabeled_output_file} dosyasına kaydedildi.")
-
-    # Model eğitimi ve test
-    trainer = ModelTrainer(output_dir="results/visualizations/model",model_choice="random_forest")  # Yeni eğitim sınıfı
-    analysis_data = pd.read_csv(output_file)
-    trainer.run_training(analysis_data)  # CSV'den yüklenen verilerle eğitimi başlat
-
-    X, y = trainer.preprocess_data(analysis_data)  # Veriyi işle
-    trainer.cross_validate(X, y, cv=5)  # Çapraz doğrulamayı çalıştır
+    unlabeled_output_file = f"results/analysis/unlabeled_features_output.{args.results_format}"
+    results_manager_2.save_results(unlabeled_output_file, args.results_format)
+    logger.info("Etiketsiz veriler %s dosyasına kaydedildi.", unlabeled_output_file)
 
-    # Etiketsiz veriler üzerinde tahmin yap
-    unlabeled_data = pd.read_csv(unlabeled_output_file)
-    X_unlabeled, _ = trainer.preprocess_data(unlabeled_data)  # Hedef değişkeni kullanmadığımız için _ ile aldık
+    if renderer is not None:
+        renderer.close()  # Kuyrukta bekleyen grafiklerin bitmesini bekle
+    if cache is not None:
+        cache.evict()  # Boyut sınırını aşan eski kayıtları temizle
 
-    predictions = trainer.model.predict(X_unlabeled)  # Model üzerinden tahmin yap
+    if trainer is None:
+        # Tam eğitim veya --incremental ile kayıtlı modelin yalnızca yeni etiketli satırlarla güncellenmesi;
+        # sonraki --predict-only ve servis çalışmaları kaydedilen modeli kullanır
+        training_data = results_manager.to_frame()  # Dosyadan yeniden okumadan, tam hassasiyetli tablo
+        trainer = train_model(args, training_data)
+        if args.select_features:
+            # Pahalı ama modele katkısı az grupları plandan çıkar; model kalan sütunlarla yeniden eğitilir
+            _, trainer = select_features(args, trainer, training_data, extractor, file_paths)
 
-    # Tahmin sonuçlarını kaydet
-    results_df = pd.DataFrame(predictions, columns=["predictions"])
-    results_df['source_file'] = [os.path.basename(path) for path in unlabeled_file_paths]  #Tahminin yapıldığı dosya adını ekliyoruz
-    results_df['prediction_label'] = results_df['predictions'].apply(lambda x: 'aynı seri' if x == 1 else 'farklı seri')
-    results_df = results_df[['source_file', 'predictions', 'prediction_label']]  # Sütun sırasını ayarla
+    # Etiketsiz veriler üzerinde tahmin yap ve sonuçları kaydet
+    results_df = prediction_frame(trainer, results_manager_2.to_frame())
 
 
     results_csv_path = "results/predictions_unlabeled.csv"  # Sonuçların kaydedileceği dosya yolu
     results_df.to_csv(results_csv_path, index=False)
-    print(f"Tahmin sonuçları {results_csv_path} dosyasına kaydedildi.")
+    logger.info("Tahmin sonuçları %s dosyasına kaydedildi.", results_csv_path)
 
 
     # Toplam süreyi hesapla
     end_time = time.time()  # Bitiş zamanını al
     total_time = end_time - start_time  # Toplam süreyi hesapla
-    print(f"Toplam çalışma süresi: {total_time:.2f} saniye")
+    logger.info("Toplam çalışma süresi: %.2f saniye", total_time)
 if __name__ == "__main__":
     main()
@@ -1,41 +1,120 @@
+# scikit-learn, scipy.stats, matplotlib ve seaborn yalnızca onları kullanan metotlarda içe aktarılır;
+# böylece yalnızca tahmin yapan kısa çalıştırmalar eğitim ve çizim kütüphanelerinin yükleme süresini ödemez.
 import os
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split, cross_val_score, KFold
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
-from sklearn.model_selection import GridSearchCV
-from sklearn.svm import SVC
 import  numpy as np
+import math
+import time
+from utils.instrumentation import stage
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Kaydedilen model dosyasının biçim sürümü; dosya içeriği değiştiğinde artırılır, uyumsuz dosyalar yüklenmez.
+MODEL_FORMAT_VERSION = 2
+# Yüklenebilen eski sürümler; 1. sürüm artımlı eğitim bilgisi (training_state) içermez
+SUPPORTED_FORMAT_VERSIONS = (1, 2)
+
+SEARCH_MODES = ("grid", "random", "halving")  # Hiperparametre arama modları
+HALVING_FACTOR = 3  # Ardışık yarılamada her turda kalan aday oranının tersi
+
+# RandomForest modelleri kaydedilirken yanına scikit-learn gerektirmeyen derlenmiş puanlayıcı da yazılır (forest_scorer)
+COMPILED_MODEL_SUFFIX = ".forest.npz"
+SCORERS = ("auto", "compiled", "sklearn")  # Tahminde kullanılacak model: derlenmiş varsa o / derlenmiş / scikit-learn
+
+# Model dosyasının yanındaki derlenmiş puanlayıcı dosyasının yolunu döndürür.
+def compiled_model_path(model_path):
+    return os.path.splitext(model_path)[0] + COMPILED_MODEL_SUFFIX
+
+# Izgara araması için sabit parametre ızgaraları
+PARAM_GRIDS = {
+    "random_forest": {
+        'n_estimators': [100, 200],
+        'max_depth': [10, 20, None],
+        'min_samples_split': [2, 5],
+        'min_samples_leaf': [1, 2],
+    },
+    "svm": {
+        'C': [0.1, 1, 10, 100],
+        'kernel': ['linear', 'rbf'],
+        'gamma': ['scale', 'auto']
+    },
+}
+
+# Rastgele ve ardışık yarılama (halving) aramaları için parametre dağılımlarını döndürür.
+def param_distributions(model_choice):
+    from scipy.stats import randint, loguniform
+
+    distributions = {
+        "random_forest": {
+            'n_estimators': randint(50, 301),
+            'max_depth': [5, 10, 20, None],
+            'min_samples_split': randint(2, 11),
+            'min_samples_leaf': randint(1, 5),
+            'max_features': ['sqrt', 'log2', None],
+        },
+        "svm": {
+            'C': loguniform(1e-2, 1e3),
+            'kernel': ['linear', 'rbf'],
+            'gamma': ['scale', 'auto']
+        },
+    }
+    return distributions[model_choice]
 
 class ModelTrainer:  # ModelTrainer sınıfı, makine öğrenimi modellerinin eğitim, değerlendirme ve tahmin süreçlerini yönetir.
+    # Ön işleme sırasında özellik olarak kullanılmayan sütunlar
+    DROPPED_COLUMNS = ['file_name', 'min_freq', 'max_freq', 'mean_magnitude_prev']
 
-    def __init__(self, output_dir, model_choice):
+    def __init__(self, output_dir, model_choice, search_mode="grid", n_candidates=20, max_fits=None, time_budget=None,
+                 cv=5, plots=True, n_jobs=-1):
         """
         ModelTrainer sınıfı, model eğitim ve değerlendirme işlemleri için kullanılır.
         Çıktı görsellerinin kaydedileceği klasörün adı da parametre olarak alınır.
+        :param search_mode: 'grid' (tüm ızgara), 'random' (rastgele n_candidates aday) veya
+                            'halving' (n_candidates aday, az veriyle başlayıp iyileri eleyen ardışık yarılama)
+        :param n_candidates: random/halving aramalarında denenecek aday sayısı
+        :param max_fits: Aramadaki en fazla model eğitimi sayısı; yarılamanın tüm turları ve en iyi adayın son
+                         eğitimi dahildir, aday sayısı buna göre kısılır
+        :param time_budget: Arama için süre bütçesi (saniye); tek bir eğitimin süresi ölçülerek aday sayısı kısılır
+        :param cv: Aramadaki çapraz doğrulama kat sayısı
+        :param plots: False ise confusion matrix ve özellik önemi grafikleri çizilmez (matplotlib yüklenmez)
+        :param n_jobs: Aramada paralel çalışan eğitim sayısı (-1: tüm çekirdekler); süre bütçesi buna göre hesaplanır
         """
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Geçersiz arama modu: {search_mode}. {SEARCH_MODES} değerlerinden biri olmalıdır.")
         self.model = None  # Model örneği
+        self.search_mode = search_mode
+        self.n_candidates = n_candidates
+        self.max_fits = max_fits
+        self.time_budget = time_budget
+        self.cv = cv
+        self.plots = plots
+        self.n_jobs = n_jobs
+        self.search_results = None  # Son aramanın aday bazında skor ve süre tablosu
+        self.cv_scores = None  # Seçilen adayın aramadaki kat bazında doğrulama skorları
         self.output_dir = output_dir  # Çıktıların kaydedileceği dizin
         self.model_choice = model_choice
-        self.results = []  # Tahmin sonuçlarını saklamak için liste
+        self.feature_columns = None  # Modelin eğitildiği özellik sütunları (sırası önemlidir)
+        self.target_column = None  # Eğitimde kullanılan hedef sütun
+        # Özelliklerin çıkarıldığı ayarlar (IoU modu, kontür ön işleme, hizalama); tahminde aynıları kullanılmalıdır
+        self.extraction_options = None
+        # Artımlı eğitim için son tam eğitimin ve sonraki güncellemelerin özeti:
+        # trained_files, n_rows, feature_mean, feature_std, reference_accuracy
+        self.training_state = None
         # results dizini var mı, kontrol et yoksa oluştur
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
-    @staticmethod # Veriyi işler, özellikler ve hedef değişkeni ayırır.
-    def preprocess_data(data):
+    @classmethod # Veriyi işler, özellikler ve hedef değişkeni ayırır.
+    def preprocess_data(cls, data):
         """
         Veriyi işler, özellikler ve hedef değişkeni ayırır.
-        'filename' sütununu veri setinden kaldırır.
+        'filename' sütununu ve DROPPED_COLUMNS'taki sütunları veri setinden kaldırır.
+        Özellik planıyla hesaplanmamış gruplar tabloda hiç yer almaz; eksik sütunlar yok sayılır.
         """
         # 'filename' sütununu veri setinden kaldır
         if 'file_name' in data.columns:
-            data = data.drop(columns=['file_name'])
-            data = data.drop(columns=['min_freq'])
-            data = data.drop(columns=['max_freq'])
-            data = data.drop(columns=['mean_magnitude_prev'])
+            data = data.drop(columns=cls.DROPPED_COLUMNS, errors="ignore")
 
         # Tüm sayısal sütunları al
         numeric_columns = data.select_dtypes(include=[float, int]).columns.tolist()
@@ -57,37 +136,110 @@ class ModelTrainer:  # ModelTrainer sınıfı, makine öğrenimi modellerinin e
         """
         Veriyi eğitim ve test setlerine böler.
         """
+        from sklearn.model_selection import train_test_split
+
         return train_test_split(X, y, test_size=test_size, random_state=random_state)
 
-    # GridSearchCV ile modelin hiperparametrelerini optimize eder.
-    # En iyi parametreleri belirler ve modeli günceller.
+    # Seçilen arama moduyla modelin hiperparametrelerini optimize eder.
+    # En iyi parametreleri belirler, modeli günceller ve aday bazında skor/süre tablosunu kaydeder.
     def tune_model(self, X_train, y_train):
         """
-        GridSearchCV ile modelin hiperparametrelerini optimize eder.
+        search_mode'a göre GridSearchCV, RandomizedSearchCV veya HalvingRandomSearchCV ile
+        modelin hiperparametrelerini optimize eder.
         """
         if self.model_choice not in ["random_forest", "svm"]:
             raise ValueError(
                 f"Geçersiz model seçimi: {self.model_choice}. 'random_forest' veya 'svm' olarak ayarlanmalıdır.")
-        grid_search = None  # grid_search'ü burada None ile başlatıyoruz
         if self.model_choice == "random_forest":
-            param_grid = {
-                'n_estimators': [100, 200],
-                'max_depth': [10, 20, None],
-                'min_samples_split': [2, 5],
-                'min_samples_leaf': [1, 2],
-            }
-            grid_search = GridSearchCV(RandomForestClassifier(random_state=42), param_grid, cv=5, n_jobs=-1, verbose=1)
-        elif self.model_choice == "svm":
-            param_grid = {
-                'C': [0.1, 1, 10, 100],
-                'kernel': ['linear', 'rbf'],
-                'gamma': ['scale', 'auto']
-            }
-            grid_search = GridSearchCV(SVC(random_state=42), param_grid, cv=5, n_jobs=-1, verbose=1)
+            from sklearn.ensemble import RandomForestClassifier
+            estimator = RandomForestClassifier(random_state=42)
+        else:
+            from sklearn.svm import SVC
+            estimator = SVC(random_state=42)
 
-        grid_search.fit(X_train, y_train)
-        self.model = grid_search.best_estimator_
-        print(f"En iyi model parametreleri: {grid_search.best_params_}")
+        search = self._build_search(estimator, X_train, y_train)
+        start = time.perf_counter()
+        search.fit(X_train, y_train)
+        elapsed = time.perf_counter() - start
+
+        self.model = search.best_estimator_
+        self._record_search(search, elapsed)
+        logger.info("En iyi model parametreleri: %s", search.best_params_)
+
+    def _search_fits(self, n_candidates, halving_rounds=None):
+        """
+        Aramanın toplam eğitim sayısı: her adayın kat eğitimleri ve en iyi adayın son (refit) eğitimi.
+        Ardışık yarılamada i. turda ceil(n / factor^i) aday kalır; tur sayısı aday sayısıyla ve
+        verinin izin verdiği tur sayısıyla (halving_rounds) sınırlıdır (HalvingRandomSearchCV'deki gibi).
+        """
+        if halving_rounds is None:
+            return n_candidates * self.cv + 1
+        rounds = min(halving_rounds, 1 + int(math.floor(math.log(n_candidates, HALVING_FACTOR) + 1e-9)))
+        return sum(math.ceil(n_candidates / HALVING_FACTOR ** i) for i in range(rounds)) * self.cv + 1
+
+    def _candidate_budget(self, estimator, X_train, y_train, halving_rounds=None):
+        """
+        random/halving için aday sayısını, toplam eğitim sayısı (_search_fits) max_fits'i ve tahmini süre
+        time_budget'ı aşmayacak en büyük değere kısar.
+        :param halving_rounds: Ardışık yarılamada verinin izin verdiği en fazla tur sayısı; None ise rastgele arama
+        """
+        fit_limit = self.max_fits
+        if self.time_budget is not None:
+            from sklearn.base import clone
+            from joblib import effective_n_jobs
+            # Tek bir eğitimin süresi ölçülür; aramadaki eğitimler n_jobs kadar paralel çalışır
+            start = time.perf_counter()
+            clone(estimator).fit(X_train, y_train)
+            fit_time = max(time.perf_counter() - start, 1e-3)
+            affordable = int(self.time_budget * effective_n_jobs(self.n_jobs) / fit_time)
+            fit_limit = affordable if fit_limit is None else min(fit_limit, affordable)
+        n_candidates = self.n_candidates
+        if fit_limit is not None:
+            while n_candidates > 1 and self._search_fits(n_candidates, halving_rounds) > fit_limit:
+                n_candidates -= 1
+        return n_candidates
+
+    def _build_search(self, estimator, X_train, y_train):
+        """Arama modu ve bütçeye göre arama nesnesini oluşturur."""
+        from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
+
+        if self.search_mode == "grid":
+            return GridSearchCV(estimator, PARAM_GRIDS[self.model_choice], cv=self.cv, n_jobs=self.n_jobs, verbose=1)
+
+        distributions = param_distributions(self.model_choice)
+        if self.search_mode == "halving":
+            from sklearn.experimental import enable_halving_search_cv  # noqa: F401  HalvingRandomSearchCV'yi etkinleştirir
+            from sklearn.model_selection import HalvingRandomSearchCV
+            # En küçük kaynak her katta her sınıftan en az iki örnek olacak kadardır; veri bundan azsa yarılama yapılamaz
+            min_resources = 2 * self.cv * y_train.nunique()
+            if len(y_train) >= 2 * min_resources:
+                halving_rounds = 1 + int(math.floor(math.log(len(y_train) // min_resources, HALVING_FACTOR) + 1e-9))
+                n_candidates = self._candidate_budget(estimator, X_train, y_train, halving_rounds)
+                return HalvingRandomSearchCV(estimator, distributions, n_candidates=n_candidates,
+                                             factor=HALVING_FACTOR, min_resources=min_resources, cv=self.cv,
+                                             n_jobs=self.n_jobs, random_state=42, verbose=1)
+            logger.warning("Veri ardışık yarılama için çok küçük (%d satır); rastgele arama yapılıyor.", len(y_train))
+        n_candidates = self._candidate_budget(estimator, X_train, y_train)
+        return RandomizedSearchCV(estimator, distributions, n_iter=n_candidates, cv=self.cv, n_jobs=self.n_jobs,
+                                  random_state=42, verbose=1)
+
+    def _record_search(self, search, elapsed):
+        """Aday bazında skorları ve eğitim/skorlama sürelerini saklar, CSV'ye yazar ve seçilen adayın kat skorlarını tutar."""
+        results = pd.DataFrame(search.cv_results_)
+        split_columns = [f"split{i}_test_score" for i in range(self.cv)]
+        columns = ["params", "mean_test_score", "std_test_score", "rank_test_score",
+                   "mean_fit_time", "std_fit_time", "mean_score_time"]
+        if "iter" in results.columns:  # Ardışık yarılamada adayın elendiği tur ve kullanılan örnek sayısı
+            columns += ["iter", "n_resources"]
+        self.search_results = results[columns + split_columns]
+        self.cv_scores = results.loc[search.best_index_, split_columns].to_numpy(dtype=float)
+
+        search_path = os.path.join(self.output_dir, "search_results.csv")
+        self.search_results.to_csv(search_path, index=False)
+        total_fit = float((results["mean_fit_time"] + results["mean_score_time"]).sum() * self.cv)
+        logger.info("%s araması: %d aday, %d eğitim, %.1f saniye (toplam eğitim+skorlama %.1f saniye). "
+                    "Aday süreleri: %s", self.search_mode, len(results), len(results) * self.cv, elapsed,
+                    total_fit, search_path)
 
     # Seçilen modelle eğitim yapar.
     def train_model(self, X_train, y_train):
@@ -96,44 +248,53 @@ class ModelTrainer:  # ModelTrainer sınıfı, makine öğrenimi modellerinin e
         """
         if self.model_choice == "random_forest":
             if not self.model:
+                from sklearn.ensemble import RandomForestClassifier
                 self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-            print("RandomForest modeli ile eğitim başlıyor.")
+            logger.info("RandomForest modeli ile eğitim başlıyor.")
         elif self.model_choice == "svm":
             if not self.model:
+                from sklearn.svm import SVC
                 self.model = SVC(kernel='linear', random_state=42)
-            print("SVM modeli ile eğitim başlıyor.")
+            logger.info("SVM modeli ile eğitim başlıyor.")
 
         self.model.fit(X_train, y_train)
-        print("Model eğitimi tamamlandı.")
+        logger.info("Model eğitimi tamamlandı.")
 
     # Doğruluk, Confusion Matrix ve Classification Report sunar.
     def evaluate_model(self, X_test, y_test):
         """
         Eğitilen modeli test eder ve performansı değerlendirir.
         """
+        from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
+
         y_pred = self.model.predict(X_test)
 
         # Modelin performansı
         accuracy = accuracy_score(y_test, y_pred)
-        print(f"Model Doğruluğu (Accuracy): {accuracy:.2f}")
+        logger.info("Model Doğruluğu (Accuracy): %.2f", accuracy)
 
         # Confusion Matrix
         cm = confusion_matrix(y_test, y_pred)
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
-        plt.title('Confusion Matrix')
-        plt.xlabel('Predicted')
-        plt.ylabel('Actual')
-
-        # Confusion Matrix'i results klasörüne kaydet
-        cm_output_path = os.path.join(self.output_dir, 'confusion_matrix.png')
-        plt.savefig(cm_output_path, bbox_inches='tight')  # Kaydetme işlemi
-        print(f"Confusion Matrix kaydedildi: {cm_output_path}")
-        plt.close()
+        if self.plots:
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+
+            plt.figure(figsize=(8, 6))
+            sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
+            plt.title('Confusion Matrix')
+            plt.xlabel('Predicted')
+            plt.ylabel('Actual')
+
+            # Confusion Matrix'i results klasörüne kaydet
+            cm_output_path = os.path.join(self.output_dir, 'confusion_matrix.png')
+            plt.savefig(cm_output_path, bbox_inches='tight')  # Kaydetme işlemi
+            logger.info("Confusion Matrix kaydedildi: %s", cm_output_path)
+            plt.close()
+        else:
+            logger.info("Confusion Matrix:\n%s", cm)
 
         # Classification Report
-        print("\nClassification Report:")
-        print(classification_report(y_test, y_pred))
+        logger.info("Classification Report:\n%s", classification_report(y_test, y_pred))
 
 
         return accuracy
@@ -145,16 +306,21 @@ class ModelTrainer:  # ModelTrainer sınıfı, makine öğrenimi modellerinin e
         RandomForest'ta feature_importances_ kullanılır, SVM'de linear kernel için coef_ kullanılır.
         Diğer SVM kernel'ları için permütasyon yöntemi kullanılır.
         """
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.svm import SVC
+
         if isinstance(self.model, RandomForestClassifier):
             importances = self.model.feature_importances_
             feature_names = X_train.columns
             feature_importances = pd.DataFrame(importances, index=feature_names, columns=['Importance']).sort_values(
                 by='Importance', ascending=False)
 
-            print("\nÖzelliklerin Önemi (Feature Importances - RandomForest):")
-            print(feature_importances)
+            logger.info("Özelliklerin Önemi (Feature Importances - RandomForest):\n%s", feature_importances)
+            if not self.plots:
+                return
 
             # Özelliklerin önemini görselleştirme
+            import matplotlib.pyplot as plt
             plt.figure(figsize=(20, 12))  # Uygun bir boyut
             feature_importances.plot(kind='bar')
             plt.title('Feature Importances (RandomForest)')
@@ -163,7 +329,7 @@ class ModelTrainer:  # ModelTrainer sınıfı, makine öğrenimi modellerinin e
             # Feature Importances'ı kaydet
             fi_output_path = os.path.join(self.output_dir, 'feature_importances_rf.png')
             plt.savefig(fi_output_path, bbox_inches='tight')  # Kaydetme işlemi
-            print(f"Feature Importances görseli kaydedildi: {fi_output_path}")
+            logger.info("Feature Importances görseli kaydedildi: %s", fi_output_path)
             plt.close()
         elif isinstance(self.model, SVC):
             if self.model.kernel == 'linear':
@@ -174,10 +340,12 @@ class ModelTrainer:  # ModelTrainer sınıfı, makine öğrenimi modellerinin e
                                                    columns=['Importance']).sort_values(
                     by='Importance', ascending=False)
 
-                print("\nÖzelliklerin Önemi (Feature Importances - SVM):")
-                print(feature_importances)
+                logger.info("Özelliklerin Önemi (Feature Importances - SVM):\n%s", feature_importances)
+                if not self.plots:
+                    return
 
                 # Özelliklerin önemini görselleştirme
+                import matplotlib.pyplot as plt
                 plt.figure(figsize=(20, 12))  # Uygun bir boyut
                 feature_importances.plot(kind='bar')
                 plt.title('Feature Importances (SVM - Linear Kernel)')
@@ -186,10 +354,10 @@ class ModelTrainer:  # ModelTrainer sınıfı, makine öğrenimi modellerinin e
                 # Feature Importances'ı kaydet
                 fi_output_path = os.path.join(self.output_dir, 'feature_importances_svm.png')
                 plt.savefig(fi_output_path, bbox_inches='tight')  # Kaydetme işlemi
-                print(f"Feature Importances görseli kaydedildi: {fi_output_path}")
+                logger.info("Feature Importances görseli kaydedildi: %s", fi_output_path)
                 plt.close()
         else:
-            print("Özellik önemi analizi, yalnızca RandomForest veya SVM için desteklenmektedir.")
+            logger.warning("Özellik önemi analizi, yalnızca RandomForest veya SVM için desteklenmektedir.")
 
     # Veriyi ön işler, böler, modeli eğitir ve değerlendirir.
     def run_training(self, data):
@@ -198,6 +366,8 @@ class ModelTrainer:  # ModelTrainer sınıfı, makine öğrenimi modellerinin e
         """
         # Veriyi ön işle
         X, y = self.preprocess_data(data)
+        self.feature_columns = list(X.columns)
+        self.target_column = y.name
 
         # Eğitim ve test setlerine böl
         X_train, X_test, y_train, y_test = self.split_data(X, y)
@@ -206,51 +376,319 @@ class ModelTrainer:  # ModelTrainer sınıfı, makine öğrenimi modellerinin e
         if X_train.empty or y_train.empty:
             raise ValueError("Eğitim verisi boş. Lütfen verinizi kontrol edin.")
 
-        # Modelin hiperparametrelerini optimize et
-        self.tune_model(X_train, y_train)
-        # Modeli eğit
-        self.train_model(X_train, y_train)
+        with stage("training"):
+            # Modelin hiperparametrelerini optimize et
+            self.tune_model(X_train, y_train)
+            # Modeli eğit
+            self.train_model(X_train, y_train)
 
         # Özellik önemini analiz et
         self.feature_importance(X_train,y_train)
 
         # Modeli değerlendir
-        return self.evaluate_model(X_test, y_test)
+        accuracy = self.evaluate_model(X_test, y_test)
+        self._record_training_state(data, X, accuracy)
+        return accuracy
 
-    # Modeli K-Fold çapraz doğrulama ile değerlendirir.
-    def cross_validate(self, X, y, cv=5):
+    # Eğitilen dosyaları ve özellik dağılımını sonraki artımlı eğitimler için kaydeder.
+    def _record_training_state(self, data, X, accuracy):
+        self.training_state = {
+            "trained_files": set(data["file_name"]) if "file_name" in data.columns else set(),
+            "n_rows": len(X),
+            "feature_mean": X.mean().to_numpy(),
+            "feature_std": X.std(ddof=0).to_numpy(),
+            "reference_accuracy": float(accuracy),
+        }
+
+    # Yeni satırların özellik ortalamasının eğitim dağılımından ne kadar kaydığını ölçer.
+    def drift_score(self, X_new):
         """
-        Modeli K-Fold çapraz doğrulama ile değerlendirir.
+        Her özellik için |yeni ortalama - eğitim ortalaması| / eğitim standart sapması hesaplanır, en büyüğü döndürülür.
         """
-        kfold = KFold(n_splits=cv, shuffle=True, random_state=42)
-        scores = cross_val_score(self.model, X, y, cv=kfold)
-        print(f"\n{cv}-Fold Cross Validation Accuracy Scores: {scores}")
-        print(f"Ortalama Doğruluk: {scores.mean():.2f}")
+        state = self.training_state
+        std = np.where(state["feature_std"] > 0, state["feature_std"], 1.0)
+        shift = np.abs(X_new.to_numpy(dtype=float).mean(axis=0) - state["feature_mean"]) / std
+        return float(shift.max()) if len(shift) else 0.0
 
-    # Yeni verilerle tahmin yapar ve sonuçları CSV dosyasına kaydeder.
-    def predict(self, features_list):
+    # Yalnızca son kayıttan sonra eklenen satırlarla modeli günceller; kayma veya doğruluk düşüşünde tam eğitime döner.
+    def run_incremental(self, data, trees_per_update=50, drift_threshold=0.5, accuracy_drop=0.1):
         """
-        Yeni verilerle tahmin yapar ve sonuçları CSV dosyasına kaydeder.
-        :param features_list: Tahmin yapılacak özelliklerin listesi (list formatında).
-        :return: Tahmin sonuçları
+        RandomForest'a warm_start ile yalnızca yeni satırlarla eğitilmiş trees_per_update kadar ağaç eklenir;
+        partial_fit destekleyen modeller partial_fit ile, diğerleri mevcut parametrelerle tüm veride yeniden eğitilir.
+        Yeni satırlarda özellik kayması drift_threshold'u aşarsa ya da modelin yeni satırlardaki doğruluğu
+        referans doğruluğun accuracy_drop kadar altına düşerse hiperparametre araması dahil tam eğitim yapılır.
+        :return: 'unchanged' (yeni satır yok), 'deferred' (yeni satırlarda tüm sınıflar yok, bekletildi),
+                 'incremental' (model güncellendi) veya 'retuned' (tam eğitim yapıldı)
         """
-        for features in features_list:
-            # Özellikleri numpy dizisine çevir ve model için uygun şekle getir
-            features_array = np.array(features).reshape(1, -1)
-
-            # Tahmin yapma
-            predictions = self.model.predict(features_array)
-
-            # Sonuçları sakla
-            self.results.append(predictions[0])  # predictions[0] çünkü tek bir tahmin alıyoruz
-
-        # Tahmin sonuçlarını CSV dosyasına yaz
-        results_df = pd.DataFrame(self.results, columns=["predictions"])
-        results_csv_path = "results/predictions.csv"
-        results_df.to_csv(results_csv_path, index=False)
-        print(f"Tahmin sonuçları {results_csv_path} dosyasına kaydedildi.")
-
-        return self.results
+        if self.model is None or self.training_state is None or "file_name" not in data.columns:
+            logger.info("Artımlı eğitim bilgisi yok; tam eğitim yapılıyor.")
+            self.run_training(data)
+            return "retuned"
+
+        state = self.training_state
+        new_rows = data[~data["file_name"].isin(state["trained_files"])]
+        if new_rows.empty:
+            logger.info("Son kayıttan sonra yeni etiketli satır yok; model değişmedi.")
+            return "unchanged"
+
+        X_new = new_rows[self.feature_columns].astype(float)
+        y_new = new_rows[self.target_column]
+        drift = self.drift_score(X_new)
+        from sklearn.metrics import accuracy_score
+
+        accuracy = accuracy_score(y_new, self.predict(X_new, output_path=None)[0])
+        logger.info("%d yeni satır: özellik kayması %.2f (eşik %.2f), doğruluk %.2f (referans %.2f)",
+                    len(new_rows), drift, drift_threshold, accuracy, state["reference_accuracy"])
+        if drift > drift_threshold or accuracy < state["reference_accuracy"] - accuracy_drop:
+            logger.info("Eşik aşıldı; hiperparametre araması ile tam eğitim yapılıyor.")
+            self.run_training(data)
+            return "retuned"
+
+        classes = getattr(self.model, "classes_", None)
+        if classes is not None and not set(classes).issubset(set(y_new)):
+            # Yalnızca bir sınıf içeren ağaçlar diğer ağaçlarla birleştirilemez
+            logger.info("Yeni satırlarda tüm sınıflar bulunmuyor; güncelleme sonraki satırlara ertelendi.")
+            return "deferred"
+
+        from sklearn.ensemble import RandomForestClassifier
+
+        with stage("training"):
+            if isinstance(self.model, RandomForestClassifier):
+                n_estimators = self.model.n_estimators + trees_per_update
+                self.model.set_params(warm_start=True, n_estimators=n_estimators)
+                self.model.fit(X_new, y_new)
+                logger.info("RandomForest'a %d yeni ağaç eklendi (toplam %d).", trees_per_update, n_estimators)
+            elif hasattr(self.model, "partial_fit"):
+                self.model.partial_fit(X_new, y_new)
+                logger.info("Model partial_fit ile güncellendi.")
+            else:
+                X_all = data[self.feature_columns].astype(float)
+                self.model.fit(X_all, data[self.target_column])
+                logger.info("Model artımlı eğitimi desteklemiyor; mevcut parametrelerle tüm veride yeniden eğitildi.")
+
+        # Eğitim dağılımı yeni satırlarla birleştirilir (toplam ortalama ve varyans)
+        n_old, n_new = state["n_rows"], len(X_new)
+        new_mean = X_new.mean().to_numpy()
+        new_var = X_new.var(ddof=0).to_numpy()
+        total = n_old + n_new
+        mean = (n_old * state["feature_mean"] + n_new * new_mean) / total
+        variance = (n_old * (state["feature_std"] ** 2 + (state["feature_mean"] - mean) ** 2)
+                    + n_new * (new_var + (new_mean - mean) ** 2)) / total
+        state.update(n_rows=total, feature_mean=mean, feature_std=np.sqrt(variance))
+        state["trained_files"] |= set(new_rows["file_name"])
+        self.cv_scores = None  # Aramadaki kat skorları artık güncellenen modeli temsil etmez
+        return "incremental"
 
+    # Modeli K-Fold çapraz doğrulama ile değerlendirir.
+    def cross_validate(self, X, y, cv=5, reuse_search=True):
+        """
+        Modeli K-Fold çapraz doğrulama ile değerlendirir.
+        reuse_search True ise ve model bir hiperparametre aramasından geliyorsa, modeli yeniden eğitmek yerine
+        seçilen adayın aramadaki kat skorları kullanılır.
+        """
+        if reuse_search and self.cv_scores is not None:
+            scores = self.cv_scores
+            cv = len(scores)
+            logger.info("Çapraz doğrulama skorları hiperparametre aramasından alındı (yeniden eğitim yapılmadı).")
+        else:
+            from sklearn.model_selection import KFold, cross_val_score
 
+            kfold = KFold(n_splits=cv, shuffle=True, random_state=42)
+            scores = cross_val_score(self.model, X, y, cv=kfold)
+        logger.info("%d-Fold Cross Validation Accuracy Scores: %s", cv, scores)
+        logger.info("Ortalama Doğruluk: %.2f", scores.mean())
 
+    # Özellik matrisini sabit boyutlu parçalar halinde tahmin eder ve sonuçları parça parça dosyaya yazar.
+    def predict(self, features, chunk_size=10000, output_path="results/predictions.csv"):
+        """
+        Yeni verilerle toplu tahmin yapar; sınıf içinde çağrılar arasında durum tutmaz.
+        :param features: 2 boyutlu dizi veya DataFrame. DataFrame modelin özellik sütunlarını içeriyorsa onlar seçilir.
+        :param chunk_size: Modele tek çağrıda verilecek satır sayısı
+        :param output_path: Tahminlerin parça parça yazılacağı CSV dosyası; None ise dosyaya yazılmaz
+        :return: (predictions, probabilities) -> (N,) tahminler ve (N, sınıf sayısı) olasılıklar;
+                 model predict_proba desteklemiyorsa probabilities None olur
+        """
+        if self.model is None:
+            raise ValueError("Tahmin için eğitilmiş bir model yok. Önce modeli eğitin veya yükleyin.")
+        if isinstance(features, pd.DataFrame) and self.feature_columns is not None \
+                and set(self.feature_columns).issubset(features.columns):
+            features = features[self.feature_columns]
+        X = np.asarray(features, dtype=float)
+        if X.ndim != 2:
+            raise ValueError(f"Özellikler 2 boyutlu olmalıdır, gelen boyut: {X.shape}")
+
+        has_proba = hasattr(self.model, "predict_proba")
+        # Model DataFrame ile eğitildiyse parçalara aynı sütun adları verilir (kopyalamadan, sadece etiket)
+        column_names = getattr(self.model, "feature_names_in_", None)
+        n_rows = X.shape[0]
+        predictions = None
+        probabilities = None
+        output_file = None
+        if output_path is not None:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            output_file = open(output_path, "w", newline="", encoding="utf-8")
+        with stage("predict"):
+            try:
+                for start in range(0, n_rows, chunk_size):
+                    chunk = X[start:start + chunk_size]
+                    if column_names is not None:
+                        chunk = pd.DataFrame(chunk, columns=column_names, copy=False)
+                    if hasattr(self.model, "predict_with_proba"):  # Derlenmiş orman: ağaçlar tek kez gezilir
+                        chunk_pred, chunk_proba = self.model.predict_with_proba(chunk)
+                    else:
+                        chunk_pred = self.model.predict(chunk)
+                        chunk_proba = self.model.predict_proba(chunk) if has_proba else None
+                    if predictions is None:  # Sonuç dizileri ilk parçanın tipine göre bir kez ayrılır
+                        predictions = np.empty(n_rows, dtype=chunk_pred.dtype)
+                    predictions[start:start + len(chunk)] = chunk_pred
+
+                    if chunk_proba is not None:
+                        if probabilities is None:
+                            probabilities = np.empty((n_rows, chunk_proba.shape[1]), dtype=float)
+                        probabilities[start:start + len(chunk)] = chunk_proba
+
+                    if output_file is not None:
+                        chunk_df = pd.DataFrame({"predictions": chunk_pred})
+                        if chunk_proba is not None:
+                            for index, label in enumerate(self.model.classes_):
+                                chunk_df[f"proba_{label}"] = chunk_proba[:, index]
+                        chunk_df.to_csv(output_file, index=False, header=(start == 0))
+            finally:
+                if output_file is not None:
+                    output_file.close()
+
+        if predictions is None:  # Boş girdi
+            predictions = np.empty(0)
+        if output_path is not None:
+            logger.info("Tahmin sonuçları %s dosyasına kaydedildi.", output_path)
+        return predictions, probabilities
+
+    # Tahmin için veriden modelin eğitildiği özellik sütunlarını, eğitimdeki sırasıyla seçer.
+    def select_features(self, data):
+        """
+        Kaydedilmiş özellik sütunları varsa onları seçer; yoksa preprocess_data ile aynı işlemi yapar.
+        """
+        if self.feature_columns is None:
+            X, _ = self.preprocess_data(data)
+            return X
+        missing = [column for column in self.feature_columns if column not in data.columns]
+        if missing:
+            raise ValueError(f"Veride modelin beklediği sütunlar eksik: {missing}")
+        return data[self.feature_columns].astype(float)
+
+    # Eğitilmiş modeli, özellik sütunlarını ve ön işleme bilgilerini sürümlü tek bir dosyaya kaydeder.
+    def save_model(self, path):
+        """
+        Eğitilmiş modeli ve tahmin için gereken ön işleme bilgilerini tek dosyada saklar.
+        Dosya biçimi MODEL_FORMAT_VERSION ile sürümlenir.
+        """
+        if self.model is None:
+            raise ValueError("Kaydedilecek eğitilmiş bir model yok. Önce modeli eğitin.")
+        import joblib
+        import sklearn
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        artifact = {
+            "format_version": MODEL_FORMAT_VERSION,
+            "model": self.model,
+            "model_choice": self.model_choice,
+            "feature_columns": self.feature_columns,
+            "target_column": self.target_column,
+            "extraction_options": self.extraction_options,
+            "dropped_columns": list(self.DROPPED_COLUMNS),
+            "training_state": self.training_state,
+            "sklearn_version": sklearn.__version__,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        # Yarım kalmış bir yazma mevcut modeli bozmasın diye önce geçici dosyaya yazılır
+        tmp_path = f"{path}.tmp"
+        joblib.dump(artifact, tmp_path)
+        os.replace(tmp_path, path)
+        logger.info("Model kaydedildi: %s", path)
+        if self.model_choice == "random_forest":  # Derlenmiş puanlayıcı her kayıtta modelle birlikte güncellenir
+            self.export_compiled(compiled_model_path(path), created_at=artifact["created_at"])
+
+    # RandomForest modelini scikit-learn olmadan yüklenip puanlanabilen düz NumPy dizilerine çevirip kaydeder.
+    def export_compiled(self, path, created_at=None):
+        """
+        Dosya forest_scorer.CompiledForest biçimindedir; tahminler ve olasılıklar modelinkilerle aynıdır.
+        """
+        from forest_scorer import CompiledForest
+
+        if self.model is None:
+            raise ValueError("Dışa aktarılacak eğitilmiş bir model yok. Önce modeli eğitin.")
+        metadata = {"feature_columns": self.feature_columns, "target_column": self.target_column,
+                    "model_choice": self.model_choice, "created_at": created_at,
+                    "extraction_options": self.extraction_options}
+        CompiledForest.from_model(self.model, metadata).save(path)
+        logger.info("Derlenmiş puanlayıcı kaydedildi: %s", path)
+
+    # Kaydedilmiş modeli yükleyerek yeniden eğitim yapmadan kullanıma hazır bir ModelTrainer döndürür.
+    @classmethod
+    def load_model(cls, path, output_dir):
+        """
+        save_model ile kaydedilmiş modeli yükler ve dosya biçim sürümünü doğrular.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model dosyası bulunamadı: {path}. Önce modeli eğitin.")
+        import joblib
+        import sklearn
+
+        artifact = joblib.load(path)
+        format_version = artifact.get("format_version") if isinstance(artifact, dict) else None
+        if format_version not in SUPPORTED_FORMAT_VERSIONS:
+            raise ValueError(
+                f"Desteklenmeyen model dosyası sürümü: {format_version} (beklenen: {MODEL_FORMAT_VERSION}). "
+                f"Lütfen modeli yeniden eğitin.")
+        if artifact["sklearn_version"] != sklearn.__version__:
+            logger.warning("Model scikit-learn %s ile kaydedilmiş, şu an %s kullanılıyor.",
+                           artifact["sklearn_version"], sklearn.__version__)
+
+        trainer = cls(output_dir=output_dir, model_choice=artifact["model_choice"])
+        trainer.model = artifact["model"]
+        trainer.feature_columns = artifact["feature_columns"]
+        trainer.target_column = artifact["target_column"]
+        trainer.training_state = artifact.get("training_state")
+        trainer.extraction_options = artifact.get("extraction_options")  # Eski dosyalarda yoktur
+        logger.info("Model yüklendi: %s (kayıt zamanı: %s)", path, artifact["created_at"])
+        return trainer
+
+    # Derlenmiş puanlayıcıyı scikit-learn yüklemeden, yalnızca tahmin için kullanılacak bir ModelTrainer olarak yükler.
+    @classmethod
+    def load_compiled(cls, path, output_dir):
+        """
+        export_compiled (veya save_model) ile yazılmış .npz dosyasını yükler. Model predict / predict_proba / classes_
+        arayüzünü sağladığından predict ve WatchService değişmeden çalışır; artımlı eğitim için load_model kullanılmalıdır.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Derlenmiş model dosyası bulunamadı: {path}. Önce modeli eğitin.")
+        from forest_scorer import CompiledForest
+
+        model = CompiledForest.load(path)
+        trainer = cls(output_dir=output_dir, model_choice=model.metadata["model_choice"])
+        trainer.model = model
+        trainer.feature_columns = model.metadata["feature_columns"]
+        trainer.target_column = model.metadata["target_column"]
+        trainer.extraction_options = model.metadata.get("extraction_options")
+        logger.info("Derlenmiş model yüklendi: %s (kayıt zamanı: %s)", path, model.metadata["created_at"])
+        return trainer
+
+    # Tahmin için modeli seçilen puanlayıcıyla yükler.
+    @classmethod
+    def load_for_inference(cls, path, output_dir, scorer="auto"):
+        """
+        :param scorer: 'sklearn' kayıtlı modeli, 'compiled' yanındaki derlenmiş puanlayıcıyı yükler; 'auto' derlenmiş
+                       dosya varsa ve modelden eski değilse onu, değilse kayıtlı modeli kullanır.
+                       path doğrudan bir derlenmiş model (.npz) ise her zaman o yüklenir.
+        """
+        if scorer not in SCORERS:
+            raise ValueError(f"Geçersiz puanlayıcı: {scorer}. {SCORERS} değerlerinden biri olmalıdır.")
+        if path.endswith(".npz"):
+            return cls.load_compiled(path, output_dir)
+        compiled_path = compiled_model_path(path)
+        if scorer == "compiled":
+            return cls.load_compiled(compiled_path, output_dir)
+        if scorer == "auto" and os.path.exists(compiled_path) and \
+                (not os.path.exists(path) or os.path.getmtime(compiled_path) >= os.path.getmtime(path)):
+            return cls.load_compiled(compiled_path, output_dir)
+        return cls.load_model(path, output_dir)
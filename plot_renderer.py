@@ -0,0 +1,137 @@
+import queue
+import threading
+import os
+from utils.instrumentation import stage
+import logging
+
+logger = logging.getLogger(__name__)
+
+RENDER_MODES = ("off", "sample", "all")  # Görselleştirme modları: hiç / örneklem / tümü
+
+# Prev ve Curr poligonlarını üst üste çizer ve kaydeder.
+def render_polygons(output_path, file_name, prev_points, curr_points):
+    """Poligon grafiğini Agg tuvali üzerinde çizip plots klasörüne kaydeder."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    x_prev, y_prev = prev_points[:, 0], prev_points[:, 1]
+    x_curr, y_curr = curr_points[:, 0], curr_points[:, 1]
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.fill(x_prev, y_prev, alpha=0.5, label='Eski Kesim', color='blue')
+    ax.fill(x_curr, y_curr, alpha=0.5, label='Yeni Kesim', color='orange')
+    ax.plot(x_prev, y_prev, color='blue')
+    ax.plot(x_curr, y_curr, color='orange')
+    ax.legend()
+    ax.set_title(f"{file_name}")
+    ax.set_xlabel("X Koordinatları")
+    ax.set_ylabel("Y Koordinatları")
+    ax.grid(True)
+
+    output_folder = os.path.join(output_path, "plots")
+    os.makedirs(output_folder, exist_ok=True)
+    file_base_name = os.path.splitext(file_name)[0]
+    fig.savefig(os.path.join(output_folder, f"{file_base_name}_plot.png"), bbox_inches='tight')
+    logger.debug("Poligon grafiği kaydedildi: %s", output_path)
+
+# Prev ve Curr Fourier büyüklük spektrumlarını ayrı dosyalara kaydeder.
+def render_fourier(output_path, file_name, freq, magnitude_prev, magnitude_curr):
+    """Prev ve Curr spektrumlarını plots2/prev_fft ve plots2/curr_fft klasörlerine kaydeder."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    file_base_name = os.path.splitext(file_name)[0]
+    panels = [
+        ("prev_fft", Figure(figsize=(12, 6)), 1, magnitude_prev, 'blue', "Prev"),
+        ("curr_fft", Figure(), 2, magnitude_curr, 'red', "Curr"),
+    ]
+    for folder, fig, position, magnitude, color, label in panels:
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 2, position)
+        ax.plot(freq, magnitude, color=color)
+        ax.set_title(f"{label} Noktaları - Fourier Büyüklük Spektrumu {file_name}")
+        ax.set_xlabel("Frekans")
+        ax.set_ylabel("Büyüklük")
+        ax.grid(True)
+
+        output_folder = os.path.join(output_path, "plots2", folder)
+        os.makedirs(output_folder, exist_ok=True)
+        fig.savefig(os.path.join(output_folder, f"{file_base_name}_plot.png"), bbox_inches='tight')
+
+RENDERERS = {
+    "polygons": render_polygons,
+    "fourier": render_fourier,
+}
+
+class PlotCollector:  # Çizim işlerini çizmeden biriktirir; süreç havuzundaki analizler işleri ana sürece bu şekilde taşır.
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, kind, *args):
+        """Çizim işini listeye ekler."""
+        self.jobs.append((kind, args))
+
+class PlotRenderer:  # Çizim işlerini arka plandaki tek bir iş parçacığında Agg ile çizer, özellik çıkarımını bekletmez.
+    def __init__(self, mode="all", sample_size=10):
+        """
+        :param mode: 'off' (çizim yok), 'sample' (sample_size kadar dosya) veya 'all' (tüm dosyalar)
+        :param sample_size: 'sample' modunda çizilecek dosya sayısı
+        """
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Geçersiz çizim modu: {mode}. {RENDER_MODES} değerlerinden biri olmalıdır.")
+        self.mode = mode
+        self.sample_size = sample_size
+        self._queue = queue.Queue()
+        self._thread = None
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    def select(self, n_files):
+        """Çizilecek dosyaların sıra numaralarını döndürür; örneklem modunda dosyalar eşit aralıklarla seçilir."""
+        if self.mode == "off" or n_files == 0:
+            return set()
+        if self.mode == "all" or self.sample_size >= n_files:
+            return set(range(n_files))
+        return {i * n_files // self.sample_size for i in range(self.sample_size)}
+
+    def start(self):
+        """Arka plandaki çizim iş parçacığını başlatır."""
+        if self._thread is None and self.enabled:
+            self._thread = threading.Thread(target=self._worker, name="plot-renderer", daemon=True)
+            self._thread.start()
+
+    def submit(self, kind, *args):
+        """Çizim işini kuyruğa ekler ve hemen döner."""
+        if not self.enabled:
+            return
+        self.start()
+        self._queue.put((kind, args))
+
+    def submit_jobs(self, jobs):
+        """PlotCollector ile toplanmış işleri kuyruğa ekler."""
+        for kind, args in jobs:
+            self.submit(kind, *args)
+
+    def close(self):
+        """Kuyruktaki tüm çizimlerin bitmesini bekler ve iş parçacığını durdurur."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            kind, args = job
+            try:
+                with stage("plotting", args[1]):  # args: (output_path, file_name, ...)
+                    RENDERERS[kind](*args)
+            except Exception as e:  # Bir grafiğin hatası diğer çizimleri durdurmamalı
+                logger.error("Grafik çizilirken hata oluştu (%s): %s", kind, e)
@@ -1,35 +1,202 @@
 import pandas as pd
-class ResultsManager:
-    def __init__(self):
-        self.results = []
-
-    def add_result(self, file_name, mean_distance, std_distance, shaper_result, angle_analysis,fourier_result, same_series_value):
-        if mean_distance is None or std_distance is None or not shaper_result or not angle_analysis or not fourier_result:
-            print(f"Sonuçlar eksik: {file_name}")
-            return  # Hatalı sonuç eklememek için geri dön
-        """Sonuçları listeye ekler"""
-        self.results.append({
+import numpy as np
+from utils.instrumentation import stage
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Dosya başına üretilen sayısal özellik sütunları (kayıt ve tablo sırası)
+FEATURE_COLUMNS = [
+    "mean_distance", "std_distance", "intersection_area", "union_area", "iou",
+    "angle_std_prev", "angle_mean_curr", "angle_std_curr", "angle_mse", "similarity_score",
+    "min_freq", "max_freq", "mean_magnitude_prev", "max_magnitude_prev",
+    "mean_magnitude_curr", "max_magnitude_curr",
+]
+LABEL_COLUMN = "same_series_value"
+# Hizalama moduna göre (bkz. GlassCutAnalysis.analyze_alignment) isteğe bağlı olarak eklenen sütunlar
+ALIGNMENT_COLUMNS = {
+    "off": [],
+    "nearest": ["nn_mean_distance", "nn_std_distance", "hausdorff_distance", "chamfer_distance"],
+    "shift": ["nn_mean_distance", "nn_std_distance", "hausdorff_distance", "chamfer_distance",
+              "shift_fraction", "shift_mean_distance"],
+}
+# Aynı analiz adımında birlikte hesaplanan sütun grupları; özellik planı (bkz. feature_plan.py) modelin
+# kullanmadığı grupları hiç hesaplatmaz. distances grubu her zaman hesaplanır (boş dosyalar onunla ayıklanır).
+FEATURE_GROUPS = {
+    "distances": ["mean_distance", "std_distance"],
+    "polygons": ["intersection_area", "union_area", "iou"],
+    "angles": ["angle_std_prev", "angle_mean_curr", "angle_std_curr", "angle_mse", "similarity_score"],
+    "fourier": ["min_freq", "max_freq", "mean_magnitude_prev", "max_magnitude_prev",
+                "mean_magnitude_curr", "max_magnitude_curr"],
+    "alignment": ALIGNMENT_COLUMNS["shift"],
+}
+RESULT_FORMATS = ("csv", "parquet", "arrow")  # Sonuç tablosunun yazılabileceği biçimler
+
+class ResultsManager:  # Dosya bazındaki özellikleri sütun sütun, tipli NumPy dizilerinde tutar.
+    def __init__(self, capacity=1024, extra_columns=(), skipped_groups=()):
+        """
+        :param capacity: Başlangıçta ayrılacak satır sayısı; dolduğunda diziler iki katına büyütülür
+        :param extra_columns: FEATURE_COLUMNS'tan sonra tutulacak isteğe bağlı özellik sütunları (ör. ALIGNMENT_COLUMNS)
+        :param skipped_groups: Hesaplanmayan FEATURE_GROUPS grupları; sütunları tabloda yer almaz
+        """
+        self._capacity = max(1, capacity)
+        self._size = 0
+        self._file_names = []
+        skipped = {column for group in skipped_groups for column in FEATURE_GROUPS[group]}
+        self.columns = [column for column in FEATURE_COLUMNS if column not in skipped] + \
+                       [column for column in extra_columns if column not in FEATURE_COLUMNS and column not in skipped]
+        self._features = {column: np.empty(self._capacity, dtype=np.float64) for column in self.columns}
+        self._labels = np.zeros(self._capacity, dtype=np.int64)
+        self._label_mask = np.zeros(self._capacity, dtype=bool)  # Etiketi olan satırlar
+
+    def __len__(self):
+        return self._size
+
+    def add_result(self, file_name, mean_distance, std_distance, shaper_result, angle_analysis,fourier_result, same_series_value,
+                   alignment_result=None, skipped_groups=()):
+        """Sonuçları tabloya ekler"""
+        row = self.build_result(file_name, mean_distance, std_distance, shaper_result, angle_analysis, fourier_result, same_series_value,
+                                alignment_result, skipped_groups)
+        if row is not None:
+            self.add_row(row)
+
+    def add_row(self, row):
+        """build_result ile (veya önbellekten) elde edilmiş hazır bir satırı tabloya ekler"""
+        if self._size == self._capacity:
+            self._grow()
+        index = self._size
+        self._file_names.append(row["file_name"])
+        for column in self.columns:
+            self._features[column][index] = row.get(column, np.nan)
+        label = row.get(LABEL_COLUMN)
+        self._label_mask[index] = label is not None
+        self._labels[index] = label if label is not None else 0
+        self._size += 1
+
+    def _grow(self):
+        """Dizilerin kapasitesini iki katına çıkarır."""
+        self._capacity *= 2
+        for column, values in self._features.items():
+            self._features[column] = np.resize(values, self._capacity)
+        self._labels = np.resize(self._labels, self._capacity)
+        self._label_mask = np.resize(self._label_mask, self._capacity)
+
+    @staticmethod # Analiz sonuçlarından tabloya eklenecek satırı oluşturur; eksik sonuçlarda None döndürür.
+    def build_result(file_name, mean_distance, std_distance, shaper_result, angle_analysis,fourier_result, same_series_value,
+                     alignment_result=None, skipped_groups=()):
+        # Atlanan grupların boş sonuçları eksik sayılmaz; sütunları satıra eklenmez
+        results = {"polygons": shaper_result, "angles": angle_analysis, "fourier": fourier_result}
+        if mean_distance is None or std_distance is None or \
+                any(not result for group, result in results.items() if group not in skipped_groups):
+            logger.warning("Sonuçlar eksik: %s", file_name)
+            return None  # Hatalı sonuç eklememek için geri dön
+        row = {
             "file_name": file_name,
-            "mean_distance": f"{mean_distance:.3f}" if mean_distance is not None else None,
-            "std_distance": f"{std_distance:.3f}" if std_distance is not None else None,
-            "intersection_area": f"{shaper_result['intersection_area']:.3f}",
-            "union_area": f"{shaper_result['union_area']:.3f}",
-            "iou": f"{shaper_result['iou']:.3f}",
-            "angle_std_prev": f"{angle_analysis['std_prev']:.3f}",
-            "angle_mean_curr": f"{angle_analysis['mean_curr']:.3f}",
-            "angle_std_curr": f"{angle_analysis['std_curr']:.3f}",
-            "angle_mse": f"{angle_analysis['mse']:.3f}",
-            "similarity_score": f"{angle_analysis['similarity_score']:.3f}",
-            "min_freq": f"{fourier_result['min_freq']:.3f}",
-            "max_freq": f"{fourier_result['max_freq']:.3f}",
-            "mean_magnitude_prev": f"{fourier_result['mean_magnitude_prev']:.3f}",
-            "max_magnitude_prev": f"{fourier_result['max_magnitude_prev']:.3f}",
-            "mean_magnitude_curr": f"{fourier_result['mean_magnitude_curr']:.3f}",
-            "max_magnitude_curr": f"{fourier_result['max_magnitude_curr']:.3f}",
-            "same_series_value": same_series_value
-        })
+            "mean_distance": float(mean_distance),
+            "std_distance": float(std_distance),
+        }
+        if "polygons" not in skipped_groups:
+            row.update({
+                "intersection_area": float(shaper_result['intersection_area']),
+                "union_area": float(shaper_result['union_area']),
+                "iou": float(shaper_result['iou']),
+            })
+        if "angles" not in skipped_groups:
+            row.update({
+                "angle_std_prev": float(angle_analysis['std_prev']),
+                "angle_mean_curr": float(angle_analysis['mean_curr']),
+                "angle_std_curr": float(angle_analysis['std_curr']),
+                "angle_mse": float(angle_analysis['mse']),
+                "similarity_score": float(angle_analysis['similarity_score']),
+            })
+        if "fourier" not in skipped_groups:
+            row.update({
+                "min_freq": float(fourier_result['min_freq']),
+                "max_freq": float(fourier_result['max_freq']),
+                "mean_magnitude_prev": float(fourier_result['mean_magnitude_prev']),
+                "max_magnitude_prev": float(fourier_result['max_magnitude_prev']),
+                "mean_magnitude_curr": float(fourier_result['mean_magnitude_curr']),
+                "max_magnitude_curr": float(fourier_result['max_magnitude_curr']),
+            })
+        row["same_series_value"] = int(same_series_value) if same_series_value is not None else None
+        if alignment_result:  # Hizalama özellikleri etiket sütunundan önce gelir
+            label = row.pop(LABEL_COLUMN)
+            row.update({column: float(value) for column, value in alignment_result.items()})
+            row[LABEL_COLUMN] = label
+        return row
+
+    def to_frame(self):
+        """
+        Tabloyu DataFrame olarak döndürür; ModelTrainer.preprocess_data'ya doğrudan verilebilir.
+        Özellikler float64'tür; etiket sütunu tüm satırlar etiketliyse int64, değilse eksikler NaN olan float64'tür.
+        Etiket sütunu her zaman son sütundur (preprocess_data hedefi son sayısal sütun olarak alır).
+        """
+        n = self._size
+        data = {"file_name": list(self._file_names)}
+        for column in self.columns:
+            data[column] = self._features[column][:n].copy()
+        if self._label_mask[:n].all():
+            data[LABEL_COLUMN] = self._labels[:n].copy()
+        else:
+            data[LABEL_COLUMN] = np.where(self._label_mask[:n], self._labels[:n], np.nan)
+        return pd.DataFrame(data)
+
+    def save_results(self, output_path, file_format=None):
+        """
+        Sonuçları verilen biçimde kaydeder; biçim verilmezse dosya uzantısından anlaşılır.
+        Parquet ve Arrow IPC aynı şemayı tam hassasiyetle yazar (pyarrow gerekir); CSV 3 basamaklı dışa aktarımdır.
+        """
+        file_format = file_format or _format_from_path(output_path)
+        if file_format == "csv":
+            return self.save_results_to_csv(output_path)
+        pyarrow = _require_pyarrow(file_format)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with stage(f"{file_format}_write"):
+            table = pyarrow.Table.from_pandas(self.to_frame(), preserve_index=False)
+            if file_format == "parquet":
+                import pyarrow.parquet as pq
+                pq.write_table(table, output_path)
+            else:
+                import pyarrow.feather as feather
+                feather.write_feather(table, output_path, compression="uncompressed")
+        logger.debug("Sonuçlar %s dosyasına kaydedildi.", output_path)
 
     def save_results_to_csv(self, output_path):
-        """Sonuçları CSV dosyasına kaydeder"""
-        pd.DataFrame(self.results).to_csv(output_path, index=False)
-        print(f"Sonuçlar {output_path} dosyasına kaydedildi.")
+        """Sonuçları sayısal değerler 3 basamağa yuvarlanmış olarak CSV dosyasına kaydeder"""
+        with stage("csv_write"):
+            self.to_frame().to_csv(output_path, index=False, float_format="%.3f")
+        logger.debug("Sonuçlar %s dosyasına kaydedildi.", output_path)
+
+    @staticmethod # save_results ile yazılmış bir sonuç tablosunu DataFrame olarak okur.
+    def load_results(input_path, file_format=None):
+        file_format = file_format or _format_from_path(input_path)
+        if file_format == "csv":
+            return pd.read_csv(input_path)
+        _require_pyarrow(file_format)
+        if file_format == "parquet":
+            return pd.read_parquet(input_path)
+        return pd.read_feather(input_path)
+
+# Sonuç biçiminin yazılabildiğini çalışma başında doğrular; parquet/arrow için pyarrow yoksa ImportError verir.
+def check_results_format(file_format):
+    if file_format not in RESULT_FORMATS:
+        raise ValueError(f"Geçersiz sonuç biçimi: {file_format}. {RESULT_FORMATS} biçimlerinden biri kullanılmalıdır.")
+    if file_format != "csv":
+        _require_pyarrow(file_format)
+
+def _format_from_path(path):
+    extension = os.path.splitext(path)[1].lower()
+    formats = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+    if extension not in formats:
+        raise ValueError(f"Sonuç dosyası biçimi anlaşılamadı: {path}. {RESULT_FORMATS} biçimlerinden biri kullanılmalıdır.")
+    return formats[extension]
+
+def _require_pyarrow(file_format):
+    """Parquet/Arrow yazmak için pyarrow'u yükler; kurulu değilse anlaşılır bir hata verir."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(f"'{file_format}' biçimi için pyarrow gereklidir (pip install pyarrow) "
+                          f"ya da csv biçimini kullanın.") from e
+    return pyarrow
@@ -0,0 +1,233 @@
+"""
+Bilinen kesim serilerinin şekil imzalarını tutan en yakın komşu indeksi.
+
+Her kontür sabit uzunlukta bir imzaya çevrilir:
+    - yay uzunluğuna göre n_samples noktaya yeniden örneklenmiş, merkezlenmiş ve ölçeklenmiş (x, y) noktaları
+    - aynı noktalardan hesaplanan n_harmonics Fourier tanımlayıcısı (|Z(k)| / |Z(1)|; dönme ve başlangıç
+      noktasından bağımsız)
+Yeni bir kesim, indeksteki imzalara olan Öklid uzaklığına göre en yakın k seriyle eşleştirilir.
+
+Kullanım (depo kök dizininden):
+    python -m series_index build data/ results/index/series_index.npz
+    python -m series_index query results/index/series_index.npz unlabeled_data/veriler-x-1.csv -k 5
+"""
+from shape_analyzer import resample_contour, fourier_descriptors
+from utils.file_loader import FileLoader, load_data
+from scipy.spatial import cKDTree
+import numpy as np
+import scipy.fft
+import argparse
+import logging
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+INDEX_ENGINES = ("auto", "kdtree", "brute")  # auto: imza boyutu küçükse kdtree, değilse brute
+KDTREE_MAX_DIMENSIONS = 16  # Bu boyutun üzerinde KD-ağacı kaba kuvvetten yavaşlar
+_BRUTE_BLOCK_ELEMENTS = 8_000_000  # Kaba kuvvet aramasında bir blokta hesaplanan en fazla (float64) uzaklık sayısı
+
+# Kontürlerin sabit uzunluktaki şekil imzalarını toplu olarak hesaplar.
+def shape_signatures(contours, n_samples=32, n_harmonics=8, descriptor_weight=1.0):
+    """
+    :param contours: Her biri (N_i, 2) olan nokta dizileri (en az 3 nokta)
+    :param descriptor_weight: Fourier tanımlayıcılarının uzaklıktaki ağırlığı (0: yalnızca noktalar)
+    :return: (len(contours), 2 * n_samples + n_harmonics) float32 imza dizisi
+    """
+    if n_harmonics >= n_samples:
+        raise ValueError("n_harmonics, n_samples'tan küçük olmalıdır.")
+    resampled = np.empty((len(contours), n_samples, 2))
+    for index, points in enumerate(contours):
+        if len(points) < 3:
+            raise ValueError(f"İmza için en az 3 nokta gerekir (kontür {index}: {len(points)} nokta).")
+        resampled[index] = resample_contour(points, n_samples)
+
+    # Öteleme ve ölçekten bağımsız olmak için merkezlenir ve RMS yarıçapına bölünür
+    centered = resampled - resampled.mean(axis=1, keepdims=True)
+    scale = np.sqrt((centered ** 2).sum(axis=2).mean(axis=1))
+    centered /= np.where(scale > 0, scale, 1.0)[:, None, None]
+
+    # Tüm kontürler aynı uzunlukta olduğundan tanımlayıcılar tek bir karmaşık FFT çağrısıyla hesaplanır;
+    # özellik çıkarımındaki Fourier tanımlayıcılarıyla aynı fonksiyon kullanılır (|Z(1)| = 0 ise 0)
+    spectrum = scipy.fft.fft(centered[:, :, 0] + 1j * centered[:, :, 1], axis=1)
+    descriptors = np.nan_to_num(fourier_descriptors(spectrum, n_harmonics), nan=0.0)
+
+    return np.hstack((centered.reshape(len(contours), -1), descriptor_weight * descriptors)).astype(np.float32)
+
+class SeriesIndex:  # Seri adlarını ve şekil imzalarını tutar; yeni kontürler için en yakın k seriyi bulur.
+    def __init__(self, n_samples=32, n_harmonics=8, descriptor_weight=1.0, engine="auto"):
+        """
+        :param engine: 'kdtree' (scipy cKDTree), 'brute' (NumPy ile bloklar halinde toplu uzaklık) veya 'auto'
+        """
+        if engine not in INDEX_ENGINES:
+            raise ValueError(f"Geçersiz indeks motoru: {engine}. {INDEX_ENGINES} değerlerinden biri olmalıdır.")
+        self.n_samples = n_samples
+        self.n_harmonics = n_harmonics
+        self.descriptor_weight = descriptor_weight
+        self.engine = engine
+        self.names = []
+        self._blocks = []  # build'e kadar eklenen imza blokları
+        self._signatures = np.empty((0, 2 * n_samples + n_harmonics), dtype=np.float32)
+        self._squared_norms = None
+        self._brute_signatures = None  # Kaba kuvvet aramasında kullanılan float64 kopya
+        self._tree = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def signatures(self, contours):
+        """İndeksin ayarlarıyla kontürlerin imzalarını hesaplar."""
+        return shape_signatures(contours, self.n_samples, self.n_harmonics, self.descriptor_weight)
+
+    def add(self, names, contours):
+        """Serileri (ad, kontür) olarak indekse ekler; arama yapısı bir sonraki sorguda yeniden kurulur."""
+        names = list(names)
+        if len(names) != len(contours):
+            raise ValueError("Ad ve kontür sayıları aynı olmalıdır.")
+        if names:
+            self._blocks.append(self.signatures(contours))
+            self.names.extend(names)
+            self._tree = None
+            self._squared_norms = None
+            self._brute_signatures = None
+
+    def _resolved_engine(self):
+        if self.engine != "auto":
+            return self.engine
+        return "kdtree" if self._signatures.shape[1] <= KDTREE_MAX_DIMENSIONS else "brute"
+
+    def build(self):
+        """Eklenen imzaları tek bir diziye toplar ve seçilen motorun arama yapısını kurar."""
+        if self._blocks:
+            self._signatures = np.vstack([self._signatures] + self._blocks)
+            self._blocks = []
+        if self._resolved_engine() == "kdtree":
+            self._tree = cKDTree(self._signatures)
+        else:
+            # Birbirine çok yakın imzalarda float32 açılım ciddi sadeleşme (cancellation) hatası verir
+            self._brute_signatures = self._signatures.astype(np.float64)
+            self._squared_norms = np.einsum("ij,ij->i", self._brute_signatures, self._brute_signatures)
+
+    def query(self, contours, k=5):
+        """
+        Her kontür için en yakın k seriyi bulur.
+        :return: (distances, indices) -> (len(contours), k) diziler; indices self.names'e göredir
+        """
+        return self.query_signatures(self.signatures(contours), k)
+
+    def query_signatures(self, signatures, k=5):
+        """Hazır imzalarla arama yapar; imzalar bu indeksin ayarlarıyla hesaplanmış olmalıdır."""
+        if self._blocks or (self._tree is None and self._squared_norms is None):
+            self.build()
+        if len(self) == 0:
+            raise ValueError("İndeks boş.")
+        k = min(k, len(self))
+        signatures = np.asarray(signatures, dtype=np.float32)
+        if self._tree is not None:
+            distances, indices = self._tree.query(signatures, k=k)
+            return distances.reshape(len(signatures), k), indices.reshape(len(signatures), k)
+        return self._brute_query(signatures, k)
+
+    def _brute_query(self, signatures, k):
+        """
+        ||q - s||² = ||q||² + ||s||² - 2 q·s ile sorguları bloklar halinde tek matris çarpımıyla çözer.
+        Açılım float64'te yapılır; float32'de neredeyse aynı imzaların uzaklıkları yuvarlama hatasında kaybolur.
+        """
+        signatures = signatures.astype(np.float64)
+        n_queries = len(signatures)
+        distances = np.empty((n_queries, k), dtype=np.float64)
+        indices = np.empty((n_queries, k), dtype=np.int64)
+        block = max(1, _BRUTE_BLOCK_ELEMENTS // len(self))
+        for start in range(0, n_queries, block):
+            queries = signatures[start:start + block]
+            squared = (np.einsum("ij,ij->i", queries, queries)[:, None] + self._squared_norms[None, :]
+                       - 2.0 * queries @ self._brute_signatures.T)
+            np.maximum(squared, 0, out=squared)  # Yuvarlama hatasından kaynaklanan küçük negatifler
+            nearest = np.argpartition(squared, k - 1, axis=1)[:, :k] if k < len(self) else \
+                np.broadcast_to(np.arange(len(self)), squared.shape).copy()
+            nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+            order = np.argsort(nearest_squared, axis=1)
+            indices[start:start + block] = np.take_along_axis(nearest, order, axis=1)
+            distances[start:start + block] = np.sqrt(np.take_along_axis(nearest_squared, order, axis=1))
+        return distances, indices
+
+    def nearest(self, contour, k=5):
+        """Tek bir kontür için [(seri adı, uzaklık)] listesi döndürür."""
+        distances, indices = self.query([contour], k)
+        return [(self.names[i], float(d)) for d, i in zip(distances[0], indices[0])]
+
+    def save(self, path):
+        """İndeksi (adlar, imzalar ve ayarlar) tek bir .npz dosyasına kaydeder."""
+        self.build()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, names=np.array(self.names, dtype=str), signatures=self._signatures,
+                 options=np.array([self.n_samples, self.n_harmonics, self.descriptor_weight]), engine=self.engine)
+        os.replace(tmp_path, path)
+        logger.info("Seri indeksi kaydedildi: %s (%d seri)", path, len(self))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            n_samples, n_harmonics, descriptor_weight = data["options"].tolist()
+            index = cls(int(n_samples), int(n_harmonics), descriptor_weight, engine=str(data["engine"]))
+            index.names = data["names"].tolist()
+            index._signatures = data["signatures"]
+        index.build()
+        return index
+
+    @classmethod
+    def from_files(cls, file_paths, column="prev", **options):
+        """
+        Kesim dosyalarından indeks kurar; her dosya adı bir seri olarak eklenir.
+        :param column: İndekse eklenecek kontür: 'prev' veya 'curr'
+        """
+        index = cls(**options)
+        names, contours = [], []
+        for file_path in file_paths:
+            prev_points, curr_points = load_data(file_path)
+            points = prev_points if column == "prev" else curr_points
+            if len(points) < 3:
+                logger.warning("%s: kontürde 3'ten az nokta var, indekse eklenmedi.", os.path.basename(file_path))
+                continue
+            names.append(os.path.basename(file_path))
+            contours.append(points)
+        index.add(names, contours)
+        index.build()
+        return index
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kesim serileri için en yakın komşu indeksi.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Klasördeki (veya arşivdeki) dosyalardan indeks kur")
+    build_parser.add_argument("directory")
+    build_parser.add_argument("index")
+    build_parser.add_argument("--column", choices=["prev", "curr"], default="prev")
+    build_parser.add_argument("--samples", type=int, default=32)
+    build_parser.add_argument("--harmonics", type=int, default=8)
+    build_parser.add_argument("--engine", choices=INDEX_ENGINES, default="auto")
+    query_parser = subparsers.add_parser("query", help="Dosyaların curr kontürüne en yakın serileri bul")
+    query_parser.add_argument("index")
+    query_parser.add_argument("files", nargs="+")
+    query_parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "build":
+        index = SeriesIndex.from_files(FileLoader(args.directory).iter_file_paths(), column=args.column,
+                                       n_samples=args.samples, n_harmonics=args.harmonics, engine=args.engine)
+        index.save(args.index)
+        return
+
+    index = SeriesIndex.load(args.index)
+    for file_path in args.files:
+        _, curr_points = load_data(file_path)
+        start = time.perf_counter()
+        matches = index.nearest(curr_points, args.k)
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info("%s (%.2f ms):", os.path.basename(file_path), elapsed)
+        for name, distance in matches:
+            logger.info("    %-40s %.4f", name, distance)
+
+if __name__ == "__main__":
+    main()
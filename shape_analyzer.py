@@ -1,44 +1,285 @@
-from shapely.geometry import Polygon
-import matplotlib.pyplot as plt
+from cut_pair import CutPair, magnitude_spectra
+import shapely
 import numpy as np
-from scipy.fft import fft
-import os
+from utils.instrumentation import stage
+import logging
+
+logger = logging.getLogger(__name__)
+
+IOU_MODES = ("exact", "raster")  # IoU hesaplama modları: shapely ile kesin / ızgara üzerinde yaklaşık
+
+# Çok sayıda dosyanın poligon IoU değerlerini shapely 2'nin vektörel fonksiyonlarıyla tek çağrıda hesaplar.
+def batch_iou(prev_list, curr_list):
+    """
+    :param prev_list: Her biri (N_i, 2) olan prev nokta dizileri
+    :param curr_list: Her biri (M_i, 2) olan curr nokta dizileri
+    :return: (intersection_area, union_area, iou, valid) dizileri; valid False olan dosyalar
+             analyze_data'da atlanacak dosyalardır (3'ten az nokta veya düzeltilemeyen poligon)
+    """
+    n_files = len(prev_list)
+    intersection_area = np.full(n_files, np.nan)
+    union_area = np.full(n_files, np.nan)
+    iou = np.full(n_files, np.nan)
+    valid = np.array([len(p) >= 3 and len(c) >= 3 for p, c in zip(prev_list, curr_list)], dtype=bool)
+    if not valid.any():
+        return intersection_area, union_area, iou, valid
+
+    def build(points_list):
+        coords = np.concatenate(points_list).astype(float)
+        indices = np.repeat(np.arange(len(points_list)), [len(points) for points in points_list])
+        geometries = shapely.polygons(shapely.linearrings(coords, indices=indices))
+        invalid = ~shapely.is_valid(geometries)
+        if invalid.any():
+            geometries[invalid] = shapely.buffer(geometries[invalid], 0)  # Küçük topolojik hataları düzeltir
+        return geometries
+
+    selected = np.flatnonzero(valid)
+    prev_polygons = build([prev_list[i] for i in selected])
+    curr_polygons = build([curr_list[i] for i in selected])
+    fixed = shapely.is_valid(prev_polygons) & shapely.is_valid(curr_polygons)
+    valid[selected[~fixed]] = False
+
+    # Birleşim alanı ayrı bir overlay yerine alan(A) + alan(B) - alan(A∩B) ile bulunur
+    inter = shapely.area(shapely.intersection(prev_polygons, curr_polygons))
+    union = shapely.area(prev_polygons) + shapely.area(curr_polygons) - inter
+    intersection_area[selected] = inter
+    union_area[selected] = union
+    with np.errstate(divide="ignore", invalid="ignore"):
+        iou[selected] = np.where(union > 0, inter / np.where(union > 0, union, 1), 0.0)
+    intersection_area[~valid] = union_area[~valid] = iou[~valid] = np.nan
+    return intersection_area, union_area, iou, valid
+
+# Kontürü yay uzunluğu boyunca eşit aralıklı n_samples noktaya yeniden örnekler.
+def resample_contour(points, n_samples, closed=True):
+    """
+    Nokta yoğunluğu farklı kontürleri karşılaştırılabilir hale getirir.
+    :param closed: True ise son noktadan ilk noktaya dönen kenar da yola dahil edilir
+    :return: (n_samples, 2) float dizisi
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) == 0:
+        raise ValueError("Boş kontür yeniden örneklenemez.")
+    path = np.vstack((points, points[:1])) if closed else points
+    segment_lengths = np.hypot(*np.diff(path, axis=0).T)
+    cumulative = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+    total = cumulative[-1]
+    if total == 0:  # Tüm noktalar aynı yerde
+        return np.repeat(points[:1], n_samples, axis=0)
+    targets = np.linspace(0.0, total, n_samples, endpoint=not closed)
+    return np.column_stack((np.interp(targets, cumulative, path[:, 0]), np.interp(targets, cumulative, path[:, 1])))
+
+# Kontürleri özellik çıkarımından önce sadeleştirir ve/veya sabit sayıda noktaya yeniden örnekler.
+def normalize_contours(contours, n_samples=None, simplify_tolerance=None):
+    """
+    Douglas–Peucker sadeleştirmesi (shapely.simplify) tüm kontürler için tek çağrıda yapılır; ardından her kontür
+    yay uzunluğu boyunca n_samples eşit aralıklı noktaya örneklenir. Böylece prev ve curr aynı uzunlukta olur
+    ve dosya başına maliyet ham nokta sayısından bağımsızlaşır.
+    3'ten az noktalı kontürler olduğu gibi bırakılır (analizlerde zaten atlanırlar).
+    :param n_samples: Örneklenecek nokta sayısı; None ise yeniden örnekleme yapılmaz
+    :param simplify_tolerance: Sadeleştirme toleransı (koordinat biriminde); None veya 0 ise sadeleştirme yapılmaz
+    :return: Kontür listesi
+    """
+    contours = list(contours)
+    selected = [i for i, points in enumerate(contours) if len(points) >= 3]
+    if simplify_tolerance and selected:
+        coords = np.concatenate([contours[i] for i in selected]).astype(float)
+        indices = np.repeat(np.arange(len(selected)), [len(contours[i]) for i in selected])
+        lines = shapely.simplify(shapely.linestrings(coords, indices=indices), simplify_tolerance,
+                                 preserve_topology=False)
+        for i, line in zip(selected, lines):
+            simplified = shapely.get_coordinates(line)
+            if len(simplified) >= 3:  # Doğruya indirgenen kontürler sadeleştirilmeden bırakılır
+                contours[i] = simplified
+    if n_samples:
+        for i in selected:
+            contours[i] = resample_contour(contours[i], n_samples)
+    return contours
+
+# Kontürün öteleme, ölçek, dönme ve başlangıç noktasından bağımsız Fourier tanımlayıcılarını döndürür.
+def fourier_descriptors(spectrum, n_harmonics):
+    """
+    Tanımlayıcılar |Z(k)| / |Z(1)| (k = 1..n_harmonics) oranlarıdır; kontür kısa olduğu için
+    hesaplanamayan harmonikler ve |Z(1)| = 0 olan kontürlerin tanımlayıcıları NaN olur.
+    :param spectrum: (N,) karmaşık spektrum ya da aynı uzunluktaki kontürlerin (M, N) spektrumları
+    :return: (n_harmonics,) veya (M, n_harmonics) dizi
+    """
+    spectrum = np.asarray(spectrum)
+    descriptors = np.full(spectrum.shape[:-1] + (n_harmonics,), np.nan)
+    available = min(n_harmonics, spectrum.shape[-1] - 1)
+    if available <= 0:
+        return descriptors
+    amplitudes = np.abs(spectrum[..., 1:available + 1])
+    first = amplitudes[..., :1]
+    np.divide(amplitudes, first, out=descriptors[..., :available], where=first > 0)
+    return descriptors
+
+# Çok sayıda dosyanın (prev, curr) kontür çiftinden apply_fourier_transform ile aynı özet özellikleri toplu hesaplar.
+def batch_fourier_transform(pairs, n_descriptors=0, workers=None, keep_spectra=()):
+    """
+    :param pairs: CutPair nesneleri veya (prev_points, curr_points) çiftleri; spektrumu henüz hesaplanmamış
+                  CutPair'lerin FFT'si tek toplu çağrıda yapılır ve sonuç CutPair'de saklanır
+    :param n_descriptors: > 0 ise her sonuca 'descriptors_prev' ve 'descriptors_curr' Fourier tanımlayıcıları eklenir
+    :param workers: scipy.fft'nin kullanacağı iş parçacığı sayısı
+    :param keep_spectra: Çizim için frekans ve büyüklük spektrumları da döndürülecek çiftlerin sıra numaraları
+    :return: Her çift için özet sözlüğü; keep_spectra'daki çiftlerde 'freq', 'magnitude_prev', 'magnitude_curr' de bulunur
+    """
+    pairs = [pair if isinstance(pair, CutPair) else CutPair(*pair) for pair in pairs]
+    missing = [pair for pair in pairs if not pair.computed("spectra")]
+    with stage("fft"):
+        magnitudes, spectra = magnitude_spectra([points for pair in missing for points in (pair.prev, pair.curr)],
+                                                workers)
+    for index, pair in enumerate(missing):
+        pair.set_spectra(magnitudes[2 * index], magnitudes[2 * index + 1], spectra[2 * index], spectra[2 * index + 1])
+
+    results = []
+    freq_cache = {}
+    for index, pair in enumerate(pairs):
+        magnitude_prev, magnitude_curr, z_prev, z_curr = pair.spectra
+        n = len(magnitude_prev)
+        if n not in freq_cache:
+            freq_cache[n] = np.fft.fftfreq(n)
+        freq = freq_cache[n]
+        summary = {
+            "min_freq": freq.min(),
+            "max_freq": freq.max(),
+            "mean_magnitude_prev": np.mean(magnitude_prev),
+            "max_magnitude_prev": np.max(magnitude_prev),
+            "mean_magnitude_curr": np.mean(magnitude_curr),
+            "max_magnitude_curr": np.max(magnitude_curr)
+        }
+        if n_descriptors > 0:
+            summary["descriptors_prev"] = fourier_descriptors(z_prev, n_descriptors)
+            summary["descriptors_curr"] = fourier_descriptors(z_curr, n_descriptors)
+        if index in keep_spectra:
+            summary.update(freq=freq, magnitude_prev=magnitude_prev, magnitude_curr=magnitude_curr)
+        results.append(summary)
+    return results
+
+# Poligonun ızgara hücre merkezlerini içerip içermediğini sıfır olmayan sarım (nonzero winding) kuralıyla bulur.
+def _rasterize(points, x_origin, y_origin, cell, n_cols, n_rows):
+    """
+    Tarama satırı yöntemi: yalnızca kenarların gerçekten kestiği satırlar için kesişim üretilir,
+    böylece maliyet satır x kenar yerine çevre/hücre boyutu ile orantılıdır.
+    Kendini kesen kontürlerde de buffer(0) ile düzeltilmiş poligona yakın sonuç verir.
+    :return: (n_rows, n_cols) boyutlu bool maske
+    """
+    start = np.asarray(points, dtype=float)
+    end = np.roll(start, -1, axis=0)
+    x0, y0, x1, y1 = start[:, 0], start[:, 1], end[:, 0], end[:, 1]
+
+    # Her kenarın kestiği satır aralığı: hücre merkezi y değeri [min(y0, y1), max(y0, y1)) içinde kalan satırlar
+    low, high = np.minimum(y0, y1), np.maximum(y0, y1)
+    first_row = np.clip(np.ceil((low - y_origin) / cell - 0.5), 0, n_rows).astype(np.int64)
+    last_row = np.clip(np.ceil((high - y_origin) / cell - 0.5), 0, n_rows).astype(np.int64)
+    n_crossings = last_row - first_row
+    edge = np.repeat(np.arange(len(start)), n_crossings)
+    offsets = np.cumsum(n_crossings) - n_crossings
+    rows = first_row[edge] + (np.arange(len(edge)) - offsets[edge])
+
+    row_y = y_origin + (rows + 0.5) * cell
+    x_cross = x0[edge] + (row_y - y0[edge]) * (x1[edge] - x0[edge]) / (y1[edge] - y0[edge])
+    winding = np.where(y1[edge] > y0[edge], 1, -1)
+
+    # Kesişimler (satır, x) sırasına dizilir; kapalı bir kontürde her satırın sarım toplamı sıfır olduğundan
+    # tek bir küresel kümülatif toplam her hücrenin solundaki sarım sayısını verir
+    x_low = min(x_origin, x0.min()) - 1
+    stride = max(x_origin + n_cols * cell, x0.max()) - x_low + 1
+    keys = rows * stride + (x_cross - x_low)
+    order = np.argsort(keys)
+    keys = keys[order]
+    cumulative = np.concatenate(([0], np.cumsum(winding[order])))
+
+    cell_x = x_origin + (np.arange(n_cols) + 0.5) * cell - x_low
+    queries = np.arange(n_rows)[:, None] * stride + cell_x[None, :]
+    return cumulative[np.searchsorted(keys, queries)] != 0
+
+# İki poligonun IoU değerini tolerance boyutundaki hücrelerden oluşan bir ızgara üzerinde yaklaşık olarak hesaplar.
+def raster_iou(prev_points, curr_points, tolerance=1.0, max_cells=4_000_000):
+    """
+    Kesin overlay yerine hücre sayımıyla alan hesaplar; hata hücre boyutuyla (tolerance) orantılıdır.
+    Hücre sayısı max_cells'i aşarsa hücre boyutu büyütülür.
+    :return: (intersection_area, union_area, iou)
+    """
+    prev = np.asarray(prev_points, dtype=float)
+    curr = np.asarray(curr_points, dtype=float)
+    both = np.concatenate((prev, curr))
+    x_min, y_min = both.min(axis=0)
+    x_max, y_max = both.max(axis=0)
+    width, height = max(x_max - x_min, tolerance), max(y_max - y_min, tolerance)
+    cell = max(tolerance, np.sqrt(width * height / max_cells))
+
+    n_cols, n_rows = int(np.ceil(width / cell)), int(np.ceil(height / cell))
+    prev_mask = _rasterize(prev, x_min, y_min, cell, n_cols, n_rows)
+    curr_mask = _rasterize(curr, x_min, y_min, cell, n_cols, n_rows)
+
+    cell_area = cell * cell
+    intersection_area = np.count_nonzero(prev_mask & curr_mask) * cell_area
+    union_area = np.count_nonzero(prev_mask | curr_mask) * cell_area
+    iou = intersection_area / union_area if union_area > 0 else 0
+    return intersection_area, union_area, iou
 
 class ShaperAnalysis:
-    def __init__(self, prev_points, curr_points, file_name, output_path):
-        """Nokta verilerini alır ve analizi yapar."""
-        self.prev_points = prev_points
-        self.curr_points = curr_points
-        self.file_name = file_name
+    def __init__(self, cut, output_path=None, renderer=None, iou_mode="exact", iou_tolerance=1.0):
+        """
+        Bir dosyanın CutPair kaydını alır ve analizi yapar; poligonlar ve spektrumlar CutPair'de saklandığından
+        aynı kaydı kullanan diğer analizlerle paylaşılır.
+        renderer verilirse (PlotRenderer veya PlotCollector) grafikler ona iş olarak gönderilir;
+        None ise hiçbir grafik çizilmez ve yalnızca özellikler hesaplanır.
+        iou_mode 'raster' ise IoU, iou_tolerance boyutundaki hücrelerle yaklaşık hesaplanır.
+        """
+        if iou_mode not in IOU_MODES:
+            raise ValueError(f"Geçersiz IoU modu: {iou_mode}. {IOU_MODES} değerlerinden biri olmalıdır.")
+        self.cut = cut
+        self.file_name = cut.file_name
         self.output_path = output_path
+        self.renderer = renderer
+        self.iou_mode = iou_mode
+        self.iou_tolerance = iou_tolerance
+
+    @property
+    def prev_points(self):
+        return self.cut.prev
+
+    @property
+    def curr_points(self):
+        return self.cut.curr
 
     def analyze_data(self):
         # Nokta sayısını kontrol et
         if len(self.prev_points) < 3 or len(self.curr_points) < 3:
-            print(f"{self.file_name} dosyasında geçerli nokta yok. Atlanıyor.")
+            logger.warning("%s dosyasında geçerli nokta yok. Atlanıyor.", self.file_name)
             return None  # En az 3 nokta olması gerekir
 
-        # Poligonları oluşturma
-        prev_polygon = Polygon(self.prev_points)
-        curr_polygon = Polygon(self.curr_points)
+        if self.iou_mode == "raster":
+            # Yaklaşık mod: overlay yapılmaz, poligonlar ızgara üzerinde sıfır olmayan sarım kuralıyla sayılır
+            if self.renderer is not None:
+                self.plot_polygons()
+            with stage("polygon_ops", self.file_name):
+                intersection_area, union_area, iou = raster_iou(self.prev_points, self.curr_points, self.iou_tolerance)
+            return {
+                "file_name": self.file_name,
+                "intersection_area": intersection_area,
+                "union_area": union_area,
+                "iou": iou,
+            }
 
-        # Poligonların geçerliliğini kontrol et ve düzelt
-        if not prev_polygon.is_valid:
-            prev_polygon = prev_polygon.buffer(0)  # Küçük topolojik hataları düzeltir
-        if not curr_polygon.is_valid:
-           curr_polygon = curr_polygon.buffer(0)
+        with stage("polygon_ops", self.file_name):
+            # Poligonlar CutPair'de bir kez oluşturulur; geçersiz olanlar buffer(0) ile düzeltilmiştir
+            prev_polygon, curr_polygon = self.cut.polygons
 
         # Poligonların geçerliliğini kontrol et
         if not prev_polygon.is_valid or not curr_polygon.is_valid:
-            print(f"{self.file_name} dosyasındaki poligonlar geçersiz. Atlanıyor.")
+            logger.warning("%s dosyasındaki poligonlar geçersiz. Atlanıyor.", self.file_name)
             return None
 
-        # Poligonları çizme
-        self.plot_polygons()
+        # Poligonları çizme (yalnızca çizim açıksa, arka plandaki kuyruğa gönderilir)
+        if self.renderer is not None:
+            self.plot_polygons()
 
-        # Kesişim ve birleşim alanlarını hesaplama
-        intersection_area = prev_polygon.intersection(curr_polygon).area
-        union_area = prev_polygon.union(curr_polygon).area
+        # Kesişim alanını hesaplama; birleşim alanı ikinci bir overlay yerine alan(A) + alan(B) - alan(A∩B) ile bulunur
+        with stage("polygon_ops", self.file_name):
+            intersection_area = prev_polygon.intersection(curr_polygon).area
+            union_area = prev_polygon.area + curr_polygon.area - intersection_area
 
         # IoU'yu hesaplama
         iou = intersection_area / union_area if union_area > 0 else 0
@@ -51,88 +292,22 @@ class ShaperAnalysis:
         }
 
     def plot_polygons(self):
-        """Poligonları çizen fonksiyon."""
-        x_prev, y_prev = zip(*self.prev_points)
-        x_curr, y_curr = zip(*self.curr_points)
-
-        plt.figure()
-        plt.fill(x_prev, y_prev, alpha=0.5, label='Eski Kesim', color='blue')
-        plt.fill(x_curr, y_curr, alpha=0.5, label='Yeni Kesim', color='orange')
-        plt.plot(x_prev, y_prev, color='blue')
-        plt.plot(x_curr, y_curr, color='orange')
-        plt.legend()
-        plt.title(f"{self.file_name}")
-        plt.xlabel("X Koordinatları")
-        plt.ylabel("Y Koordinatları")
-        plt.grid(True)
-
-        file_base_name = os.path.splitext(self.file_name)[0]
-        output_dir = os.path.join(self.output_path,"plots", f"{file_base_name}_plot.png")  # Yeni dosya adı
-        # Grafiği belirtilen dosya yoluna kaydet
-        plt.savefig(output_dir, bbox_inches='tight')  # Kaydetme işlemi
-        print(f"Poligon grafiği kaydedildi: {self.output_path}")
-        plt.close()
-
-    def apply_fourier_transform(self):
-        """Prev ve Curr noktaları için Fourier dönüşümü uygular ve görselleştirir."""
-        prev_x = [p[0] for p in self.prev_points]
-        prev_y = [p[1] for p in self.prev_points]
-        curr_x = [c[0] for c in self.curr_points]
-        curr_y = [c[1] for c in self.curr_points]
-
-        # Fourier dönüşümü
-        fft_prev_x = fft(prev_x)
-        fft_prev_y = fft(prev_y)
-        fft_curr_x = fft(curr_x)
-        fft_curr_y = fft(curr_y)
-
-        # Fourier dönüşümünün büyüklük spektrumlarını hesapla
-        magnitude_prev = np.sqrt(np.abs(fft_prev_x) ** 2 + np.abs(fft_prev_y) ** 2)
-        magnitude_curr = np.sqrt(np.abs(fft_curr_x) ** 2 + np.abs(fft_curr_y) ** 2)
-
-        # Frekans ekseni
-        freq = np.fft.fftfreq(len(prev_x))
-        summary = {
-            "min_freq": freq.min(),
-            "max_freq": freq.max(),
-            "mean_magnitude_prev": np.mean(magnitude_prev),
-            "max_magnitude_prev": np.max(magnitude_prev),
-            "mean_magnitude_curr": np.mean(magnitude_curr),
-            "max_magnitude_curr": np.max(magnitude_curr)
-        }
+        """Poligon çizimini renderer kuyruğuna gönderir; çizim ve kaydetme arka planda yapılır."""
+        self.renderer.submit("polygons", self.output_path, self.file_name, self.prev_points, self.curr_points)
+
+    def apply_fourier_transform(self, n_descriptors=0):
+        """
+        Prev ve Curr noktaları için Fourier dönüşümü uygular; çizim açıksa spektrumları görselleştirir.
+        Hesap batch_fourier_transform ile tek çiftlik bir toplu iş olarak yapılır; spektrum CutPair'de zaten
+        varsa (ör. toplu işte hesaplandıysa) FFT tekrarlanmaz.
+        """
+        plot = self.renderer is not None
+        summary = batch_fourier_transform([self.cut], n_descriptors, keep_spectra={0} if plot else ())[0]
 
-        # Görselleştirme
-        plt.figure(figsize=(12, 6))
-
-        # Prev noktaları için Fourier büyüklük spektrumu
-        plt.subplot(1, 2, 1)
-        plt.plot(freq, magnitude_prev, color='blue')
-        plt.title(f"Prev Noktaları - Fourier Büyüklük Spektrumu {self.file_name}")
-        plt.xlabel("Frekans")
-        plt.ylabel("Büyüklük")
-        plt.grid(True)
-
-        # Klasörü oluştur ve dosyayı kaydet
-        prev_output_folder = os.path.join(self.output_path, "plots2/prev_fft")
-        os.makedirs(prev_output_folder, exist_ok=True)
-        file_base_name = os.path.splitext(self.file_name)[0]
-        output_dir_prev = os.path.join(prev_output_folder, f"{file_base_name}_plot.png")
-        plt.savefig(output_dir_prev, bbox_inches='tight')
-        plt.close()
-
-        # Curr noktaları için Fourier büyüklük spektrumu
-        plt.subplot(1, 2, 2)
-        plt.plot(freq, magnitude_curr, color='red')
-        plt.title(f"Curr Noktaları - Fourier Büyüklük Spektrumu {self.file_name}")
-        plt.xlabel("Frekans")
-        plt.ylabel("Büyüklük")
-        plt.grid(True)
-
-        curr_output_folder = os.path.join(self.output_path, "plots2/curr_fft")
-        os.makedirs(curr_output_folder, exist_ok=True)
-        output_dir_curr = os.path.join(curr_output_folder, f"{file_base_name}_plot.png")
-        plt.savefig(output_dir_curr, bbox_inches='tight')
-        plt.close()
+        # Görselleştirme (yalnızca çizim açıksa, arka plandaki kuyruğa gönderilir)
+        if plot:
+            self.renderer.submit("fourier", self.output_path, self.file_name,
+                                 summary.pop("freq"), summary.pop("magnitude_prev"), summary.pop("magnitude_curr"))
 
         # Fourier dönüşüm sonuçlarını döndür
         return summary
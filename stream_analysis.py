@@ -0,0 +1,149 @@
+"""
+Belleğe sığmayan tek bir kesim dosyası için parça parça (akış) analiz.
+
+Dosya iter_point_chunks ile parçalar halinde okunur; mesafe ve açı istatistikleri Welford/Chan birleştirmesiyle
+çalışan toplamlarda güncellenir. Açı segmentleri için her parçanın son noktası bir sonraki parçaya taşınır.
+Bellek kullanımı dosya boyutundan bağımsız olarak parça boyutuyla sınırlıdır. Sonuçlar GlassCutAnalysis'in
+calculate_statistics ve analyze_angle_similarity sonuçlarıyla aynıdır (kayan nokta yuvarlaması dışında).
+IoU ve Fourier özellikleri kontürün tamamını gerektirdiğinden bu modda hesaplanmaz.
+
+Kullanım (depo kök dizininden):
+    python -m stream_analysis uzun_kesim.csv --chunksize 1000000
+"""
+from utils.file_loader import iter_point_chunks
+from cut_pair import CutPair
+from utils.instrumentation import stage
+import numpy as np
+import argparse
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+class RunningStats:  # Ortalama ve varyansı, değerleri saklamadan parça parça günceller (Welford / Chan birleştirmesi).
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Ortalamadan farkların kareleri toplamı
+
+    def update(self, values):
+        """Bir parçanın değerlerini ekler; parçanın istatistikleri NumPy ile hesaplanıp çalışan toplamla birleştirilir."""
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        if n == 0:
+            return
+        chunk_mean = values.mean()
+        chunk_m2 = np.square(values - chunk_mean).sum()
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def variance(self):
+        """Anakütle varyansı (np.var ile aynı, ddof=0)."""
+        return self._m2 / self.count if self.count else float("nan")
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+class StreamingCutAnalysis:  # GlassCutAnalysis'in mesafe ve açı özelliklerini nokta parçaları geldikçe hesaplar.
+    def __init__(self, file_name=None):
+        self.file_name = file_name
+        self.distances = RunningStats()
+        self.prev_angles = RunningStats()
+        self.curr_angles = RunningStats()
+        self.squared_angle_errors = RunningStats()  # Ortalaması açı MSE'sidir
+        self.invalid_rows = 0
+        self._last_prev = None  # Önceki parçanın son noktaları; parça sınırındaki segment için
+        self._last_curr = None
+
+    def update(self, prev_points, curr_points):
+        """
+        Ardışık bir nokta parçasını işler. Parça, önceki parçanın son noktasıyla birlikte bir CutPair'e çevrilir;
+        Prev ve Curr, GlassCutAnalysis'teki gibi kısa olana göre kesilir.
+        """
+        prev = np.asarray(prev_points, dtype=float).reshape(-1, 2)
+        curr = np.asarray(curr_points, dtype=float).reshape(-1, 2)
+        if min(len(prev), len(curr)) == 0:
+            return
+        carried = self._last_prev is not None  # Parça sınırını aşan segment için önceki parçanın son noktası eklenir
+        cut = CutPair(np.vstack((self._last_prev, prev)) if carried else prev,
+                      np.vstack((self._last_curr, curr)) if carried else curr, self.file_name)
+
+        with stage("distances", self.file_name):
+            self.distances.update(cut.distances[1:] if carried else cut.distances)
+
+        with stage("angles", self.file_name):
+            angles = cut.angles
+            self.prev_angles.update(angles[:, 0])
+            self.curr_angles.update(angles[:, 1])
+            self.squared_angle_errors.update((angles[:, 0] - angles[:, 1]) ** 2)
+        self._last_prev, self._last_curr = cut.paired[:, -1:].copy()
+
+    def calculate_statistics(self):
+        """Öklid mesafelerinin ortalaması ve standart sapması; nokta yoksa (None, None)."""
+        if self.distances.count == 0:
+            return None, None
+        return self.distances.mean, self.distances.std
+
+    def analyze_angle_similarity(self):
+        """GlassCutAnalysis.analyze_angle_similarity ile aynı anahtarları döndürür; açı yoksa None."""
+        if self.prev_angles.count == 0:
+            return None
+        mse = self.squared_angle_errors.mean
+        return {
+            "mean_prev": self.prev_angles.mean,
+            "std_prev": self.prev_angles.std,
+            "mean_curr": self.curr_angles.mean,
+            "std_curr": self.curr_angles.std,
+            "mse": mse,
+            "similarity_score": 100 / (1 + mse)
+        }
+
+# Dosyayı parça parça okuyarak mesafe ve açı özelliklerini hesaplar.
+def analyze_stream(file_path, chunksize=1_000_000):
+    """
+    :return: (mean_distance, std_distance, angle_analysis, n_points)
+    """
+    file_name = os.path.basename(file_path)
+    analysis = StreamingCutAnalysis(file_name)
+    n_points = 0
+    chunks = iter_point_chunks(file_path, chunksize)
+    while True:
+        with stage("load", file_name):
+            chunk = next(chunks, None)
+        if chunk is None:
+            break
+        prev_points, curr_points, invalid_count = chunk
+        analysis.invalid_rows += invalid_count
+        analysis.update(prev_points, curr_points)
+        n_points += min(len(prev_points), len(curr_points))
+    if analysis.invalid_rows:
+        logger.warning("%s: %d geçersiz satır atlandı.", file_name, analysis.invalid_rows)
+    mean_distance, std_distance = analysis.calculate_statistics()
+    return mean_distance, std_distance, analysis.analyze_angle_similarity(), n_points
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Büyük kesim dosyalarını parça parça analiz eder.")
+    parser.add_argument("files", nargs="+", help="CSV/XLSX kesim dosyaları veya arşivdeki dosya yolları")
+    parser.add_argument("--chunksize", type=int, default=1_000_000, help="Bir parçada okunacak satır sayısı")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    for file_path in args.files:
+        mean_distance, std_distance, angle_analysis, n_points = analyze_stream(file_path, args.chunksize)
+        if mean_distance is None:
+            logger.warning("%s: geçerli nokta bulunamadı.", os.path.basename(file_path))
+            continue
+        logger.info("%s: %d nokta, ortalama mesafe %.3f, standart sapma %.3f",
+                    os.path.basename(file_path), n_points, mean_distance, std_distance)
+        if angle_analysis is not None:
+            logger.info("    açı std (prev) %.3f, açı ortalaması (curr) %.3f, açı std (curr) %.3f, MSE %.3f, benzerlik %.3f",
+                        angle_analysis["std_prev"], angle_analysis["mean_curr"], angle_analysis["std_curr"],
+                        angle_analysis["mse"], angle_analysis["similarity_score"])
+
+if __name__ == "__main__":
+    main()
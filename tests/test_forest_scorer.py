@@ -0,0 +1,42 @@
+"""
+CompiledForest: derlenmiş puanlayıcının tahminleri ve olasılıkları RandomForestClassifier'ınkilerle aynı olmalıdır.
+
+Eksik değerli satırlar eğitimde öğrenilen missing_go_to_left yönünü, warm_start ile sonradan eklenen ağaçlar ise
+artımlı eğitimde büyüyen ormanı sınar.
+"""
+from forest_scorer import CompiledForest
+from sklearn.ensemble import RandomForestClassifier
+import numpy as np
+import pytest
+
+# Sınıfı birkaç sütunun doğrusal birleşimine bağlı, isteğe göre eksik değerli sentetik özellik tablosu üretir.
+def feature_table(n_rows=400, n_features=6, missing=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_features))
+    y = (X[:, 0] + 0.5 * X[:, 1] - X[:, 2] + rng.normal(0, 0.5, n_rows) > 0).astype(int)
+    if missing:
+        X[rng.random(X.shape) < missing] = np.nan
+    return X, y
+
+# Ormanı eğitir; warm_start verilirse aynı ormana yeni verilerle ek ağaçlar eklenir.
+def trained_forest(missing, warm_start):
+    X, y = feature_table(missing=missing)
+    model = RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0, warm_start=warm_start)
+    model.fit(X, y)
+    if warm_start:
+        X_new, y_new = feature_table(missing=missing, seed=1)
+        model.n_estimators += 10
+        model.fit(X_new, y_new)
+    return model
+
+@pytest.mark.parametrize("warm_start", [False, True])
+@pytest.mark.parametrize("missing", [0.0, 0.1])
+def test_compiled_forest_matches_sklearn(missing, warm_start, tmp_path):
+    model = trained_forest(missing, warm_start)
+    X, _ = feature_table(n_rows=300, missing=missing, seed=2)
+    path = str(tmp_path / "model.forest.npz")
+    CompiledForest.from_model(model).save(path)
+    compiled = CompiledForest.load(path)
+    assert compiled.n_trees == len(model.estimators_)
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+    np.testing.assert_array_equal(compiled.predict_proba(X), model.predict_proba(X))
@@ -0,0 +1,40 @@
+"""
+SeriesIndex: indekse eklenmiş bir kontürle yapılan sorgu k=1'de kendisini bulmalıdır.
+
+Birbirine çok benzeyen elipsler, kaba kuvvet aramasındaki ||q||² + ||s||² - 2 q·s açılımının
+sayısal hassasiyetini sınar.
+"""
+from series_index import SeriesIndex, shape_signatures
+from shape_analyzer import fourier_descriptors
+import numpy as np
+import scipy.fft
+import pytest
+
+# Yarı eksenleri çok az farklı, gürültülü elips kontürleri üretir.
+def similar_ellipses(n_contours=2000, n_points=120, seed=0):
+    rng = np.random.default_rng(seed)
+    angle = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
+    contours = []
+    for _ in range(n_contours):
+        a = 200 + rng.normal(0, 0.5)
+        b = 120 + rng.normal(0, 0.5)
+        points = np.column_stack((1000 + a * np.cos(angle), 500 + b * np.sin(angle)))
+        contours.append(points + rng.normal(0, 0.05, points.shape))
+    return contours
+
+@pytest.mark.parametrize("engine", ["brute", "kdtree", "auto"])
+def test_indexed_contours_match_themselves(engine):
+    contours = similar_ellipses()
+    index = SeriesIndex(engine=engine)
+    index.add([f"seri-{i}" for i in range(len(contours))], contours)
+    _, indices = index.query(contours, k=1)
+    np.testing.assert_array_equal(indices[:, 0], np.arange(len(contours)))
+
+def test_signature_descriptors_match_extractor():
+    contours = similar_ellipses(n_contours=5)
+    n_samples, n_harmonics = 32, 8
+    signatures = shape_signatures(contours, n_samples, n_harmonics)
+    points = signatures[:, :2 * n_samples].astype(float).reshape(len(contours), n_samples, 2)
+    for signature, contour_points in zip(signatures, points):
+        spectrum = scipy.fft.fft(contour_points[:, 0] + 1j * contour_points[:, 1])
+        np.testing.assert_allclose(signature[2 * n_samples:], fourier_descriptors(spectrum, n_harmonics), atol=1e-6)
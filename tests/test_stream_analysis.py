@@ -0,0 +1,44 @@
+"""
+stream_analysis: parça parça hesaplanan mesafe ve açı özellikleri, dosyanın tamamıyla çalışan GlassCutAnalysis'in
+sonuçlarıyla (kayan nokta yuvarlaması dışında) aynı olmalıdır.
+
+Küçük parça boyutları parça sınırından taşınan noktayı, tüm satırları geçersiz olan parça ise boş parçaların
+atlanmasını sınar.
+"""
+from stream_analysis import analyze_stream
+from glass_cut_analysis import GlassCutAnalysis
+from cut_pair import CutPair
+from utils.file_loader import load_data
+import numpy as np
+import glob
+import os
+import pytest
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+SAMPLE_FILES = sorted(glob.glob(os.path.join(DATA_DIR, "*.csv")))[:5]
+
+# Akış sonuçlarını dosyanın tamamı yüklenerek hesaplanan GlassCutAnalysis sonuçlarıyla karşılaştırır.
+def assert_matches_full_analysis(file_path, chunksize):
+    glass_analysis = GlassCutAnalysis(CutPair(*load_data(file_path), os.path.basename(file_path)))
+    mean_distance, std_distance, angle_analysis, n_points = analyze_stream(file_path, chunksize)
+    expected_mean, expected_std = glass_analysis.calculate_statistics()
+    assert n_points == glass_analysis.cut.n_paired
+    np.testing.assert_allclose([mean_distance, std_distance], [expected_mean, expected_std], rtol=1e-12, atol=1e-12)
+    expected_angles = glass_analysis.analyze_angle_similarity()
+    for key, value in expected_angles.items():
+        np.testing.assert_allclose(angle_analysis[key], value, rtol=1e-12, atol=1e-12, err_msg=key)
+
+@pytest.mark.parametrize("chunksize", [7, 1000])
+@pytest.mark.parametrize("file_path", SAMPLE_FILES, ids=os.path.basename)
+def test_stream_matches_full_analysis(file_path, chunksize):
+    assert_matches_full_analysis(file_path, chunksize)
+
+# Parça boyutu 7 iken ikinci parçanın tüm satırları geçersizdir; 1'de her geçersiz satır ayrı bir boş parçadır.
+@pytest.mark.parametrize("chunksize", [1, 7, 1000])
+def test_stream_skips_fully_invalid_chunk(chunksize, tmp_path):
+    with open(SAMPLE_FILES[0], encoding="utf-8") as f:
+        header, *rows = f.read().splitlines()
+    assert len(rows) > 14
+    file_path = tmp_path / "veriler-aynı-gecersiz.csv"
+    file_path.write_text("\n".join([header] + rows[:7] + ["abc,xyz"] * 7 + rows[7:]) + "\n", encoding="utf-8")
+    assert_matches_full_analysis(str(file_path), chunksize)
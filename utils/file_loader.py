@@ -1,19 +1,71 @@
 import pandas as pd
+import numpy as np
+import threading
+import fnmatch
+import queue
 import os
+from utils.instrumentation import stage
+from utils.point_store import is_archive, open_point_store, split_member_path
+import logging
+
+logger = logging.getLogger(__name__)
 
 class FileLoader:   # Bu sınıf, belirtilen dizindeki CSV dosyalarını yükler ve belirli dosyaları atlar.
-    def __init__(self, directory):
-        """Belirtilen klasördeki tüm CSV ve XLSX dosyalarını alır, ancak 'analysis_results.csv' dosyasını atlar."""
+    def __init__(self, directory, recursive=False, include=("*.csv", "*.xlsx"), exclude=("analysis_results.csv",),
+                 sort=True):
+        """
+        Belirtilen klasördeki tüm CSV ve XLSX dosyalarını alır, ancak 'analysis_results.csv' dosyasını atlar.
+        directory bir nokta arşivi (.cutpts) ise arşivdeki dosyalar '<arşiv>/<dosya adı>' yollarıyla listelenir.
+        Klasör oluşturulurken taranmaz; dosyalar iter_file_paths ile istendikçe bulunur.
+        :param recursive: True ise alt klasörler de taranır
+        :param include: Dosya adının uyması gereken glob desenlerinden biri (ör. '*.csv')
+        :param exclude: Uyan dosyaların atlanacağı glob desenleri; klasöre göre göreli yola veya dosya adına uygulanır
+        :param sort: True ise dosyalar her klasörde ada göre sıralanır; sonuç sırası dosya sisteminden bağımsızdır
+        """
         self.directory = directory
-        self.file_paths = self.get_file_paths() # Bu sınıf, belirtilen dizindeki CSV ve XLSX dosyalarını yükler ve belirli dosyaları atlar.
+        self.recursive = recursive
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.sort = sort
+
+    def _selected(self, relative_path):
+        """Göreli yolun include/exclude desenlerine göre seçilip seçilmediğini döndürür."""
+        name = os.path.basename(relative_path)
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in self.include):
+            return False
+        return not any(fnmatch.fnmatch(relative_path, pattern) or fnmatch.fnmatch(name, pattern)
+                       for pattern in self.exclude)
+
+    # Klasördeki (veya arşivdeki) dosyaların tam yollarını os.scandir ile, istendikçe üretir
+    def iter_file_paths(self):
+        if is_archive(self.directory):
+            names = open_point_store(self.directory).names()
+            for name in sorted(names) if self.sort else names:
+                if self._selected(name):
+                    yield os.path.join(self.directory, name)
+            return
+        yield from self._scan(self.directory, "")
 
-    # Klasördeki tüm CSV dosyalarının tam yollarını döndürür
+    def _scan(self, directory, prefix):
+        with os.scandir(directory) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name) if self.sort else list(iterator)
+        subdirectories = []
+        for entry in entries:
+            relative_path = prefix + entry.name
+            if entry.is_file() and self._selected(relative_path):
+                yield os.path.join(self.directory, relative_path)  # Tam dosya yolunu ver
+            elif self.recursive and entry.is_dir():
+                subdirectories.append(entry)
+        for entry in subdirectories:  # Önce klasördeki dosyalar, sonra alt klasörler
+            yield from self._scan(entry.path, prefix + entry.name + os.sep)
+
+    # Klasördeki tüm dosyaların tam yollarını liste olarak döndürür
     def get_file_paths(self):
-        file_paths = []
-        for file_name in os.listdir(self.directory):  # Klasördeki tüm dosyaları listele
-            if file_name.endswith('.csv'):
-                file_paths.append(os.path.join(self.directory, file_name))  # Tam dosya yolunu ekle
-        return file_paths
+        return list(self.iter_file_paths())
+
+    @property
+    def file_paths(self):
+        return self.get_file_paths()
 
 # Verilen nokta stringini temizler ve bir listeye dönüştürür; geçersiz değerlerde hata mesajı verir.
 def clean_and_split_point(point_str):
@@ -25,49 +77,188 @@ def clean_and_split_point(point_str):
         point_str = point_str.replace('[', '').replace(']', '').strip()
         # Ek kontrol ekleyelim
         if not point_str:
-            print("Boş veya geçersiz bir değer geldi.")
+            logger.debug("Boş veya geçersiz bir değer geldi.")
             return None
         point_list = point_str.split()
         # Noktaları kontrol et
         try:
             point_list = [int(x) for x in point_list]
         except ValueError as e:
-            print(f"Geçersiz bir değer ile karşılaşıldı: {point_str} -> {e}")
+            logger.debug("Geçersiz bir değer ile karşılaşıldı: %s -> %s", point_str, e)
             return None
         return point_list
     return None  # NaN veya geçersiz bir değer geldiğinde None döndür
 
-#Dosya formatına göre veri setini yükler ve "Prev" ve "Curr" noktalarını iki ayrı listeye ayırır.
-def load_data(file_path):
-    """Veri setini dosya formatına göre yükler (csv veya xlsx) ve prev-curr noktalarını ayrıştırır."""
-    file_ext = os.path.splitext(file_path)[1]
+# Köşeli parantezler silindikten sonra geçerli bir nokta tam olarak iki tam sayıdan oluşur.
+_POINT_PATTERN = r"\s*[+-]?[0-9]{1,10}\s+[+-]?[0-9]{1,10}\s*"
+_BRACKETS = str.maketrans('', '', '[]')
+_INT32_MIN, _INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+# Bir sütundaki tüm nokta stringlerini tek seferde (N, 2) boyutlu diziye ve geçerlilik maskesine dönüştürür.
+def parse_point_column(column):
+    """
+    Sütundaki '[ 891  598]' biçimindeki stringleri vektörel olarak ayrıştırır.
+    clean_and_split_point ile aynı kuralları uygular: string olmayan, boş veya
+    tam sayıya çevrilemeyen değerler geçersiz sayılır. İkiden farklı sayıda değer
+    içeren satırlar da (N, 2) diziye sığmadığı için geçersizdir.
+    :return: (points, valid) -> points (N, 2) int64, valid (N,) bool
+    """
+    n_rows = len(column)
+    points = np.zeros((n_rows, 2), dtype=np.int64)
+    valid = np.zeros(n_rows, dtype=bool)
+    if n_rows == 0 or not (pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column)):
+        return points, valid  # Sayısal/boş sütunlarda string nokta yoktur
 
+    # .str erişimcisi string olmayan değerler için NaN döndürür, böylece NaN satırlar da elenir
+    cleaned = column.str.translate(_BRACKETS)
+    matched = cleaned.str.fullmatch(_POINT_PATTERN).fillna(False).to_numpy(dtype=bool)
+    if matched.any():
+        # Geçerli satırlar tek bir metinde birleştirilip tek çağrıda sayıya çevrilir
+        tokens = ' '.join(cleaned[matched].tolist()).split()
+        points[matched] = np.array(tokens, dtype=np.int64).reshape(-1, 2)
+    # int32 aralığı dışındaki koordinatlar da geçersiz sayılır
+    in_range = ((points >= _INT32_MIN) & (points <= _INT32_MAX)).all(axis=1)
+    valid = matched & in_range
+    return points, valid
+
+# "Prev" ve "Curr" sütunlarını tek geçişte ayrıştırır; yalnızca iki noktası da geçerli olan satırları tutar.
+def parse_point_columns(data):
+    """
+    DataFrame'in ilk iki sütununu (Prev, Curr) ayrıştırır.
+    :return: (prev_points, curr_points, invalid_count) -> (N, 2) int32 ardışık diziler ve atlanan satır sayısı
+    """
+    if data.shape[1] < 2:  # Yeterli sütun yoksa tüm satırlar geçersizdir
+        logger.warning("Yetersiz sütun sayısı.")
+        empty = np.empty((0, 2), dtype=np.int32)
+        return empty, empty.copy(), len(data)
+
+    prev_raw, prev_valid = parse_point_column(data.iloc[:, 0])  # Prev sütunu
+    curr_raw, curr_valid = parse_point_column(data.iloc[:, 1])  # Curr sütunu
+
+    valid = prev_valid & curr_valid
+    prev_points = np.ascontiguousarray(prev_raw[valid], dtype=np.int32)
+    curr_points = np.ascontiguousarray(curr_raw[valid], dtype=np.int32)
+    invalid_count = int(len(valid) - np.count_nonzero(valid))
+    return prev_points, curr_points, invalid_count
+
+# Dosya diskte veya bir nokta arşivinin içinde var mı kontrol eder.
+def source_exists(file_path):
+    member = split_member_path(file_path)
+    if member is not None:
+        return member[1] in open_point_store(member[0])
+    return os.path.exists(file_path)
+
+# CSV/XLSX dosyasını okuyup "Prev" ve "Curr" sütunlarını ayrıştırır.
+def read_points(file_path):
+    """
+    :return: (prev_points, curr_points, invalid_count)
+    """
+    file_ext = os.path.splitext(file_path)[1]
     if file_ext == '.csv':
         data = pd.read_csv(file_path)
     elif file_ext == '.xlsx':
         data = pd.read_excel(file_path)
     else:
         raise ValueError("Dosya formatı desteklenmiyor. Lütfen CSV veya XLSX kullanın.")
+    return parse_point_columns(data)
 
-    # 'Prev' ve 'Curr' sütunlarını iki ayrı listeye ayıralım
-    prev_points = []
-    curr_points = []
+# Dosyanın "Prev" ve "Curr" noktalarını tamamını belleğe almadan parça parça okur.
+def iter_point_chunks(file_path, chunksize=1_000_000):
+    """
+    CSV dosyaları pd.read_csv(chunksize=...) ile okunur; bellekte aynı anda en fazla chunksize satır bulunur.
+    Arşivdeki dosyalar memmap görünümünden dilimlenir. XLSX parça parça okunamadığından bir kez okunup dilimlenir.
+    Satırlar read_points ile aynı kurallarla ayrıştırılır; parçalar birleştirildiğinde read_points sonucunu verir.
+    :return: (prev_points, curr_points, invalid_count) üreteci
+    """
+    member = split_member_path(file_path)
+    if member is not None:
+        prev_points, curr_points = open_point_store(member[0]).get(member[1])
+        for start in range(0, len(prev_points), chunksize):
+            yield prev_points[start:start + chunksize], curr_points[start:start + chunksize], 0
+        return
 
-    for _, row in data.iterrows():
-        # Ek kontrol ekleyelim
+    file_ext = os.path.splitext(file_path)[1]
+    if file_ext == '.csv':
+        with pd.read_csv(file_path, chunksize=chunksize) as reader:
+            for data in reader:
+                yield parse_point_columns(data)
+    elif file_ext == '.xlsx':
+        data = pd.read_excel(file_path)
+        for start in range(0, len(data), chunksize):
+            yield parse_point_columns(data.iloc[start:start + chunksize])
+    else:
+        raise ValueError("Dosya formatı desteklenmiyor. Lütfen CSV veya XLSX kullanın.")
 
-        if len(row) < 2:  # Yeterli sütun yoksa
-            print("Yetersiz sütun sayısı.")
-            continue
+# Sıradaki dosyaları arka plandaki bir iş parçacığında önceden yükler; disk okuması ve ayrıştırma analizle örtüşür.
+def prefetch(file_paths, depth=2, loader=None):
+    """
+    :param file_paths: Dosya yolları (liste veya iter_file_paths gibi bir üreteç)
+    :param depth: Önceden yüklenip bekletilecek en fazla dosya sayısı; 0 ise arka plan iş parçacığı açılmaz
+    :param loader: Dosyayı yükleyen fonksiyon (varsayılan: load_data)
+    :return: (file_path, result, error) üreteci; yükleme hatası varsa result None, error istisnadır
+    """
+    loader = loader or load_data
+    if depth <= 0:
+        for file_path in file_paths:
+            try:
+                yield file_path, loader(file_path), None
+            except Exception as e:
+                yield file_path, None, e
+        return
+
+    loaded = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+    done = object()
 
-        prev_point = clean_and_split_point(row.iloc[0])  # Prev sütunu
-        curr_point = clean_and_split_point(row.iloc[1])  # Curr sütunu
+    def put(item):
+        while not stopped.is_set():  # Tüketici erken durursa iş parçacığı kuyrukta takılı kalmasın
+            try:
+                loaded.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def worker():
+        try:
+            for file_path in file_paths:
+                if stopped.is_set():
+                    return
+                try:
+                    put((file_path, loader(file_path), None))
+                except Exception as e:
+                    put((file_path, None, e))
+        except Exception as e:  # Dosya listesi üretilirken oluşan hata tüketiciye taşınır
+            put((None, None, e))
+        finally:
+            put(done)
 
-        # Eğer prev_point veya curr_point None değilse listeye ekle
-        if prev_point is not None and curr_point is not None:
-            prev_points.append(prev_point)
-            curr_points.append(curr_point)
-        else:
-            print(f"Geçersiz veri tespit edildi: Prev: {prev_point}, Curr: {curr_point}")
+    thread = threading.Thread(target=worker, name="file-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = loaded.get()
+            if item is done:
+                break
+            if item[0] is None:
+                raise item[2]
+            yield item
+    finally:
+        stopped.set()
+        thread.join()
+
+#Dosya formatına göre veri setini yükler ve "Prev" ve "Curr" noktalarını iki ayrı diziye ayırır.
+def load_data(file_path):
+    """
+    Veri setini dosya formatına göre yükler (csv, xlsx veya nokta arşivi) ve prev-curr noktalarını ayrıştırır.
+    Arşivdeki dosyalar ayrıştırılmadan, arşive bakan salt okunur görünümler olarak döndürülür.
+    :return: (prev_points, curr_points) -> (N, 2) boyutlu int32 NumPy dizileri
+    """
+    member = split_member_path(file_path)
+    with stage("load", os.path.basename(file_path)):
+        if member is not None:
+            return open_point_store(member[0]).get(member[1])
+        prev_points, curr_points, invalid_count = read_points(file_path)
+    if invalid_count:  # Her hatalı satır için ayrı mesaj yerine tek bir özet
+        logger.warning("%s: %d geçersiz satır atlandı.", os.path.basename(file_path), invalid_count)
 
     return prev_points, curr_points
@@ -0,0 +1,156 @@
+from contextlib import contextmanager
+import tracemalloc
+import threading
+import json
+import time
+import os
+
+class MetricsRegistry:  # Ölçüm kayıtlarını süreç içinde tutar; çalışma bittikten sonra sorgulanabilir.
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def query(self, stage=None, file_name=None):
+        """Aşama ve/veya dosya adına göre kayıtları döndürür."""
+        return [record for record in self.records
+                if (stage is None or record["stage"] == stage)
+                and (file_name is None or record["file"] == file_name)]
+
+    def summary(self):
+        """
+        Aşama bazında özet döndürür.
+        :return: {stage: {"calls", "total_s", "mean_s", "max_s", "peak_mb"}}
+        """
+        summary = {}
+        for record in self.records:
+            entry = summary.setdefault(record["stage"], {"calls": 0, "total_s": 0.0, "max_s": 0.0, "peak_mb": None})
+            entry["calls"] += 1
+            entry["total_s"] += record["seconds"]
+            entry["max_s"] = max(entry["max_s"], record["seconds"])
+            if record.get("peak_mb") is not None:
+                entry["peak_mb"] = max(entry["peak_mb"] or 0.0, record["peak_mb"])
+        for entry in summary.values():
+            entry["mean_s"] = entry["total_s"] / entry["calls"]
+        return summary
+
+    def close(self):
+        pass
+
+class JsonLinesSink:  # Her ölçüm kaydını JSON-lines dosyasına bir satır olarak ekler.
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class Instrumentation:  # Aşama bazında süre, çağrı sayısı ve bellek zirvesi ölçer; kayıtları takılabilir çıkışlara (sink) yollar.
+    def __init__(self, sinks=(), track_memory=False):
+        """
+        :param sinks: write(record) ve close() metotları olan çıkışlar (MetricsRegistry, JsonLinesSink)
+        :param track_memory: True ise tracemalloc ile her aşamanın bellek zirvesi (MB) de ölçülür
+        """
+        self.sinks = list(sinks)
+        self.track_memory = track_memory
+        self._local = threading.local()  # Her iş parçacığının kendi iç içe aşama yığını
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def enabled(self):
+        return bool(self.sinks)
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def stage(self, name, file_name=None):
+        """
+        Bloğun süresini (ve istenirse bellek zirvesini) ölçüp kaydeder.
+        file_name verilmezse kapsayan aşamanın dosya adı kullanılır.
+        """
+        if not self.sinks:  # Ölçüm kapalıyken ek maliyet yok
+            yield
+            return
+
+        stack = self._stack()
+        if file_name is None and stack:
+            file_name = stack[-1]["file"]
+        frame = {"file": file_name, "start_memory": 0, "peak_memory": 0}
+        if self.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:  # Üst aşamanın şimdiye kadarki zirvesi, sıfırlamadan önce saklanır
+                stack[-1]["peak_memory"] = max(stack[-1]["peak_memory"], peak)
+            tracemalloc.reset_peak()
+            frame["start_memory"] = current
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            peak_mb = None
+            if self.track_memory:
+                peak = max(tracemalloc.get_traced_memory()[1], frame["peak_memory"])
+                peak_mb = max(peak - frame["start_memory"], 0) / (1024 * 1024)
+                if stack:
+                    stack[-1]["peak_memory"] = max(stack[-1]["peak_memory"], peak)
+            self.emit({"stage": name, "file": file_name, "seconds": seconds, "peak_mb": peak_mb,
+                       "pid": os.getpid(), "time": time.time()})
+
+    def emit(self, record):
+        """Kaydı tüm çıkışlara yollar."""
+        for sink in self.sinks:
+            sink.write(record)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+_instrumentation = Instrumentation()  # Varsayılan: çıkış yok, ölçüm kapalı
+
+def get_instrumentation():
+    """Süreçteki geçerli Instrumentation örneğini döndürür."""
+    return _instrumentation
+
+def set_instrumentation(instrumentation):
+    """Süreçteki geçerli Instrumentation örneğini değiştirir ve öncekini döndürür."""
+    global _instrumentation
+    previous = _instrumentation
+    _instrumentation = instrumentation
+    return previous
+
+# Modüllerin kullandığı kısayol: with stage("load", file_name): ...
+def stage(name, file_name=None):
+    return _instrumentation.stage(name, file_name)
+
+@contextmanager
+def capture(track_memory=False):
+    """
+    Blok içindeki ölçümleri geçici bir kayıt defterinde toplar ve o listeyi verir.
+    Süreç havuzundaki işçiler ölçümlerini ana sürece bu şekilde taşır.
+    """
+    registry = MetricsRegistry()
+    previous = set_instrumentation(Instrumentation([registry], track_memory=track_memory))
+    try:
+        yield registry.records
+    finally:
+        set_instrumentation(previous)
@@ -0,0 +1,166 @@
+"""
+Kesim yolu arşivleri için ikili nokta deposu.
+
+Arşiv tek bir dosyadır:
+    [başlık]  8 bayt sihirli değer + dizin konumu (uint64) + dizin uzunluğu (uint64)
+    [veri]    her dosya için ardışık int32 (N, 2) prev noktaları, hemen ardından (N, 2) curr noktaları
+    [dizin]   dosya adı, veri konumu ve nokta sayısını tutan JSON listesi
+
+Arşivdeki bir dosyaya '<arşiv>.cutpts/<dosya adı>' yolu ile erişilir; böylece os.path.basename
+CSV ile aynı dosya adını verir ve FileLoader / load_data yolları olduğu gibi kullanabilir.
+
+Dönüştürme (depo kök dizininden):
+    python -m utils.point_store data/ results/archive/data.cutpts
+"""
+import numpy as np
+import argparse
+import logging
+import struct
+import json
+import os
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_EXTENSION = ".cutpts"
+MAGIC = b"CUTPTS01"
+_HEADER = struct.Struct("<8sQQ")
+_DTYPE = np.dtype("<i4")
+
+class PointStore:  # Arşivi numpy.memmap ile açar; dosyaların noktalarına kopyalamadan erişim sağlar.
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, index_offset, index_length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} geçerli bir nokta arşivi değil.")
+            f.seek(index_offset)
+            entries = json.loads(f.read(index_length).decode("utf-8"))
+        self._entries = {entry["name"]: entry for entry in entries}
+        self._names = [entry["name"] for entry in entries]
+        # Dizinden önceki veri bölgesi tek bir salt okunur eşleme olarak açılır; sayfalar erişildikçe okunur
+        n_values = (index_offset - _HEADER.size) // _DTYPE.itemsize
+        self._data = np.memmap(path, dtype=_DTYPE, mode="r", offset=_HEADER.size, shape=(n_values,)) \
+            if n_values else np.empty(0, dtype=_DTYPE)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def names(self):
+        """Arşivdeki dosya adlarını eklenme sırasıyla döndürür."""
+        return list(self._names)
+
+    def get(self, name):
+        """
+        :return: (prev_points, curr_points) -> arşive bakan salt okunur (N, 2) int32 görünümler
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"{name} arşivde bulunamadı: {self.path}")
+        start = (entry["offset"] - _HEADER.size) // _DTYPE.itemsize
+        size = entry["n_points"] * 2
+        prev_points = self._data[start:start + size].view(np.ndarray).reshape(-1, 2)
+        curr_points = self._data[start + size:start + 2 * size].view(np.ndarray).reshape(-1, 2)
+        return prev_points, curr_points
+
+    def invalid_rows(self, name):
+        """Dönüştürme sırasında atlanan geçersiz satır sayısı."""
+        return self._entries[name]["invalid_rows"]
+
+class PointStoreWriter:  # Nokta dizilerini arşive ekler; dizin ve başlık kapanışta yazılır.
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"  # Yarım kalmış arşiv okunmasın diye önce geçici dosyaya yazılır
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, 0, 0))
+        self._entries = []
+        self._names = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            os.remove(self._tmp_path)
+
+    def add(self, name, prev_points, curr_points, invalid_rows=0):
+        """Bir dosyanın prev ve curr noktalarını arşive ekler; iki dizi aynı uzunlukta olmalıdır."""
+        if name in self._names:
+            raise ValueError(f"{name} arşive zaten eklendi.")
+        prev_points = np.ascontiguousarray(prev_points, dtype=_DTYPE).reshape(-1, 2)
+        curr_points = np.ascontiguousarray(curr_points, dtype=_DTYPE).reshape(-1, 2)
+        if len(prev_points) != len(curr_points):
+            raise ValueError(f"{name}: prev ve curr nokta sayıları farklı ({len(prev_points)} != {len(curr_points)}).")
+        self._entries.append({"name": name, "offset": self._file.tell(), "n_points": len(prev_points),
+                              "invalid_rows": int(invalid_rows)})
+        self._names.add(name)
+        self._file.write(prev_points.tobytes())
+        self._file.write(curr_points.tobytes())
+
+    def close(self):
+        index = json.dumps(self._entries, ensure_ascii=False).encode("utf-8")
+        index_offset = self._file.tell()
+        self._file.write(index)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, index_offset, len(index)))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+_open_stores = {}  # Süreç içinde açık arşivler: gerçek yol -> ((mtime_ns, boyut), PointStore)
+
+def open_point_store(path):
+    """
+    Arşivi açar veya daha önce açılmış olanı döndürür. Arşiv açıldıktan sonra yeniden yazılmışsa
+    (değiştirilme zamanı veya boyutu farklıysa) yeniden açılır; uzun süren servis süreçleri eski eşlemeyi kullanmaz.
+    """
+    key = os.path.realpath(path)
+    stat = os.stat(key)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _open_stores.get(key)
+    if cached is None or cached[0] != signature:
+        cached = _open_stores[key] = (signature, PointStore(path))
+    return cached[1]
+
+def is_archive(path):
+    return path.endswith(ARCHIVE_EXTENSION) and os.path.isfile(path)
+
+def split_member_path(file_path):
+    """'<arşiv>.cutpts/<dosya adı>' yolunu (arşiv, dosya adı) olarak ayırır; arşiv yolu değilse None döndürür."""
+    archive, name = os.path.split(file_path)
+    if archive.endswith(ARCHIVE_EXTENSION) and os.path.isfile(archive):
+        return archive, name
+    return None
+
+# Bir klasördeki kesim dosyalarını ayrıştırıp tek bir arşive yazar.
+def convert_directory(directory, archive_path):
+    """
+    :return: Arşive yazılan dosya sayısı
+    """
+    from utils.file_loader import FileLoader, read_points  # Döngüsel içe aktarmayı önlemek için burada
+
+    file_paths = FileLoader(directory).get_file_paths()  # FileLoader ile aynı sıra
+    with PointStoreWriter(archive_path) as writer:
+        for file_path in file_paths:
+            prev_points, curr_points, invalid_count = read_points(file_path)
+            writer.add(os.path.basename(file_path), prev_points, curr_points, invalid_count)
+    return len(file_paths)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kesim dosyalarını ikili nokta arşivine dönüştürür.")
+    parser.add_argument("directory", help="CSV/XLSX kesim dosyalarının bulunduğu klasör")
+    parser.add_argument("archive", help=f"Yazılacak arşiv dosyası ({ARCHIVE_EXTENSION})")
+    args = parser.parse_args(argv)
+    if not args.archive.endswith(ARCHIVE_EXTENSION):
+        parser.error(f"Arşiv dosyasının uzantısı {ARCHIVE_EXTENSION} olmalıdır.")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    count = convert_directory(args.directory, args.archive)
+    logger.info("%d dosya %s arşivine yazıldı.", count, args.archive)
+
+if __name__ == "__main__":
+    main()
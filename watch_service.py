@@ -0,0 +1,146 @@
+from feature_extractor import analyze_file
+from results_manager import ResultsManager
+import pandas as pd
+import csv
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+class WatchService:  # Bir klasörü izler, gelen her kesim dosyası için yalnızca özellik çıkarımı + tahmin yapar ve sonucu hemen yazar.
+    def __init__(self, trainer, watch_dir, output_csv, poll_interval=0.5, settle_time=0.2,
+                 process_existing=False, extensions=('.csv', '.xlsx'), contour_options=None,
+                 alignment="off", skipped_groups=(), shape_options=None):
+        """
+        :param trainer: Modeli yüklenmiş ModelTrainer (bkz. ModelTrainer.load_model)
+        :param watch_dir: İzlenecek klasör
+        :param output_csv: Tahminlerin satır satır ekleneceği CSV dosyası
+        :param poll_interval: Klasörün taranma aralığı (saniye)
+        :param settle_time: Dosyanın yazımı bitti sayılması için boyutunun değişmeden kalması gereken süre (saniye)
+        :param process_existing: True ise servis başlarken klasörde olan dosyalar da işlenir
+        :param extensions: İşlenecek dosya uzantıları
+        :param contour_options: Özelliklerden önce uygulanacak normalize_contours ayarları; model aynı ayarlarla eğitilmiş olmalıdır
+        :param alignment: Hizalama özellikleri modu; model bu sütunlarla eğitildiyse aynı mod verilmelidir
+        :param skipped_groups: Modelin kullanmadığı, hesaplanmayacak özellik grupları (bkz. feature_plan.skipped_groups)
+        :param shape_options: ShaperAnalysis ayarları (iou_mode, iou_tolerance); model aynı ayarlarla eğitilmiş olmalıdır
+        """
+        if trainer.model is None or not trainer.feature_columns:
+            raise ValueError("WatchService için özellik sütunlarıyla birlikte kaydedilmiş eğitilmiş bir model gerekir.")
+        self.trainer = trainer
+        self.watch_dir = watch_dir
+        self.output_csv = output_csv
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.extensions = tuple(extensions)
+        self.contour_options = contour_options
+        self.alignment = alignment
+        self.skipped_groups = tuple(skipped_groups)
+        self.shape_options = shape_options
+        self.latencies = []  # Dosya başına gecikme süreleri (ms)
+
+        self._pending = {}  # Yazımı sürüyor olabilecek dosyalar: yol -> ((boyut, mtime), bu haliyle ilk görülme zamanı)
+        self._seen = set() if process_existing else set(self._list_files())
+
+    def _list_files(self):
+        """İzlenen klasördeki uygun uzantılı dosyaların yollarını döndürür."""
+        with os.scandir(self.watch_dir) as entries:
+            return [entry.path for entry in entries
+                    if entry.is_file() and entry.name.endswith(self.extensions)]
+
+    def poll(self):
+        """
+        Klasörü bir kez tarar ve yazımı tamamlanmış yeni dosyaları döndürür.
+        Boyutu ve değiştirilme zamanı settle_time boyunca sabit kalan dosya hazır sayılır.
+        """
+        now = time.monotonic()
+        ready = []
+        for path in sorted(self._list_files()):
+            if path in self._seen:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Dosya taşınmış veya silinmiş olabilir
+            signature = (stat.st_size, stat.st_mtime_ns)
+            previous = self._pending.get(path)
+            if previous is None or previous[0] != signature:
+                self._pending[path] = (signature, now)
+                continue
+            if stat.st_size > 0 and now - previous[1] >= self.settle_time:
+                del self._pending[path]
+                self._seen.add(path)
+                ready.append(path)
+        return ready
+
+    def process_file(self, file_path):
+        """
+        Tek bir dosyanın özelliklerini çıkarır, tahmin yapar ve sonucu CSV'ye ekler.
+        :return: (source_file, prediction, prediction_label, latency_ms) ya da özellik çıkarılamadıysa None
+        """
+        start = time.perf_counter()
+        row = ResultsManager.build_result(*analyze_file(file_path, output_path=None, labeled=False,
+                                                         shape_options=self.shape_options,
+                                                         contour_options=self.contour_options, alignment=self.alignment,
+                                                         skipped_groups=self.skipped_groups),
+                                          skipped_groups=self.skipped_groups)
+        if row is None:
+            return None
+
+        features = self.trainer.select_features(pd.DataFrame([row]))
+        predictions, _ = self.trainer.predict(features, output_path=None)
+        prediction = int(predictions[0])
+        label = 'aynı seri' if prediction == 1 else 'farklı seri'
+        self._append_prediction(row["file_name"], prediction, label)
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.latencies.append(latency_ms)
+        logger.info("Tahmin: %s -> %s (%.1f ms)", row["file_name"], label, latency_ms)
+        return row["file_name"], prediction, label, latency_ms
+
+    def _append_prediction(self, source_file, prediction, label):
+        """Tahmini predictions_unlabeled.csv ile aynı sütunlarla dosyanın sonuna ekler."""
+        write_header = not os.path.exists(self.output_csv) or os.path.getsize(self.output_csv) == 0
+        with open(self.output_csv, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(["source_file", "predictions", "prediction_label"])
+            writer.writerow([source_file, prediction, label])
+
+    def latency_summary(self):
+        """İlk (ısınma) dosya hariç gecikme istatistiklerini döndürür."""
+        warm = self.latencies[1:] or self.latencies
+        if not warm:
+            return None
+        return {
+            "files": len(self.latencies),
+            "mean_ms": float(sum(warm) / len(warm)),
+            "max_ms": float(max(warm)),
+        }
+
+    def serve_forever(self, max_files=None):
+        """
+        Klasörü sürekli izler; Ctrl+C ile ya da max_files kadar dosya işlendiğinde durur.
+        """
+        logger.info("%s klasörü izleniyor (Ctrl+C ile durdurun)...", self.watch_dir)
+        processed = 0
+        try:
+            while max_files is None or processed < max_files:
+                ready = self.poll()
+                if not ready:
+                    time.sleep(self.poll_interval)
+                    continue
+                for file_path in ready:
+                    try:
+                        self.process_file(file_path)
+                    except Exception as e:  # Tek bir bozuk dosya servisi durdurmamalı
+                        logger.error("%s işlenirken hata oluştu: %s: %s", os.path.basename(file_path), type(e).__name__, e)
+                    processed += 1
+        except KeyboardInterrupt:
+            logger.info("İzleme durduruldu.")
+
+        summary = self.latency_summary()
+        if summary:
+            logger.info("İşlenen dosya: %d, ortalama gecikme: %.1f ms, en yüksek: %.1f ms",
+                        summary["files"], summary["mean_ms"], summary["max_ms"])
+        return summary